@@ -0,0 +1,559 @@
+# benchmarks/suite.py
+"""
+Benchmark every supported reader and writer on deterministic synthetic data:
+rows/sec, MB/sec and peak RSS, each case measured in a fresh process.
+
+    python benchmarks/suite.py run --rows 1000 100000 --json results.json
+    python benchmarks/suite.py run --inputs csv tab --outputs parquet xlsx
+    python benchmarks/suite.py compare baseline.json results.json --threshold 0.15
+
+Cases (--kinds):
+  read                 read_file on one fixture per SUPPORTED_FORMATS entry
+  read_tab_strict      read_tab_strict on the .tsv / .tab / .txt fixtures
+  guess_csv_delimiter  guess_csv_delimiter on the delimited text fixtures
+  write                write_file of an in-memory frame to every output format
+  convert              stream_convert for every input x output pair
+
+Fixtures come in two shapes (narrow: 8 columns, wide: 60), text formats in
+utf-8 and latin1, and workbooks with three sheets. Columns named like
+royalty-statement amounts hold padded-plus numbers ('+00012'). Data is a
+pure function of the row index, so every run sees identical files.
+`compare` exits with status 1 when a case got slower (or its peak RSS grew)
+by more than the threshold, or started failing; cases that only one of
+the two runs has are listed as MISSING / NEW.
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import zipfile
+import argparse
+import platform
+import tempfile
+import subprocess
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.rss import peak_rss_mb  # noqa: E402
+
+KINDS = ("read", "read_tab_strict", "guess_csv_delimiter", "write", "convert")
+SHAPES = ("narrow", "wide")
+ENCODINGS = ("utf-8", "latin1")
+DEFAULT_ROWS = (1_000, 100_000)
+
+# Rows per generated chunk (fixtures are written incrementally)
+GEN_CHUNK_ROWS = 100_000
+
+# Fixtures that are slow to generate (or can't hold more rows) are capped;
+# larger sizes are reported as skipped
+MAX_INPUT_ROWS = {"xls": 3 * 65_535, "html": 500_000, "xlsx": 1_000_000}
+MAX_OUTPUT_ROWS = {"xls": 65_535}
+
+# Calls timed per guess_csv_delimiter measurement (it reads 4 KB)
+GUESS_CALLS = 200
+
+# Peak RSS growth below this many MB is noise, whatever the threshold
+RSS_NOISE_MB = 10
+
+# -------------------------------
+# Synthetic data
+# -------------------------------
+# Latin-1 encodable, so the same frame can be written in both encodings
+TITLES = ("Café del Mar", "Señor Coconut", "Müller & Söhne", "Ærø Blues",
+          "Plain Title", "Déjà Vu", "Straße 12", "Naïve Song")
+
+WIDE_COLUMNS = 60
+
+
+def _lookup(values):
+    import numpy as np
+    return np.array(values, dtype=object)
+
+
+def make_frame(rows: int, shape: str = "narrow", offset: int = 0):
+    """
+    Rows offset .. offset+rows-1 of the benchmark table. Every value is a
+    function of the row index, so chunks concatenate to the full table.
+    """
+    import numpy as np
+    import pandas as pd
+    idx = np.arange(offset, offset + rows)
+    cycle = idx % 9973
+    codes = _lookup([f"C{i:04d}" for i in range(1000)])
+    data = {
+        "id": idx,
+        "code": codes[idx % 1000],
+        "title": _lookup(TITLES)[idx % len(TITLES)],
+        # Padded-plus numbers, as in .TAB royalty statements
+        "units": _lookup([f"+{i:05d}" for i in range(9973)])[cycle],
+        "amount": _lookup([f"+{i * 1.25:010.2f}" for i in range(9973)])[cycle],
+        "price": cycle * 0.37,
+        "share": (idx % 101) / 100,
+        "date": _lookup([str(d.date()) for d in pd.date_range(
+            "2024-01-01", periods=366)])[idx % 366],
+    }
+    if shape == "wide":
+        for k in range(WIDE_COLUMNS - len(data)):
+            if k % 2:
+                data[f"m{k:02d}"] = codes[(idx + k) % 1000]
+            else:
+                data[f"m{k:02d}"] = ((idx * (k + 1)) % 1000) / 8
+    return pd.DataFrame(data)
+
+
+def iter_frames(rows: int, shape: str):
+    for offset in range(0, rows, GEN_CHUNK_ROWS):
+        yield make_frame(min(GEN_CHUNK_ROWS, rows - offset), shape, offset)
+
+# -------------------------------
+# Fixture generators (one per input format)
+# -------------------------------
+
+
+def _gen_text(sep):
+    def gen(path, rows, shape, encoding):
+        with open(path, "w", encoding=encoding, newline="") as f:
+            for n, df in enumerate(iter_frames(rows, shape)):
+                df.to_csv(f, sep=sep, index=False, header=n == 0)
+    return gen
+
+
+def _gen_chunk_writer(out_format):
+    def gen(path, rows, shape, encoding):
+        from file_converter.writers import open_chunk_writer
+        with open_chunk_writer(path, out_format) as writer:
+            for df in iter_frames(rows, shape):
+                writer.write(df)
+    return gen
+
+
+def _sheet_sizes(rows: int, sheets: int = 3):
+    base, extra = divmod(rows, sheets)
+    return [base + (i < extra) for i in range(sheets)]
+
+
+def gen_xlsx(path, rows, shape, encoding):
+    from file_converter.writers import open_chunk_writer
+    offset = 0
+    with open_chunk_writer(path, "xlsx") as writer:
+        for n, size in enumerate(_sheet_sizes(rows), 1):
+            writer.start_sheet(f"Sheet{n}")
+            for start in range(0, size, GEN_CHUNK_ROWS):
+                count = min(GEN_CHUNK_ROWS, size - start)
+                writer.write(make_frame(count, shape, offset))
+                offset += count
+
+
+def gen_xls(path, rows, shape, encoding):
+    import xlwt
+    book = xlwt.Workbook(encoding="utf-8")
+    offset = 0
+    for n, size in enumerate(_sheet_sizes(rows), 1):
+        ws = book.add_sheet(f"Sheet{n}")
+        df = make_frame(size, shape, offset)
+        offset += size
+        for c, name in enumerate(df.columns):
+            ws.write(0, c, name)
+        for r, values in enumerate(df.itertuples(index=False), 1):
+            for c, value in enumerate(values):
+                ws.write(r, c, value.item() if hasattr(value, "item") else value)
+    book.save(path)
+
+
+def gen_html(path, rows, shape, encoding):
+    df = make_frame(rows, shape)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('<html><head><meta charset="utf-8"></head><body>\n')
+        f.write(df.to_html(index=False))
+        f.write("\n</body></html>\n")
+
+
+def gen_gz(path, rows, shape, encoding):
+    import gzip
+    with gzip.open(path, "wt", encoding=encoding, newline="") as f:
+        for n, df in enumerate(iter_frames(rows, shape)):
+            df.to_csv(f, index=False, header=n == 0)
+
+
+def gen_zip(path, rows, shape, encoding):
+    import io
+    offset = 0
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        for n, size in enumerate(_sheet_sizes(rows, 2), 1):
+            with zf.open(f"part{n}.csv", "w") as raw, \
+                    io.TextIOWrapper(raw, encoding=encoding, newline="") as f:
+                for start in range(0, size, GEN_CHUNK_ROWS):
+                    count = min(GEN_CHUNK_ROWS, size - start)
+                    make_frame(count, shape, offset).to_csv(
+                        f, index=False, header=start == 0)
+                    offset += count
+
+
+# input name -> (file extension, generator, text encodings it comes in)
+INPUTS = {
+    "xlsx": (".xlsx", gen_xlsx, False),
+    "xls": (".xls", gen_xls, False),
+    "csv": (".csv", _gen_text(","), True),
+    "tsv": (".tsv", _gen_text("\t"), True),
+    "tab": (".tab", _gen_text("\t"), True),
+    "txt": (".txt", _gen_text("\t"), True),
+    "html": (".html", gen_html, False),
+    "json": (".json", _gen_chunk_writer("json"), False),
+    "jsonl": (".jsonl", _gen_chunk_writer("jsonl"), False),
+    "xml": (".xml", _gen_chunk_writer("xml"), False),
+    "parquet": (".parquet", _gen_chunk_writer("parquet"), False),
+    "feather": (".feather", _gen_chunk_writer("feather"), False),
+    "gz": (".csv.gz", gen_gz, False),
+    "zip": (".zip", gen_zip, False),
+}
+
+TAB_INPUTS = ("tsv", "tab", "txt")
+DELIMITED_INPUTS = ("csv", "tsv", "tab", "txt")
+
+
+def uncovered_formats() -> list[str]:
+    """SUPPORTED_FORMATS entries none of whose extensions has a generator."""
+    from file_converter.detect import SUPPORTED_FORMATS
+    exts = {ext.split(".")[-1] for ext, _, _ in INPUTS.values()}
+    return [label for label, patterns in SUPPORTED_FORMATS
+            if not any(p.rsplit(".", 1)[-1] in exts
+                       for p in patterns.split(";"))]
+
+
+def fixture_path(data_dir, name, shape, encoding, rows) -> str:
+    ext = INPUTS[name][0]
+    tag = f"-{encoding}" if INPUTS[name][2] else ""
+    return os.path.join(data_dir, f"{name}-{shape}{tag}-{rows}{ext}")
+
+
+def ensure_fixture(data_dir, name, shape, encoding, rows) -> str:
+    """Generate a fixture unless it already exists (they are deterministic)."""
+    path = fixture_path(data_dir, name, shape, encoding, rows)
+    if not os.path.exists(path):
+        tmp = path + ".part" + INPUTS[name][0]
+        INPUTS[name][1](tmp, rows, shape, encoding or "utf-8")
+        os.replace(tmp, path)
+    return path
+
+# -------------------------------
+# Measurement (child process)
+# -------------------------------
+
+
+def _timed(fn, repeat: int) -> tuple:
+    """(best seconds, result of the last call) over `repeat` cold calls."""
+    from file_converter.detect import clear_probe_cache
+    best, result = None, None
+    for _ in range(repeat):
+        clear_probe_cache()
+        start = time.perf_counter()
+        result = fn()
+        seconds = time.perf_counter() - start
+        best = seconds if best is None else min(best, seconds)
+    return best, result
+
+
+def run_case(case: dict, repeat: int, chunksize: int) -> dict:
+    from file_converter import (guess_csv_delimiter, read_file,
+                                read_tab_strict, write_file)
+    from file_converter.batch import stream_convert
+
+    kind = case["kind"]
+    result = dict(case, seconds=None, rows_per_sec=None, mb_per_sec=None,
+                  calls_per_sec=None, peak_rss_mb=None, error=None)
+    out_dir = tempfile.mkdtemp(prefix="fc-bench-")
+    out_path = os.path.join(out_dir, f"out.{case.get('output')}")
+    try:
+        if kind == "read":
+            seconds, df = _timed(lambda: read_file(case["path"]), repeat)
+            rows, size = len(df), os.path.getsize(case["path"])
+        elif kind == "read_tab_strict":
+            seconds, df = _timed(lambda: read_tab_strict(case["path"]), repeat)
+            rows, size = len(df), os.path.getsize(case["path"])
+        elif kind == "guess_csv_delimiter":
+            def guess():
+                for _ in range(GUESS_CALLS):
+                    guess_csv_delimiter(case["path"])
+            seconds, _ = _timed(guess, repeat)
+            result["calls_per_sec"] = round(GUESS_CALLS / seconds)
+            seconds /= GUESS_CALLS
+            rows, size = None, None
+        elif kind == "write":
+            df = make_frame(case["rows"], case["shape"])
+            seconds, _ = _timed(
+                lambda: write_file(df, out_path, case["output"]), repeat)
+            rows, size = len(df), os.path.getsize(out_path)
+        else:
+            seconds, rows = _timed(
+                lambda: stream_convert(case["path"], out_path, case["output"],
+                                       chunksize), repeat)
+            size = os.path.getsize(case["path"])
+        result["seconds"] = round(seconds, 6)
+        if rows:
+            result["rows_per_sec"] = round(rows / seconds)
+        if size:
+            result["mb_per_sec"] = round(size / (1024 * 1024) / seconds, 2)
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}".splitlines()[0]
+    finally:
+        shutil.rmtree(out_dir, ignore_errors=True)
+    result["peak_rss_mb"] = peak_rss_mb()
+    return result
+
+# -------------------------------
+# Planning and running (parent process)
+# -------------------------------
+
+
+def plan_cases(args) -> list[dict]:
+    from file_converter.detect import OUTPUT_FORMATS
+    inputs = args.inputs or list(INPUTS)
+    outputs = args.outputs or list(OUTPUT_FORMATS)
+    cases = []
+    for rows in args.rows:
+        for shape in args.shapes:
+            for kind in args.kinds:
+                if kind == "write":
+                    cases += [dict(kind=kind, input=None, output=out,
+                                   shape=shape, encoding=None, rows=rows)
+                              for out in outputs]
+                    continue
+                for name in inputs:
+                    if kind == "read_tab_strict" and name not in TAB_INPUTS:
+                        continue
+                    if kind == "guess_csv_delimiter" and \
+                            name not in DELIMITED_INPUTS:
+                        continue
+                    encodings = args.encodings if INPUTS[name][2] else [None]
+                    for encoding in encodings:
+                        base = dict(kind=kind, input=name, shape=shape,
+                                    encoding=encoding, rows=rows)
+                        if kind == "convert":
+                            cases += [dict(base, output=out) for out in outputs]
+                        else:
+                            cases.append(dict(base, output=None))
+    return cases
+
+
+def _skip_reason(case: dict):
+    limit = MAX_INPUT_ROWS.get(case["input"])
+    if limit and case["rows"] > limit:
+        return f"{case['input']} fixtures are capped at {limit:,} rows"
+    limit = MAX_OUTPUT_ROWS.get(case["output"])
+    if limit and case["rows"] > limit:
+        return f"{case['output']} holds at most {limit:,} rows"
+    return None
+
+
+def run_in_child(case: dict, args) -> dict:
+    env = dict(os.environ)
+    # Keep the workbook metadata cache from carrying over between runs
+    env["FILE_CONVERTER_CACHE_DIR"] = tempfile.mkdtemp(prefix="fc-bench-cache-")
+    try:
+        out = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "run",
+             "--child", json.dumps(case), "--repeat", str(args.repeat),
+             "--chunksize", str(args.chunksize)],
+            capture_output=True, text=True, env=env, timeout=args.timeout)
+    except subprocess.TimeoutExpired:
+        return dict(case, error=f"timed out after {args.timeout} s")
+    finally:
+        shutil.rmtree(env["FILE_CONVERTER_CACHE_DIR"], ignore_errors=True)
+    if out.returncode != 0:
+        return dict(case, error=(out.stderr.strip().splitlines() or ["?"])[-1])
+    return json.loads(out.stdout)
+
+
+def _format_result(r: dict) -> str:
+    name = " ".join(str(p) for p in (r["kind"], r.get("input"), r.get("output"),
+                                     r["shape"], r.get("encoding"),
+                                     f"{r['rows']:,}") if p)
+    if r.get("skipped"):
+        return f"{name}: skipped ({r['skipped']})"
+    if r.get("error"):
+        return f"{name}: failed: {r['error']}"
+    if r.get("calls_per_sec"):
+        speed = f"{r['calls_per_sec']:,} calls/s"
+    else:
+        speed = f"{r['rows_per_sec']:,} rows/s, {r['mb_per_sec']} MB/s"
+    return f"{name}: {r['seconds']} s ({speed}), peak RSS {r['peak_rss_mb']} MB"
+
+
+def _meta() -> dict:
+    import pandas as pd
+    from file_converter import __version__
+    try:
+        import pyarrow
+        arrow = pyarrow.__version__
+    except ImportError:
+        arrow = None
+    return {"file_converter": __version__, "python": platform.python_version(),
+            "pandas": pd.__version__, "pyarrow": arrow,
+            "platform": platform.platform(),
+            "started": time.strftime("%Y-%m-%dT%H:%M:%S")}
+
+
+def cmd_run(args) -> int:
+    if args.child:
+        print(json.dumps(run_case(json.loads(args.child), args.repeat,
+                                  args.chunksize)))
+        return 0
+
+    for label in uncovered_formats():
+        print(f"warning: no fixture generator for {label!r}", file=sys.stderr)
+    data_dir = args.data_dir or tempfile.mkdtemp(prefix="fc-bench-data-")
+    os.makedirs(data_dir, exist_ok=True)
+    results = []
+    try:
+        cases = plan_cases(args)
+        for n, case in enumerate(cases, 1):
+            reason = _skip_reason(case)
+            if reason:
+                result = dict(case, skipped=reason)
+            else:
+                try:
+                    if case["input"]:
+                        case["path"] = ensure_fixture(
+                            data_dir, case["input"], case["shape"],
+                            case["encoding"], case["rows"])
+                    result = run_in_child(case, args)
+                except Exception as e:
+                    result = dict(case, error=f"fixture: {e}")
+                result.pop("path", None)
+            results.append(result)
+            if not args.quiet:
+                print(f"[{n}/{len(cases)}] {_format_result(result)}",
+                      file=sys.stderr)
+    finally:
+        if not args.data_dir:
+            shutil.rmtree(data_dir, ignore_errors=True)
+
+    report = {"meta": _meta(), "results": results}
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    return 0
+
+# -------------------------------
+# Compare mode
+# -------------------------------
+
+
+def _case_key(r: dict) -> tuple:
+    return (r["kind"], r.get("input"), r.get("output"), r["shape"],
+            r.get("encoding"), r["rows"])
+
+
+def _throughput(r: dict):
+    return r.get("calls_per_sec") or r.get("rows_per_sec")
+
+
+def compare_results(baseline: list, current: list, threshold: float) -> list:
+    """
+    Regressions of `current` against `baseline` as (case, message): a
+    throughput drop or peak RSS growth beyond `threshold` (a fraction), or
+    a case that used to succeed and now fails. Skipped cases are ignored,
+    as are cases missing from either side (see unmatched_cases).
+    """
+    before = {_case_key(r): r for r in baseline}
+    regressions = []
+    for r in current:
+        old = before.get(_case_key(r))
+        if old is None or old.get("skipped") or r.get("skipped") \
+                or old.get("error"):
+            continue
+        if r.get("error"):
+            regressions.append((r, f"now fails: {r['error']}"))
+            continue
+        was, now = _throughput(old), _throughput(r)
+        if was and now and now < was * (1 - threshold):
+            regressions.append(
+                (r, f"throughput {now:,} vs {was:,} ({now / was - 1:+.0%})"))
+        was, now = old.get("peak_rss_mb"), r.get("peak_rss_mb")
+        if was and now and now > was * (1 + threshold) \
+                and now - was > RSS_NOISE_MB:
+            regressions.append(
+                (r, f"peak RSS {now} MB vs {was} MB ({now / was - 1:+.0%})"))
+    return regressions
+
+
+def unmatched_cases(baseline: list, current: list) -> tuple:
+    """(cases only in `baseline`, cases only in `current`), in run order."""
+    before = {_case_key(r) for r in baseline}
+    now = {_case_key(r) for r in current}
+    return ([r for r in baseline if _case_key(r) not in now],
+            [r for r in current if _case_key(r) not in before])
+
+
+def _case_name(r: dict) -> str:
+    return " ".join(str(p) for p in _case_key(r) if p is not None)
+
+
+def cmd_compare(args) -> int:
+    reports = []
+    for path in (args.baseline, args.current):
+        with open(path, encoding="utf-8") as f:
+            reports.append(json.load(f)["results"])
+    regressions = compare_results(reports[0], reports[1], args.threshold)
+    for r, message in regressions:
+        print(f"REGRESSION {_case_name(r)}: {message}")
+    # Cases only one side ran can't be compared; list them so a shrunken
+    # run (or a renamed case) doesn't pass unnoticed
+    missing, added = unmatched_cases(reports[0], reports[1])
+    for r in missing:
+        print(f"MISSING {_case_name(r)}: in the baseline only")
+    for r in added:
+        print(f"NEW {_case_name(r)}: not in the baseline")
+    print(f"{len(regressions)} regression(s) beyond {args.threshold:.0%} "
+          f"across {len(reports[1])} case(s); {len(missing)} only in the "
+          f"baseline, {len(added)} only in the current run")
+    return 1 if regressions else 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="Run the benchmarks and write JSON results.")
+    run.add_argument("--rows", type=int, nargs="+", default=list(DEFAULT_ROWS),
+                     help="Table sizes to run (e.g. 1000 100000 10000000).")
+    run.add_argument("--shapes", nargs="+", choices=SHAPES, default=list(SHAPES))
+    run.add_argument("--encodings", nargs="+", choices=ENCODINGS,
+                     default=list(ENCODINGS),
+                     help="Encodings of the text fixtures.")
+    run.add_argument("--kinds", nargs="+", choices=KINDS, default=list(KINDS))
+    run.add_argument("--inputs", nargs="+", choices=list(INPUTS))
+    run.add_argument("--outputs", nargs="+", metavar="FORMAT",
+                     help="Output formats (default: all of OUTPUT_FORMATS).")
+    run.add_argument("--repeat", type=int, default=3,
+                     help="Timed runs per case; the fastest is kept.")
+    run.add_argument("--chunksize", type=int, default=100_000)
+    run.add_argument("--timeout", type=int, default=3600,
+                     help="Seconds before a case is abandoned.")
+    run.add_argument("--data-dir", default=None,
+                     help="Keep generated fixtures here (reused next run).")
+    run.add_argument("--json", metavar="FILE", default=None,
+                     help="Write results here instead of stdout.")
+    run.add_argument("--quiet", "-q", action="store_true")
+    run.add_argument("--child", help=argparse.SUPPRESS)
+
+    cmp = sub.add_parser("compare", help="Fail when results regressed.")
+    cmp.add_argument("baseline")
+    cmp.add_argument("current")
+    cmp.add_argument("--threshold", type=float, default=0.15,
+                     help="Allowed slowdown / RSS growth as a fraction "
+                          "(default 0.15).")
+
+    args = parser.parse_args(argv)
+    if args.command == "compare":
+        return cmd_compare(args)
+    return cmd_run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+# benchmarks/xlsx_writer.py
+"""
+Compare the streaming xlsx writer with the old df.to_excel(engine='openpyxl')
+path: rows/sec and peak RSS, each measured in a fresh process.
+
+    python benchmarks/xlsx_writer.py --rows 200000
+    python benchmarks/xlsx_writer.py --rows 1500000 --only streaming
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import subprocess
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.rss import peak_rss_mb  # noqa: E402
+
+MODES = ("to_excel", "streaming")
+
+
+def make_frame(rows: int, offset: int = 0):
+    import numpy as np
+    import pandas as pd
+    idx = np.arange(offset, offset + rows)
+    return pd.DataFrame({
+        "id": idx,
+        "code": [f"C{i % 1000:04d}" for i in idx],
+        "amount": (idx % 9973) * 1.25,
+        "units": idx % 17,
+        "date": pd.Timestamp("2024-01-01") + pd.to_timedelta(idx % 365, "D"),
+    })
+
+
+def run_one(mode: str, rows: int, chunksize: int) -> dict:
+    from file_converter.writers import open_chunk_writer
+
+    fd, path = tempfile.mkstemp(suffix=".xlsx")
+    os.close(fd)
+    try:
+        start = time.perf_counter()
+        if mode == "to_excel":
+            # Old write_file path: the whole frame through openpyxl cells
+            make_frame(rows).to_excel(path, index=False, engine="openpyxl")
+        else:
+            with open_chunk_writer(path, "xlsx") as writer:
+                for offset in range(0, rows, chunksize):
+                    writer.write(make_frame(min(chunksize, rows - offset),
+                                            offset))
+        seconds = time.perf_counter() - start
+        return {"mode": mode, "rows": rows, "seconds": round(seconds, 2),
+                "rows_per_sec": round(rows / seconds),
+                "peak_rss_mb": peak_rss_mb(),
+                "size_mb": round(os.path.getsize(path) / (1024 * 1024), 1),
+                "error": None}
+    except Exception as e:
+        return {"mode": mode, "rows": rows, "seconds": None,
+                "rows_per_sec": None, "peak_rss_mb": peak_rss_mb(),
+                "size_mb": None, "error": str(e)}
+    finally:
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--chunksize", type=int, default=100_000)
+    parser.add_argument("--only", choices=MODES)
+    parser.add_argument("--child", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(run_one(args.child, args.rows, args.chunksize)))
+        return 0
+
+    results = []
+    for mode in ([args.only] if args.only else MODES):
+        out = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--child", mode,
+             "--rows", str(args.rows), "--chunksize", str(args.chunksize)],
+            capture_output=True, text=True)
+        if out.returncode != 0:
+            results.append({"mode": mode, "rows": args.rows,
+                            "error": out.stderr.strip().splitlines()[-1:]})
+            continue
+        results.append(json.loads(out.stdout))
+
+    for r in results:
+        if r.get("error"):
+            print(f"{r['mode']:>10}: failed: {r['error']}")
+        else:
+            print(f"{r['mode']:>10}: {r['rows']:,} rows in {r['seconds']} s "
+                  f"({r['rows_per_sec']:,} rows/s), peak RSS "
+                  f"{r['peak_rss_mb']} MB, {r['size_mb']} MB on disk")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
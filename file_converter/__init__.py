@@ -0,0 +1,34 @@
+# file_converter/__init__.py
+"""
+File Converter core: format detection, readers and writers shared by the
+GUI and the headless `python -m file_converter` batch CLI.
+"""
+
+__version__ = "3.0"
+
+from .errors import ConversionError  # noqa: E402
+from .options import ConvertOptions  # noqa: E402
+from .detect import (  # noqa: E402
+    SUPPORTED_FORMATS, OUTPUT_FORMATS, FileProbe, detect_encoding,
+    guess_csv_delimiter, probe_file
+)
+from .readers import read_file, read_tab_strict  # noqa: E402
+from .writers import write_file  # noqa: E402
+from .workbook import WorkbookInfo, WorkbookSession, get_workbook_info  # noqa: E402
+
+__all__ = [
+    "ConversionError",
+    "ConvertOptions",
+    "SUPPORTED_FORMATS",
+    "OUTPUT_FORMATS",
+    "FileProbe",
+    "detect_encoding",
+    "guess_csv_delimiter",
+    "probe_file",
+    "read_file",
+    "read_tab_strict",
+    "write_file",
+    "WorkbookInfo",
+    "WorkbookSession",
+    "get_workbook_info",
+]
@@ -0,0 +1,11 @@
+# file_converter/__main__.py
+
+
+import sys
+import multiprocessing
+
+from .cli import main
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
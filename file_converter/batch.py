@@ -0,0 +1,662 @@
+# file_converter/batch.py
+
+
+import os
+import time
+import shutil
+import hashlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed, wait
+
+from .compressed import strip_compression_ext
+from .detect import probe_file
+from .errors import ConversionError, ConversionCancelled
+from .manifest import MANIFEST_NAME, OutputManifest, file_digest
+from .options import option
+from .parallel import WORKER_BASE_MB, sheet_workers
+from .readers import (DEFAULT_CHUNKSIZE, STREAMABLE_EXCEL_EXTS,
+                      html_table_selector, iter_file_chunks, iter_html_tables,
+                      xml_row_path)
+from .scan import bundle_members
+from .workbook import WorkbookSession, get_workbook_info
+from .writers import open_chunk_writer, writer_options
+
+# -------------------------------
+# Batch planning
+# -------------------------------
+
+
+def collect_inputs(paths) -> list[str]:
+    """
+    Expand files and folders into a flat, de-duplicated list of input files.
+    Folders are walked recursively, the same way the GUI adds dropped folders.
+    """
+    seen = set()
+    inputs = []
+
+    def add(p):
+        if p not in seen:
+            seen.add(p)
+            inputs.append(p)
+
+    for path in paths:
+        if os.path.isfile(path):
+            add(path)
+        elif os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()  # stable order, so output_bases numbers stably
+                for file in sorted(files):
+                    if file != MANIFEST_NAME:
+                        add(os.path.join(root, file))
+    return inputs
+
+
+def _output_base(in_path: str) -> str:
+    """'in/statement.tsv.gz' -> 'statement'."""
+    return os.path.splitext(os.path.basename(strip_compression_ext(in_path)))[0]
+
+
+def output_bases(inputs, reserved=None) -> dict:
+    """
+    {input: base name of its outputs}. Inputs whose names would collide in
+    one output folder ('a/data.csv' and 'b/data.tsv' are both 'data') are
+    numbered in input order: data, data_2, data_3... The comparison ignores
+    case, as Windows file names do. `reserved` ({input: base}, e.g.
+    OutputManifest.bases()) holds names earlier runs gave: those inputs keep
+    them and no other input is given one, so adding an input never renames
+    (or overwrites) another's outputs.
+    """
+    reserved = {os.path.abspath(p): b for p, b in (reserved or {}).items()}
+    natural = {p: _output_base(p) for p in inputs}
+    taken = {b.lower() for b in natural.values()}
+    seen = {b.lower() for b in reserved.values()}
+    taken |= seen
+    bases = {}
+    for path in inputs:
+        base = reserved.get(os.path.abspath(path))
+        if base is not None:
+            bases[path] = base
+    for path, base in natural.items():
+        if path in bases:
+            continue
+        if base.lower() in seen:
+            n = 2
+            while f"{base}_{n}".lower() in taken:
+                n += 1
+            base = f"{base}_{n}"
+            taken.add(base.lower())
+        seen.add(base.lower())
+        bases[path] = base
+    return {p: bases[p] for p in inputs}
+
+
+def output_path_for(in_path: str, out_dir: str, out_format: str,
+                    base: str = None) -> str:
+    """{out_dir}/{base}.{format}; `base` defaults to the input's own name
+    (see output_bases for a batch of inputs)."""
+    base = base or _output_base(in_path)
+    return os.path.join(out_dir, f"{base}.{out_format}")
+
+
+def part_output_path(in_path: str, out_dir: str, out_format: str,
+                     part: str, base: str = None) -> str:
+    """Output for one sheet or ZIP member of `in_path`: {base}_{part}.{format}."""
+    base = base or _output_base(in_path)
+    return os.path.join(out_dir, f"{base}_{part}.{out_format}")
+
+
+def member_part_name(member: str) -> str:
+    """'2024/q1.csv.gz' -> '2024_q1': a ZIP member's part of an output name."""
+    return os.path.splitext(strip_compression_ext(member))[0].replace('/', '_')
+
+
+def table_part_name(index: int) -> str:
+    """3 -> 'table3': an HTML table's part of an output name."""
+    return f"table{index}"
+
+
+# Bytes hashed to split same-size files before hashing them whole
+DEDUPE_HEAD_BYTES = 64 * 1024
+
+
+def _head_digest(path: str) -> str:
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read(DEDUPE_HEAD_BYTES)).hexdigest()
+
+
+def find_duplicates(inputs) -> dict:
+    """
+    {duplicate path: first input with the same content} among `inputs`.
+    Files are grouped by size and then by detected format (the same bytes
+    named .csv and .tsv don't convert alike); only files matching on both
+    are hashed, and only those whose first DEDUPE_HEAD_BYTES also match are
+    hashed whole. Unreadable files are never reported as duplicates.
+    """
+    by_size = {}
+    for path in inputs:
+        try:
+            by_size.setdefault(os.path.getsize(path), []).append(path)
+        except OSError:
+            continue
+
+    def group(paths, key):
+        groups = {}
+        for path in paths:
+            try:
+                groups.setdefault(key(path), []).append(path)
+            except OSError:
+                continue
+        return [g for g in groups.values() if len(g) > 1]
+
+    duplicates = {}
+    for size, paths in by_size.items():
+        if len(paths) < 2:
+            continue
+        candidates = [g for c in group(paths, lambda p: probe_file(p).format)
+                      for g in group(c, _head_digest)]
+        if size > DEDUPE_HEAD_BYTES:
+            candidates = [g for c in candidates for g in group(c, file_digest)]
+        for first, *rest in candidates:
+            for path in rest:
+                duplicates[path] = first
+    return duplicates
+
+
+def link_or_copy(src: str, dst: str):
+    """Make `dst` a hard link to `src`, copying where links aren't possible."""
+    if os.path.abspath(src) == os.path.abspath(dst):
+        return
+    if os.path.lexists(dst):
+        os.remove(dst)
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+# -------------------------------
+# Conversion engine
+# -------------------------------
+
+
+def stream_convert(in_path: str, out_path: str, out_format: str,
+                   chunksize=DEFAULT_CHUNKSIZE, cancel=None,
+                   info=None, sheet=None, header=0, chunks=None,
+                   options=None) -> int:
+    """
+    Convert `in_path` to `out_path` chunk by chunk and return the row count
+    (0 means nothing was written). Delimited text and .xlsx inputs are read
+    in bounded row chunks and appended to a streaming writer, so memory
+    stays flat. `sheet` picks one worksheet; `header` is the workbook
+    header row (index, None or 'auto').
+    `cancel` is an optional threading.Event checked between chunks; when it
+    is set the partial output is removed and ConversionCancelled is raised.
+    If `info` is a dict it receives the detected text "encoding" (or None).
+    `chunks`, if given, are DataFrames already read from `in_path` to write
+    instead of reading it again. `options` (ConvertOptions) goes to the
+    reader and the writer.
+    """
+    if chunks is None:
+        chunks = iter_file_chunks(in_path, chunksize, sheet, header,
+                                  options=options)
+    with open_chunk_writer(out_path, out_format, options) as writer:
+        for chunk in chunks:
+            if cancel is not None and cancel.is_set():
+                raise ConversionCancelled(in_path)
+            if info is not None and "encoding" not in info:
+                info["encoding"] = chunk.attrs.get("encoding")
+            writer.write(chunk)
+    return writer.rows
+
+
+def stream_convert_sheets(in_path: str, targets, out_format: str,
+                          chunksize=DEFAULT_CHUNKSIZE, cancel=None,
+                          jobs=None, max_memory_mb=None,
+                          options=None, header=0) -> list[int]:
+    """
+    stream_convert() each (sheet, out_path) in `targets` and return the row
+    counts in the same order. Sheets of a large workbook are converted in
+    parallel worker processes (see parallel.sheet_workers; each streams with
+    bounded memory). The first failure, in sheet order, is re-raised once
+    every sheet has finished; a set `cancel` event stops all workers
+    between chunks and raises ConversionCancelled. max_memory_mb defaults
+    to that of `options` (ConvertOptions), which also go to each sheet's
+    stream_convert, as does `header`.
+    """
+    targets = list(targets)
+    max_memory_mb = max_memory_mb or option(options, "max_memory_mb")
+    workers = sheet_workers(in_path, len(targets), jobs, max_memory_mb,
+                            per_worker_mb=WORKER_BASE_MB)
+    if workers == 1:
+        rows = []
+        for sheet, out_path in targets:
+            if cancel is not None and cancel.is_set():
+                raise ConversionCancelled(in_path)
+            rows.append(stream_convert(in_path, out_path, out_format,
+                                       chunksize, cancel=cancel, sheet=sheet,
+                                       header=header, options=options))
+        return rows
+
+    with multiprocessing.Manager() as manager, \
+            ProcessPoolExecutor(max_workers=workers) as pool:
+        # A thread Event can't cross processes; mirror it into a managed one
+        shared_cancel = manager.Event()
+        futures = [pool.submit(stream_convert, in_path, out_path, out_format,
+                               chunksize, shared_cancel, None, sheet,
+                               header, options=options)
+                   for sheet, out_path in targets]
+        pending = set(futures)
+        while pending:
+            _, pending = wait(pending, timeout=0.2)
+            if cancel is not None and cancel.is_set():
+                shared_cancel.set()
+                for f in pending:
+                    f.cancel()  # not started yet: don't start at all
+        if shared_cancel.is_set():
+            raise ConversionCancelled(in_path)
+        return [f.result() for f in futures]
+
+
+def stream_sheets_to_workbook(sheet_chunks, out_path: str,
+                              cancel=None) -> dict:
+    """
+    Write several sheets into one .xlsx in a single writer session and save.
+    `sheet_chunks` yields (sheet_name, iterable of DataFrame chunks); each
+    non-empty sheet becomes one output sheet (rolling over at the row
+    limit). Returns {output sheet name: rows}; empty if nothing was written,
+    in which case no file is created.
+    """
+    with open_chunk_writer(out_path, 'xlsx') as writer:
+        for sheet, chunks in sheet_chunks:
+            writer.start_sheet(sheet)
+            for chunk in chunks:
+                if cancel is not None and cancel.is_set():
+                    raise ConversionCancelled(out_path)
+                writer.write(chunk)
+    return writer.sheet_rows
+
+
+def convert_file(in_path: str, out_dir: str, out_format: str,
+                 chunksize=DEFAULT_CHUNKSIZE, header=0,
+                 sheet_rules=None, out_base=None, options=None,
+                 sheets=None, combine_sheets=False, cancel=None,
+                 session=None) -> dict:
+    """
+    Convert one file and return a result record; never raises.
+    Outputs are named after `out_base` (default: the input's name).
+    status is one of "ok", "empty" (nothing to write), "cancelled" or
+    "error".
+    With sheet_rules (a SheetRules), or `sheets` (the sheet names to
+    convert), each selected sheet of a workbook is written to
+    {base}_{sheet}.{format}; likewise each member of a ZIP archive to
+    {base}_{member}.{format}, and with the 'all' HTML table selector each
+    table to {base}_table{N}.{format}. With combine_sheets and xlsx output
+    those parts become the sheets of one {base}.xlsx instead.
+    "outputs" lists every file written and "output" is the first of them.
+    `options` (ConvertOptions) goes to every read and write. A set `cancel`
+    event (threading.Event) stops the conversion between chunks and
+    removes its partial output. Workbooks that can't be streamed (.xlsb,
+    .xls the built-in reader can't open) are parsed whole through
+    `session` (a WorkbookSession), which releases the file afterwards.
+    """
+    start = time.perf_counter()
+    result = {"input": in_path, "output": None, "status": "ok",
+              "rows": 0, "encoding": None, "seconds": 0.0, "error": None}
+    book = session
+    try:
+        if cancel is not None and cancel.is_set():
+            raise ConversionCancelled(in_path)
+        if not os.path.exists(in_path):
+            raise FileNotFoundError(f"File or folder not found: {in_path}")
+        out_path = output_path_for(in_path, out_dir, out_format, out_base)
+        probe = probe_file(in_path)
+        parts = None
+        whole = False
+        if probe.format == 'zip':
+            parts = [(m, member_part_name(m), None)
+                     for m in bundle_members(in_path)]
+        elif probe.format == 'html' and html_table_selector(options) == 'all':
+            # Every table from one parse of the document, framed in turn
+            parts = ((i, table_part_name(i), [df]) for i, df in
+                     iter_html_tables(in_path, selector='all'))
+        elif probe.is_excel and (sheets is not None
+                                 or sheet_rules is not None):
+            if sheets is None:
+                sheets = sheet_rules.select(get_workbook_info(in_path))
+            book = book or WorkbookSession()
+            whole = _parsed_whole(in_path, probe, book)
+            if whole:
+                xls = book.excel_file(in_path)
+                parts = [(s, s, _parse_sheet(xls, s, header))
+                         for s in sheets]
+            else:
+                parts = [(s, s, None) for s in sheets]
+        if parts is None:
+            info = {}
+            rows = stream_convert(in_path, out_path, out_format, chunksize,
+                                  cancel=cancel, info=info, header=header,
+                                  options=options)
+            result["encoding"] = info.get("encoding")
+            outputs = [out_path] if rows else []
+            result["rows"] = rows
+        elif combine_sheets and out_format == 'xlsx':
+            sheet_chunks = ((part, chunks if chunks is not None else
+                             iter_file_chunks(in_path, chunksize, sheet,
+                                              header, options=options))
+                            for sheet, part, chunks in parts)
+            written = stream_sheets_to_workbook(sheet_chunks, out_path,
+                                                cancel=cancel)
+            outputs = [out_path] if written else []
+            result["rows"] = sum(written.values())
+        elif probe.is_excel and not whole:
+            # Sheets of a large workbook convert in parallel processes
+            targets = [(sheet, part_output_path(in_path, out_dir, out_format,
+                                                part, out_base))
+                       for sheet, part, _ in parts]
+            rows = stream_convert_sheets(in_path, targets, out_format,
+                                         chunksize, cancel=cancel,
+                                         options=options, header=header)
+            outputs = [out for (_, out), n in zip(targets, rows) if n]
+            result["rows"] = sum(rows)
+        else:
+            outputs = []
+            for sheet, part, chunks in parts:
+                sheet_out = part_output_path(in_path, out_dir, out_format,
+                                             part, out_base)
+                rows = stream_convert(in_path, sheet_out, out_format,
+                                      chunksize, cancel=cancel, sheet=sheet,
+                                      header=header, chunks=chunks,
+                                      options=options)
+                if rows:
+                    outputs.append(sheet_out)
+                    result["rows"] += rows
+        if parts is not None:
+            result["outputs"] = outputs
+        result["output"] = outputs[0] if outputs else None
+        if not outputs:
+            result["status"] = "empty"
+    except ConversionCancelled:
+        result.update(status="cancelled", output=None, rows=0)
+        result.pop("outputs", None)
+    except ConversionError as e:
+        result["status"] = "error"
+        result["error"] = f"{e.title}: {e}"
+    except Exception as e:
+        result["status"] = "error"
+        result["error"] = str(e)
+    finally:
+        if book is not None:
+            book.release(in_path)
+    result["seconds"] = round(time.perf_counter() - start, 4)
+    return result
+
+
+def _parsed_whole(in_path: str, probe, session) -> bool:
+    """True for a workbook whose sheets can't be streamed in row chunks."""
+    if probe.format == 'xls':
+        return session.needs_intermediate(in_path)
+    return os.path.splitext(in_path)[1].lower() not in STREAMABLE_EXCEL_EXTS
+
+
+def _parse_sheet(xls, sheet: str, header):
+    # One chunk, parsed when the sheet's turn comes
+    yield xls.parse(sheet, header=0 if header == 'auto' else header)
+
+
+def _result_outputs(result: dict) -> list:
+    return result.get("outputs") or [result["output"]]
+
+
+def _manifest_options(kw: dict, out_format: str) -> dict:
+    """The settings recorded with each output: those that change it."""
+    convert_options = kw["options"]
+    options = {"header": kw["header"],
+               **writer_options(out_format, convert_options)}
+    if xml_row_path(convert_options):
+        options["xml_row_path"] = xml_row_path(convert_options)
+    if html_table_selector(convert_options):
+        options["html_tables"] = html_table_selector(convert_options)
+    if kw["sheet_rules"] is not None:
+        options["sheet_rules"] = kw["sheet_rules"].to_dict()
+    if kw["combine_sheets"] and out_format == 'xlsx':
+        options["combine_sheets"] = True
+    return options
+
+
+def _file_kw(kw: dict, in_path: str) -> dict:
+    """convert_file keywords for `in_path`: kw with its own sheet list."""
+    return dict(kw, sheets=kw["sheets"].get(in_path))
+
+
+def _skipped_result(in_path: str, manifest: OutputManifest) -> dict:
+    out_dir = os.path.dirname(manifest.path)
+    outputs = [os.path.join(out_dir, name) for name in
+               manifest.entries[os.path.abspath(in_path)]["outputs"]]
+    return {"input": in_path, "output": outputs[0] if outputs else None,
+            "outputs": outputs, "status": "skipped", "rows": 0,
+            "encoding": None, "seconds": 0.0, "error": None}
+
+
+def _duplicate_result(in_path: str, original: dict, out_dir: str,
+                      bases: dict) -> dict:
+    """Result for an input with the same content as `original`'s input."""
+    result = dict(original, input=in_path, seconds=0.0,
+                  duplicate_of=original["input"])
+    if original["output"]:
+        start = time.perf_counter()
+        # Same output names with this input's base name in front
+        base = os.path.join(out_dir, bases[in_path])
+        orig_base = os.path.join(out_dir, bases[original["input"]])
+        outputs = [base + src[len(orig_base):]
+                   for src in _result_outputs(original)]
+        try:
+            for src, dst in zip(_result_outputs(original), outputs):
+                link_or_copy(src, dst)
+            result["output"] = outputs[0]
+            if "outputs" in original:
+                result["outputs"] = outputs
+        except OSError as e:
+            result.update(status="error", output=None, outputs=[], rows=0,
+                          error=f"Could not link duplicate output: {e}")
+        result["seconds"] = round(time.perf_counter() - start, 4)
+    return result
+
+
+def convert_batch(inputs, out_dir: str, out_format: str, jobs=None,
+                  on_result=None, chunksize=DEFAULT_CHUNKSIZE,
+                  header=0, incremental=False, dedupe=False,
+                  sheet_rules=None, options=None, sheets=None,
+                  combine_sheets=False, cancel=None,
+                  session=None) -> list[dict]:
+    """
+    Convert `inputs` into `out_dir` across a process pool of `jobs` workers
+    (default: one per CPU; 1 runs in-process). `on_result(result)` is called
+    as each file finishes. Results are returned in input order.
+    With incremental, inputs whose outputs are up to date according to the
+    folder's OutputManifest are not converted again (status "skipped"), and
+    the manifest is updated with everything converted in this run.
+    With dedupe, inputs with identical content (find_duplicates) are
+    converted once; the copies' outputs are hard links (or copies) of it
+    and their results carry "duplicate_of". Copies of an input skipped as
+    up to date are converted (once) themselves and recorded.
+    sheet_rules (SheetRules) converts the selected sheets of each workbook
+    to separate files (see convert_file). Inputs from different folders
+    with the same name get numbered output names (see output_bases);
+    incremental runs keep the names recorded in the manifest.
+    `options` (ConvertOptions) holds the reader and writer settings.
+    `sheets` maps a workbook to the sheets to convert ({input: [names]}),
+    overriding sheet_rules for it; copies with a different selection are
+    not linked. combine_sheets, `cancel` and `session` are passed to
+    convert_file; a set cancel event leaves the files not yet converted
+    with status "cancelled". The cancel event and session (which can't
+    cross processes) are used in-process only: with jobs=1, or once the
+    pool has stopped taking files.
+    """
+    kw = dict(chunksize=chunksize, header=header, sheet_rules=sheet_rules,
+              options=options, sheets=sheets or {},
+              combine_sheets=combine_sheets, cancel=cancel, session=session)
+    reserved = OutputManifest(out_dir).bases() if incremental else None
+    bases = output_bases(inputs, reserved)
+    if dedupe:
+        return _convert_deduped(inputs, out_dir, out_format, jobs, on_result,
+                                incremental, kw, bases)
+    return _convert_changed(inputs, out_dir, out_format, jobs, on_result,
+                            incremental, kw, bases)
+
+
+def _convert_changed(inputs, out_dir, out_format, jobs, on_result,
+                     incremental, kw, bases) -> list[dict]:
+    if not incremental:
+        return _convert_all(inputs, out_dir, out_format, jobs, on_result, kw,
+                            bases)
+    manifest = OutputManifest(out_dir)
+    options = _manifest_options(kw, out_format)
+    results = [None] * len(inputs)
+    todo = []
+    for idx, in_path in enumerate(inputs):
+        if manifest.is_current(in_path, out_format, kw["sheets"].get(in_path),
+                               options, bases[in_path]):
+            results[idx] = _skipped_result(in_path, manifest)
+            if on_result:
+                on_result(results[idx])
+        else:
+            todo.append(idx)
+    converted = _convert_all([inputs[i] for i in todo], out_dir, out_format,
+                             jobs, on_result, kw, bases)
+    for idx, result in zip(todo, converted):
+        results[idx] = result
+        in_path = inputs[idx]
+        if result["status"] in ("ok", "empty"):
+            manifest.record(in_path, _result_outputs(result), out_format,
+                            kw["sheets"].get(in_path), options,
+                            bases[in_path])
+        else:
+            manifest.forget(in_path)
+    manifest.save()
+    return results
+
+
+def _convert_deduped(inputs, out_dir, out_format, jobs, on_result,
+                     incremental, kw, bases) -> list[dict]:
+    # Same content but a different sheet selection is converted on its own
+    sheets = kw["sheets"]
+    duplicates = {p: first for p, first in find_duplicates(inputs).items()
+                  if sheets.get(p) == sheets.get(first)}
+    unique = [p for p in inputs if p not in duplicates]
+    converted = dict(zip(unique, _convert_changed(
+        unique, out_dir, out_format, jobs, on_result, incremental, kw,
+        bases)))
+    results = []
+    manifest = OutputManifest(out_dir) if incremental else None
+    options = _manifest_options(kw, out_format)
+
+    def finish(idx, result):
+        results[idx] = result
+        in_path = inputs[idx]
+        if manifest is not None and result["status"] in ("ok", "empty"):
+            manifest.record(in_path, _result_outputs(result), out_format,
+                            sheets.get(in_path), options, bases[in_path])
+        if on_result:
+            on_result(result)
+
+    # Copies of an input that was skipped as up to date have nothing
+    # converted in this run to link to: the first copy of each is converted
+    # and the others link to it
+    orphans = {}
+    for idx, in_path in enumerate(inputs):
+        original = duplicates.get(in_path)
+        results.append(converted.get(in_path))
+        if original is None:
+            continue
+        if manifest is not None and manifest.is_current(
+                in_path, out_format, sheets.get(in_path), options,
+                bases[in_path]):
+            results[idx] = _skipped_result(in_path, manifest)
+            if on_result:
+                on_result(results[idx])
+        elif converted[original]["status"] == "skipped":
+            orphans.setdefault(original, []).append(idx)
+        else:
+            finish(idx, _duplicate_result(in_path, converted[original],
+                                          out_dir, bases))
+    firsts = [idxs[0] for idxs in orphans.values()]
+    redone = _convert_all([inputs[i] for i in firsts], out_dir, out_format,
+                          jobs, None, kw, bases)
+    for (original, idxs), result in zip(orphans.items(), redone):
+        result["duplicate_of"] = original
+        finish(idxs[0], result)
+        for idx in idxs[1:]:
+            finish(idx, dict(_duplicate_result(inputs[idx], result, out_dir,
+                                               bases), duplicate_of=original))
+    if manifest is not None:
+        manifest.save()
+    return results
+
+
+def _convert_all(inputs, out_dir, out_format, jobs, on_result,
+                 kw, bases) -> list[dict]:
+    jobs = jobs or os.cpu_count() or 1
+    results = [None] * len(inputs)
+    if jobs == 1 or len(inputs) <= 1:
+        for idx, in_path in enumerate(inputs):
+            results[idx] = convert_file(in_path, out_dir, out_format,
+                                        out_base=bases[in_path],
+                                        **_file_kw(kw, in_path))
+            if on_result:
+                on_result(results[idx])
+        return results
+
+    cancel = kw["cancel"]
+    pool_kw = dict(kw, cancel=None, session=None)
+    with ProcessPoolExecutor(max_workers=min(jobs, len(inputs))) as pool:
+        futures = {
+            pool.submit(convert_file, in_path, out_dir, out_format,
+                        out_base=bases[in_path],
+                        **_file_kw(pool_kw, in_path)): idx
+            for idx, in_path in enumerate(inputs)
+        }
+        for fut in as_completed(futures):
+            idx = futures[fut]
+            if cancel is not None and cancel.is_set():
+                for f in futures:
+                    f.cancel()  # not started yet: don't start at all
+            if fut.cancelled():
+                # Never started: reported by an in-process call, which
+                # sees the cancel event
+                results[idx] = convert_file(inputs[idx], out_dir, out_format,
+                                            out_base=bases[inputs[idx]],
+                                            **_file_kw(kw, inputs[idx]))
+            else:
+                try:
+                    results[idx] = fut.result()
+                except Exception as e:
+                    # Worker died (e.g. killed for memory) before returning
+                    results[idx] = {"input": inputs[idx], "output": None,
+                                    "status": "error", "rows": 0,
+                                    "encoding": None, "seconds": 0.0,
+                                    "error": f"Worker failed: {e}"}
+            if on_result:
+                on_result(results[idx])
+    return results
+
+
+def summarize(results: list[dict]) -> dict:
+    counts = {"ok": 0, "empty": 0, "error": 0, "skipped": 0}
+    encodings = {}
+    duplicates = []
+    for r in results:
+        if r.get("duplicate_of"):
+            duplicates.append({"input": r["input"],
+                               "duplicate_of": r["duplicate_of"]})
+        counts[r["status"]] = counts.get(r["status"], 0) + 1
+        if r.get("encoding"):
+            encodings[r["encoding"]] = encodings.get(r["encoding"], 0) + 1
+    return {
+        "total": len(results),
+        "converted": counts["ok"],
+        "empty": counts["empty"],
+        "skipped": counts["skipped"],
+        "failed": counts["error"],
+        "encodings": encodings,
+        "duplicates": duplicates,
+        "files": results,
+    }
@@ -0,0 +1,568 @@
+# file_converter/biff.py
+
+
+import struct
+
+from .detect import OLE_SIGNATURE
+
+# -------------------------------
+# OLE2 compound file (read-only)
+# -------------------------------
+_FREESECT = 0xFFFFFFFF
+_ENDOFCHAIN = 0xFFFFFFFE
+
+
+class OleFile:
+    """
+    Minimal reader for the OLE2 compound-document container of legacy
+    .xls files. Only the FAT, directory and (mini) stream chains are read;
+    stream data is fetched sector by sector on demand, so opening a large
+    workbook to read its first records stays cheap.
+    """
+
+    def __init__(self, fh):
+        self._fh = fh
+        header = fh.read(512)
+        if len(header) < 512 or not header.startswith(OLE_SIGNATURE):
+            raise ValueError("Not an OLE2 compound file")
+        self.sector_size = 1 << struct.unpack_from('<H', header, 0x1E)[0]
+        self.mini_sector_size = 1 << struct.unpack_from('<H', header, 0x20)[0]
+        (n_fat, first_dir, _, self.mini_cutoff, first_minifat, n_minifat,
+         first_difat, n_difat) = struct.unpack_from('<8I', header, 0x2C)
+
+        # FAT sector ids: 109 in the header, the rest in the DIFAT chain
+        fat_sids = list(struct.unpack_from('<109I', header, 0x4C))
+        per_sector = self.sector_size // 4
+        sid = first_difat
+        for _ in range(n_difat):
+            if sid >= _ENDOFCHAIN:
+                break
+            ids = struct.unpack('<%dI' % per_sector, self._sector(sid))
+            fat_sids.extend(ids[:-1])
+            sid = ids[-1]
+        fat = bytearray()
+        for sid in fat_sids[:n_fat]:
+            if sid != _FREESECT:
+                fat += self._sector(sid)
+        self._fat = struct.unpack('<%dI' % (len(fat) // 4), fat)
+
+        self._entries = {}
+        self._root = None
+        dir_data = self._read_chain(first_dir)
+        for off in range(0, len(dir_data) - 127, 128):
+            name_len, kind = struct.unpack_from('<HB', dir_data, off + 64)
+            if kind not in (1, 2, 5) or name_len < 2:
+                continue
+            name = dir_data[off:off + name_len - 2].decode('utf-16-le', 'replace')
+            start, size = struct.unpack_from('<II', dir_data, off + 116)
+            if kind == 5:
+                self._root = (start, size)
+            elif kind == 2:
+                self._entries.setdefault(name.lower(), (start, size))
+
+        self._minifat = None
+        if n_minifat and first_minifat < _ENDOFCHAIN:
+            data = self._read_chain(first_minifat)
+            self._minifat = struct.unpack('<%dI' % (len(data) // 4), data)
+        self._ministream = None
+
+    def _sector(self, sid: int) -> bytes:
+        self._fh.seek((sid + 1) * self.sector_size)
+        return self._fh.read(self.sector_size)
+
+    def _chain(self, sid: int, table) -> list:
+        chain = []
+        while sid < _ENDOFCHAIN and sid < len(table):
+            chain.append(sid)
+            if len(chain) > len(table):
+                raise ValueError("Corrupt OLE sector chain")
+            sid = table[sid]
+        return chain
+
+    def _read_chain(self, sid: int) -> bytes:
+        return b''.join(self._sector(s) for s in self._chain(sid, self._fat))
+
+    def exists(self, name: str) -> bool:
+        return name.lower() in self._entries
+
+    def open_stream(self, name: str) -> "OleStream":
+        start, size = self._entries[name.lower()]
+        if size < self.mini_cutoff and self._root is not None:
+            if self._ministream is None:
+                self._ministream = self._read_chain(self._root[0])
+            data = b''.join(
+                self._ministream[s * self.mini_sector_size:
+                                 (s + 1) * self.mini_sector_size]
+                for s in self._chain(start, self._minifat or ()))
+            return OleStream(None, [], 0, size, data)
+        return OleStream(self, self._chain(start, self._fat),
+                         self.sector_size, size)
+
+
+class OleStream:
+    """
+    Seekable read-only view of one stream. Sectors are fetched on demand,
+    a run of contiguous sectors (up to READ_AHEAD_SECTORS) per disk read.
+    """
+
+    READ_AHEAD_SECTORS = 128
+
+    def __init__(self, ole, chain, sector_size, size, data=None):
+        self._ole = ole
+        self._chain = chain
+        self._sector_size = sector_size
+        self.size = size
+        self._data = data
+        self._pos = 0
+        self._run_start = self._run_end = 0  # cached chain indexes [start, end)
+        self._run = b''
+
+    def _sector_data(self, idx: int) -> bytes:
+        if not self._run_start <= idx < self._run_end:
+            end = idx + 1
+            while (end < len(self._chain)
+                   and end - idx < self.READ_AHEAD_SECTORS
+                   and self._chain[end] == self._chain[end - 1] + 1):
+                end += 1
+            fh = self._ole._fh
+            fh.seek((self._chain[idx] + 1) * self._sector_size)
+            self._run = fh.read((end - idx) * self._sector_size)
+            self._run_start, self._run_end = idx, end
+        off = (idx - self._run_start) * self._sector_size
+        return self._run[off:off + self._sector_size]
+
+    def seek(self, pos: int):
+        self._pos = max(0, min(pos, self.size))
+
+    def tell(self) -> int:
+        return self._pos
+
+    def read(self, n: int = -1) -> bytes:
+        end = self.size if n < 0 else min(self.size, self._pos + n)
+        if self._data is not None:
+            out = self._data[self._pos:end]
+        else:
+            parts = []
+            pos = self._pos
+            while pos < end:
+                idx, off = divmod(pos, self._sector_size)
+                take = min(self._sector_size - off, end - pos)
+                parts.append(self._sector_data(idx)[off:off + take])
+                pos += take
+            out = b''.join(parts)
+        self._pos = end
+        return out
+
+# -------------------------------
+# BIFF records
+# -------------------------------
+BOF = 0x0809
+EOF = 0x000A
+FILEPASS = 0x002F
+BOUNDSHEET = 0x0085
+DIMENSIONS = 0x0200
+
+_SHEET_STATES = {0: 'visible', 1: 'hidden', 2: 'veryHidden'}
+
+
+def iter_records(stream, start: int = 0):
+    """Yield (offset, record type, payload) from `start` to the end of the stream."""
+    stream.seek(start)
+    while True:
+        offset = stream.tell()
+        header = stream.read(4)
+        if len(header) < 4:
+            return
+        rtype, length = struct.unpack('<HH', header)
+        yield offset, rtype, stream.read(length)
+
+
+def open_workbook_stream(ole: OleFile):
+    """(stream, biff_version) for the workbook stream ('Workbook' or 'Book')."""
+    for name in ('Workbook', 'Book'):
+        if ole.exists(name):
+            stream = ole.open_stream(name)
+            header = stream.read(8)
+            if len(header) < 8 or struct.unpack_from('<H', header)[0] != BOF:
+                raise ValueError("Workbook stream does not start with BOF")
+            version = struct.unpack_from('<H', header, 4)[0]
+            return stream, (8 if version == 0x0600 else 5)
+    raise ValueError("No Workbook stream in OLE file")
+
+
+def _short_string(data: bytes, off: int, biff: int) -> str:
+    n = data[off]
+    if biff < 8:
+        return data[off + 1:off + 1 + n].decode('cp1252', 'replace')
+    if data[off + 1] & 0x01:
+        return data[off + 2:off + 2 + 2 * n].decode('utf-16-le', 'replace')
+    return data[off + 2:off + 2 + n].decode('latin1')
+
+
+def read_boundsheets(stream, biff: int) -> list[tuple]:
+    """
+    [(name, state, sheet_type, substream_offset), ...] from the globals
+    substream, in workbook order. sheet_type 0 is a worksheet, 2 a chart.
+    """
+    sheets = []
+    for _, rtype, data in iter_records(stream):
+        if rtype == BOUNDSHEET:
+            pos, state, kind = struct.unpack_from('<IBB', data)
+            sheets.append((_short_string(data, 6, biff),
+                           _SHEET_STATES.get(state & 0x03, 'visible'),
+                           kind, pos))
+        elif rtype == FILEPASS:
+            raise ValueError("Encrypted workbook")
+        elif rtype == EOF:
+            break
+    return sheets
+
+
+def read_dimensions(stream, offset: int, biff: int):
+    """(first_row, last_row_plus_1, first_col, last_col_plus_1) or None."""
+    for i, (_, rtype, data) in enumerate(iter_records(stream, offset)):
+        if rtype == DIMENSIONS:
+            if biff >= 8:
+                return struct.unpack_from('<IIHH', data)
+            return struct.unpack_from('<HHHH', data)
+        if rtype == EOF or i > 64:
+            return None
+    return None
+
+# -------------------------------
+# Cell records (BIFF8, with BIFF5 labels)
+# -------------------------------
+CONTINUE = 0x003C
+DATEMODE = 0x0022
+CODEPAGE = 0x0042
+FORMAT = 0x041E
+XF = 0x00E0
+SST = 0x00FC
+LABELSST = 0x00FD
+LABEL = 0x0204
+RSTRING = 0x00D6
+NUMBER = 0x0203
+RK = 0x027E
+MULRK = 0x00BD
+BOOLERR = 0x0205
+FORMULA = 0x0006
+STRING = 0x0207
+DBCELL = 0x00D7
+
+# Built-in number formats that display dates/times
+_BUILTIN_DATE_FORMATS = set(range(14, 23)) | set(range(27, 37)) | \
+    set(range(45, 48)) | set(range(50, 59))
+
+# Cell values that are neither numbers nor text
+BIFF_ERROR = object()
+
+
+class _Segments:
+    """
+    Reader over a record and its CONTINUE records. Strings split across a
+    CONTINUE boundary restart with a fresh option byte (compressed or
+    UTF-16), which read_chars() handles.
+    """
+
+    def __init__(self, segments):
+        self._segs = segments
+        self._i = 0
+        self._pos = 0
+
+    def _advance(self):
+        if self._pos >= len(self._segs[self._i]):
+            self._i += 1
+            self._pos = 0
+
+    def read(self, n: int) -> bytes:
+        out = []
+        while n > 0:
+            self._advance()
+            seg = self._segs[self._i]
+            take = min(n, len(seg) - self._pos)
+            out.append(seg[self._pos:self._pos + take])
+            self._pos += take
+            n -= take
+        return b''.join(out)
+
+    def read_chars(self, cch: int, high: bool) -> str:
+        out = []
+        while cch > 0:
+            if self._pos >= len(self._segs[self._i]):
+                self._i += 1
+                self._pos = 1
+                high = bool(self._segs[self._i][0] & 0x01)
+            seg = self._segs[self._i]
+            width = 2 if high else 1
+            take = min(cch, (len(seg) - self._pos) // width)
+            if not take and self._pos < len(seg):
+                # a UTF-16 string can't end a segment on an odd byte
+                raise ValueError("Malformed string in BIFF record")
+            raw = seg[self._pos:self._pos + take * width]
+            out.append(raw.decode('utf-16-le') if high else raw.decode('latin1'))
+            self._pos += take * width
+            cch -= take
+        return ''.join(out)
+
+    def unicode_string(self, len_bytes: int = 2) -> str:
+        """XLUnicodeRichExtendedString (rich runs / phonetic data skipped)."""
+        cch = int.from_bytes(self.read(len_bytes), 'little')
+        flags = self.read(1)[0]
+        runs = struct.unpack('<H', self.read(2))[0] if flags & 0x08 else 0
+        ext = struct.unpack('<I', self.read(4))[0] if flags & 0x04 else 0
+        text = self.read_chars(cch, bool(flags & 0x01))
+        if runs or ext:
+            self.read(4 * runs + ext)
+        return text
+
+
+def _parse_sst(segments) -> list[str]:
+    reader = _Segments(segments)
+    _, unique = struct.unpack('<II', reader.read(8))
+    strings = []
+    try:
+        for _ in range(unique):
+            strings.append(reader.unicode_string())
+    except (IndexError, ValueError):
+        pass  # fewer strings than announced, or garbled; keep what was read
+    return strings
+
+
+def _decode_rk(rk: int) -> float:
+    if rk & 0x02:
+        value = float(rk >> 2 if rk < 0x80000000 else (rk >> 2) - (1 << 30))
+    else:
+        value = struct.unpack('<d', struct.pack('<Q', (rk & 0xFFFFFFFC) << 32))[0]
+    return value / 100 if rk & 0x01 else value
+
+
+def _is_date_format(fmt: str) -> bool:
+    """Same test xlrd applies: date/time tokens and no digit placeholders."""
+    text, i, n = [], 0, len(fmt)
+    while i < n:
+        ch = fmt[i]
+        if ch == '"':  # quoted literal
+            j = fmt.find('"', i + 1)
+            i = n if j < 0 else j + 1
+        elif ch == '[':  # colour / condition / locale; [h] [mm] [ss] count
+            j = fmt.find(']', i + 1)
+            inner = fmt[i + 1:n if j < 0 else j].lower()
+            if inner and set(inner) <= set('hms'):
+                text.append(inner)
+            i = n if j < 0 else j + 1
+        elif ch in '\\_*':  # escaped char / padding / fill
+            i += 2
+        else:
+            text.append(ch)
+            i += 1
+    body = ''.join(text).split(';')[0].lower()
+    if body in ('general', ''):
+        return False
+    dates = sum(body.count(c) for c in 'ymdhs')
+    nums = sum(body.count(c) for c in '0#?')
+    return dates > nums
+
+
+def _codec(codepage: int) -> str:
+    if codepage in (1200, None):
+        return 'utf-16-le'
+    if codepage in (10000, 32768):
+        return 'mac_roman'
+    if codepage == 367:
+        return 'ascii'
+    try:
+        import codecs
+        return codecs.lookup(f'cp{codepage}').name
+    except LookupError:
+        return 'cp1252'
+
+
+class XlsBook:
+    """
+    Pure-Python reader for legacy .xls (BIFF8, and BIFF5 text) workbooks.
+    Opening reads only the OLE directory and the workbook globals (sheet
+    list, shared strings, number formats); sheet cells are decoded on
+    demand by iter_rows(), one 32-row block at a time.
+    Raises ValueError for files it can't read (encrypted, not BIFF5/8).
+    """
+
+    def __init__(self, path: str):
+        self._fh = open(path, 'rb')
+        try:
+            self._stream, self.biff = open_workbook_stream(OleFile(self._fh))
+            self._read_globals()
+        except Exception:
+            self._fh.close()
+            raise
+
+    def close(self):
+        self._fh.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def _read_globals(self):
+        self.datemode = 0
+        self.encoding = 'cp1252' if self.biff < 8 else 'utf-16-le'
+        self._sst = []
+        self._formats = {}  # format index -> is date
+        self._xf_date = []  # XF index -> is date
+        self._sheets = []
+        sst_segments = None
+        for _, rtype, data in iter_records(self._stream):
+            if sst_segments is not None:
+                if rtype == CONTINUE:
+                    sst_segments.append(data)
+                    continue
+                self._sst = _parse_sst(sst_segments)
+                sst_segments = None
+            if rtype == BOUNDSHEET:
+                pos, state, kind = struct.unpack_from('<IBB', data)
+                if self.biff >= 8:
+                    name = _short_string(data, 6, self.biff)
+                else:
+                    name = data[7:7 + data[6]].decode(self.encoding, 'replace')
+                self._sheets.append(
+                    (name, _SHEET_STATES.get(state & 0x03, 'visible'), kind, pos))
+            elif rtype == SST:
+                sst_segments = [data]
+            elif rtype == FORMAT:
+                idx = struct.unpack_from('<H', data)[0]
+                if self.biff >= 8:
+                    text = _Segments([data[2:]]).unicode_string()
+                else:
+                    text = data[3:3 + data[2]].decode(self.encoding, 'replace')
+                self._formats[idx] = _is_date_format(text)
+            elif rtype == XF:
+                self._xf_date.append(struct.unpack_from('<H', data, 2)[0])
+            elif rtype == DATEMODE:
+                self.datemode = struct.unpack_from('<H', data)[0]
+            elif rtype == CODEPAGE:
+                self.encoding = _codec(struct.unpack_from('<H', data)[0])
+            elif rtype == FILEPASS:
+                raise ValueError("Encrypted workbook")
+            elif rtype == EOF:
+                break
+        if sst_segments is not None:
+            self._sst = _parse_sst(sst_segments)
+        self._xf_date = [self._formats.get(f, f in _BUILTIN_DATE_FORMATS)
+                         for f in self._xf_date]
+
+    @property
+    def sheet_names(self) -> list[str]:
+        """Worksheet names (charts and macro sheets are left out, as in xlrd)."""
+        return [name for name, _, kind, _ in self._sheets if kind == 0]
+
+    def _sheet_offset(self, sheet) -> int:
+        worksheets = [s for s in self._sheets if s[2] == 0]
+        if isinstance(sheet, int):
+            return worksheets[sheet][3]
+        for name, _, _, pos in worksheets:
+            if name == sheet:
+                return pos
+        raise ValueError(f"Worksheet {sheet} does not exist.")
+
+    def _number(self, value: float, xf: int):
+        """NUMBER/RK value: ('date', serial) for date-formatted cells."""
+        if xf < len(self._xf_date) and self._xf_date[xf]:
+            return ('date', value)
+        return value
+
+    def _label(self, data: bytes, off: int) -> str:
+        return self._label_segments([data[off:]])
+
+    def _label_segments(self, segments: list) -> str:
+        """A string record's text, continued in CONTINUE records if long."""
+        if self.biff >= 8:
+            return _Segments(segments).unicode_string()
+        data = b''.join(segments)
+        n = struct.unpack_from('<H', data)[0]
+        return data[2:2 + n].decode(self.encoding, 'replace')
+
+    def iter_rows(self, sheet):
+        """
+        Yield (row index, {col: value}) for every row with cells, in row
+        order. Values are str, float, bool, ('date', serial), BIFF_ERROR or
+        None (formula with an empty result).
+        """
+        rows = {}
+        emitted = -1
+        pending_string = None  # (row, col) of a FORMULA awaiting its STRING
+        string_segments = None  # its STRING record and CONTINUEs so far
+        depth = 0
+
+        def flush():
+            nonlocal rows, emitted
+            for r in sorted(rows):
+                if r <= emitted:
+                    raise ValueError("Cells out of row order")
+                yield r, rows[r]
+                emitted = r
+            rows = {}
+
+        for _, rtype, data in iter_records(self._stream,
+                                           self._sheet_offset(sheet)):
+            if string_segments is not None:
+                if rtype == CONTINUE:
+                    string_segments.append(data)
+                    continue
+                r, c = pending_string
+                rows.setdefault(r, {})[c] = \
+                    self._label_segments(string_segments)
+                pending_string = string_segments = None
+            if rtype == BOF:
+                depth += 1  # embedded chart substreams nest BOF/EOF
+                continue
+            if rtype == EOF:
+                depth -= 1
+                if depth <= 0:
+                    break
+                continue
+            if depth != 1:
+                continue
+            if rtype == LABELSST:
+                r, c, _, isst = struct.unpack_from('<HHHI', data)
+                rows.setdefault(r, {})[c] = \
+                    self._sst[isst] if isst < len(self._sst) else ''
+            elif rtype == NUMBER:
+                r, c, xf, value = struct.unpack_from('<HHHd', data)
+                rows.setdefault(r, {})[c] = self._number(value, xf)
+            elif rtype == RK:
+                r, c, xf, rk = struct.unpack_from('<HHHI', data)
+                rows.setdefault(r, {})[c] = self._number(_decode_rk(rk), xf)
+            elif rtype == MULRK:
+                r, first = struct.unpack_from('<HH', data)
+                row = rows.setdefault(r, {})
+                for i in range((len(data) - 6) // 6):
+                    xf, rk = struct.unpack_from('<HI', data, 4 + 6 * i)
+                    row[first + i] = self._number(_decode_rk(rk), xf)
+            elif rtype in (LABEL, RSTRING):
+                r, c = struct.unpack_from('<HH', data)
+                rows.setdefault(r, {})[c] = self._label(data, 6)
+            elif rtype == BOOLERR:
+                r, c, _, value, is_error = struct.unpack_from('<HHHBB', data)
+                rows.setdefault(r, {})[c] = BIFF_ERROR if is_error else bool(value)
+            elif rtype == FORMULA:
+                r, c, xf = struct.unpack_from('<HHH', data)
+                result = data[6:14]
+                if result[6:8] != b'\xff\xff':
+                    value = self._number(struct.unpack('<d', result)[0], xf)
+                elif result[0] == 0:
+                    value = ''
+                    pending_string = (r, c)
+                elif result[0] == 1:
+                    value = bool(result[2])
+                elif result[0] == 2:
+                    value = BIFF_ERROR
+                else:
+                    value = None
+                rows.setdefault(r, {})[c] = value
+            elif rtype == STRING and pending_string is not None:
+                string_segments = [data]
+            elif rtype == DBCELL:
+                yield from flush()
+        yield from flush()
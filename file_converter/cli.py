@@ -0,0 +1,161 @@
+# file_converter/cli.py
+
+
+import os
+import sys
+import json
+import argparse
+
+from . import __version__
+from .batch import collect_inputs, convert_batch, summarize
+from .detect import OUTPUT_FORMATS
+from .options import ConvertOptions
+from .readers import DEFAULT_CHUNKSIZE
+from .sheet_rules import load_sheet_rules
+from .writers import PARQUET_COMPRESSIONS, split_format
+
+
+def _header_row(value: str):
+    if value.lower() == "auto":
+        return "auto"
+    if value.lower() == "none":
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"expected a row index, 'auto' or 'none', got {value!r}")
+
+
+def _output_format(value: str):
+    try:
+        fmt = split_format(value)[0]
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+    if fmt not in OUTPUT_FORMATS:
+        raise argparse.ArgumentTypeError(
+            f"expected one of {', '.join(OUTPUT_FORMATS)}, got {value!r}")
+    return value
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m file_converter",
+        description="Headless batch file converter.")
+    parser.add_argument("--version", action="version", version=__version__)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    conv = sub.add_parser(
+        "convert", help="Convert files and folders to another format.")
+    conv.add_argument("inputs", nargs="+", metavar="IN",
+                      help="Input files or folders (folders are walked).")
+    conv.add_argument("--to", dest="out_format", required=True,
+                      type=_output_format, metavar="FORMAT",
+                      help=f"Output format: {', '.join(OUTPUT_FORMATS)}. "
+                           "Text formats can be compressed by adding .gz, "
+                           ".bz2, .xz or .zst (e.g. csv.gz).")
+    conv.add_argument("--out", dest="out_dir", required=True,
+                      help="Output folder (created if missing).")
+    conv.add_argument("--jobs", "-j", type=int, default=None,
+                      help="Worker processes (default: CPU count).")
+    conv.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE,
+                      help="Rows per chunk when streaming delimited text "
+                           "(0 reads each file whole).")
+    conv.add_argument("--header-row", type=_header_row, default=0,
+                      metavar="{N,auto,none}",
+                      help="Header row of .xlsx sheets: a 0-based row index "
+                           "(default 0), 'auto' to detect it, or 'none'.")
+    conv.add_argument("--max-memory", type=int, default=None, metavar="MB",
+                      help="Cap on the estimated memory used when sheets "
+                           "of one workbook are parsed in parallel.")
+    conv.add_argument("--parquet-compression", choices=PARQUET_COMPRESSIONS,
+                      default=None,
+                      help="Compression codec for Parquet output "
+                           "(default: snappy).")
+    conv.add_argument("--row-group-size", type=int, default=None,
+                      metavar="ROWS",
+                      help="Rows per Parquet row group / Arrow record batch "
+                           "(default: 250000).")
+    conv.add_argument("--compression-level", type=int, default=None,
+                      metavar="N",
+                      help="Level for compressed output (gzip/bz2 1-9, xz "
+                           "0-9, zst 1-22).")
+    conv.add_argument("--xml-row-path", default=None, metavar="PATH",
+                      help="Row elements of XML input: 'record', "
+                           "'batch/record' (below the root), '/data/record' "
+                           "or '//record' (default: the root's children).")
+    conv.add_argument("--html-tables", default=None, metavar="SELECTOR",
+                      help="Tables of HTML input: an index (from 0), '#id', "
+                           "a regular expression matched in the table text, "
+                           "or 'all' for one output per table (default: the "
+                           "first table with rows).")
+    conv.add_argument("--incremental", action="store_true",
+                      help="Skip inputs whose outputs are up to date, using "
+                           "a manifest kept in the output folder.")
+    conv.add_argument("--dedupe", action="store_true",
+                      help="Convert inputs with identical content once and "
+                           "hard-link (or copy) the output for the others.")
+    conv.add_argument("--sheet-rules", metavar="FILE", default=None,
+                      help="Sheet selection rules saved from the GUI's sheet "
+                           "dialog (JSON); each selected sheet of a workbook "
+                           "is written to its own file.")
+    conv.add_argument("--quiet", "-q", action="store_true",
+                      help="Don't print per-file progress to stderr.")
+    return parser
+
+
+def _cmd_convert(args) -> int:
+    options = ConvertOptions(max_memory_mb=args.max_memory or None,
+                             parquet_compression=args.parquet_compression,
+                             row_group_size=args.row_group_size or None,
+                             compression_level=args.compression_level,
+                             xml_row_path=args.xml_row_path,
+                             html_tables=args.html_tables)
+    sheet_rules = None
+    if args.sheet_rules:
+        try:
+            sheet_rules = load_sheet_rules(args.sheet_rules)
+        except (OSError, ValueError) as e:
+            print(f"error: {e}", file=sys.stderr)
+            return 2
+    inputs = collect_inputs(args.inputs)
+    os.makedirs(args.out_dir, exist_ok=True)
+    total = len(inputs)
+    done = 0
+
+    def on_result(r):
+        nonlocal done
+        done += 1
+        if not args.quiet:
+            msg = r["error"] or r["output"] or r["status"]
+            if r.get("encoding") == "latin1":
+                msg += " (read as latin1)"
+            print(f"[{done}/{total}] {r['status']}: {r['input']} -> {msg}",
+                  file=sys.stderr)
+
+    results = convert_batch(inputs, args.out_dir, args.out_format,
+                            jobs=args.jobs, on_result=on_result,
+                            chunksize=args.chunksize or None,
+                            header=args.header_row,
+                            incremental=args.incremental,
+                            dedupe=args.dedupe,
+                            sheet_rules=sheet_rules,
+                            options=options)
+    summary = summarize(results)
+    if args.dedupe and not args.quiet:
+        for d in summary["duplicates"]:
+            print(f"duplicate: {d['input']} (same content as "
+                  f"{d['duplicate_of']})", file=sys.stderr)
+    if args.incremental and not args.quiet:
+        print(f"{summary['skipped']} skipped, {summary['converted']} converted",
+              file=sys.stderr)
+    json.dump(summary, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    return 1 if summary["failed"] else 0
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.command == "convert":
+        return _cmd_convert(args)
+    return 2
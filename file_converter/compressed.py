@@ -0,0 +1,143 @@
+# file_converter/compressed.py
+
+
+import io
+import os
+import bz2
+import gzip
+import lzma
+import zipfile
+
+try:  # optional: Zstandard (.zst)
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# -------------------------------
+# Compressed streams (gzip, bz2, xz, zstd)
+# -------------------------------
+COMPRESSION_SIGNATURES = (
+    (b'\x1f\x8b', 'gzip'),
+    (b'BZh', 'bz2'),
+    (b'\xfd7zXZ\x00', 'xz'),
+    (b'\x28\xb5\x2f\xfd', 'zstd'),
+)
+
+# File extension <-> compression; also the suffixes of compressed output
+# formats ('csv.gz', 'jsonl.zst', ...)
+COMPRESSION_EXTS = {'.gz': 'gzip', '.bz2': 'bz2', '.xz': 'xz', '.zst': 'zstd'}
+COMPRESSION_SUFFIXES = {c: ext[1:] for ext, c in COMPRESSION_EXTS.items()}
+
+# Level used when none is given, on each codec's own scale
+# (gzip/bz2 1-9, xz 0-9, zstd 1-22)
+DEFAULT_LEVELS = {'gzip': 6, 'bz2': 9, 'xz': 6, 'zstd': 3}
+
+
+def compression_from_bytes(head: bytes):
+    """'gzip', 'bz2', 'xz' or 'zstd' from a file's first bytes, else None."""
+    for sig, compression in COMPRESSION_SIGNATURES:
+        if head.startswith(sig):
+            return compression
+    return None
+
+
+def strip_compression_ext(name: str) -> str:
+    """'statement.tsv.gz' -> 'statement.tsv'; other names unchanged."""
+    root, ext = os.path.splitext(name)
+    return root if ext.lower() in COMPRESSION_EXTS else name
+
+
+def _require_zstandard():
+    if zstandard is None:
+        raise ImportError(
+            "Zstandard (.zst) files need the 'zstandard' package "
+            "(pip install zstandard)")
+
+
+def open_decompressed(path: str, compression: str):
+    """Binary read stream of the decompressed content of `path`."""
+    if compression == 'gzip':
+        return gzip.open(path, 'rb')
+    if compression == 'bz2':
+        return bz2.open(path, 'rb')
+    if compression == 'xz':
+        return lzma.open(path, 'rb')
+    if compression == 'zstd':
+        _require_zstandard()
+        return zstandard.ZstdDecompressor().stream_reader(
+            open(path, 'rb'), closefd=True)
+    raise ValueError(f"Unknown compression {compression!r}")
+
+
+def open_compressed_output(path: str, compression: str, level=None):
+    """Binary write stream compressing into `path` (see DEFAULT_LEVELS)."""
+    if level is None:
+        level = DEFAULT_LEVELS.get(compression)
+    if compression == 'gzip':
+        return gzip.open(path, 'wb', compresslevel=level)
+    if compression == 'bz2':
+        return bz2.open(path, 'wb', compresslevel=level)
+    if compression == 'xz':
+        return lzma.open(path, 'wb', preset=level)
+    if compression == 'zstd':
+        _require_zstandard()
+        cctx = zstandard.ZstdCompressor(level=level)
+        return cctx.stream_writer(open(path, 'wb'), closefd=True)
+    raise ValueError(f"Unknown compression {compression!r}")
+
+
+def pandas_compression(compression: str, level=None):
+    """The `compression` argument for pandas' to_csv / to_json / to_xml."""
+    if compression is None:
+        return None
+    if level is None:
+        level = DEFAULT_LEVELS[compression]
+    key = {'xz': 'preset', 'zstd': 'level'}.get(compression, 'compresslevel')
+    return {'method': compression, key: level}
+
+# -------------------------------
+# ZIP bundles
+# -------------------------------
+
+
+def is_workbook_zip(zf: zipfile.ZipFile) -> bool:
+    names = set(zf.namelist())
+    return 'xl/workbook.xml' in names or 'xl/workbook.bin' in names
+
+
+def zip_members(path: str) -> list[str]:
+    """File members of a ZIP archive, in archive order, minus metadata."""
+    with zipfile.ZipFile(path) as zf:
+        return [info.filename for info in zf.infolist()
+                if not info.is_dir()
+                and not info.filename.startswith('__MACOSX/')
+                and not os.path.basename(info.filename).startswith('.')]
+
+
+def open_zip_member(path: str, member: str):
+    """
+    Binary read stream of one member, decompressed as it is read. The
+    archive stays open until the stream is closed.
+    """
+    zf = zipfile.ZipFile(path)
+    try:
+        return zf.open(member)
+    finally:
+        zf.close()  # deferred by zipfile until the member stream closes
+
+
+def open_content(path: str, compression=None, member=None):
+    """
+    Binary read stream of what a reader should parse: a ZIP `member`, the
+    decompressed content of a `compression`-compressed file, or the file.
+    """
+    if member is not None:
+        return open_zip_member(path, member)
+    if compression is not None:
+        return open_decompressed(path, compression)
+    return open(path, 'rb')
+
+
+def text_output(fh, newline=''):
+    """UTF-8 text wrapper around a binary output stream (closing both)."""
+    return io.TextIOWrapper(fh, encoding='utf-8', newline=newline)
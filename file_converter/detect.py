@@ -0,0 +1,385 @@
+# file_converter/detect.py
+
+
+import os
+import csv
+import codecs
+import zipfile
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from .compressed import (
+    compression_from_bytes, is_workbook_zip, open_content,
+    strip_compression_ext
+)
+
+# -------------------------------
+# Config / constants
+# -------------------------------
+SUPPORTED_FORMATS = [
+    ('Excel Workbook', '*.xlsx'),
+    ('Excel 97-2003 Workbook', '*.xls'),
+    ('CSV (Comma delimited)', '*.csv'),
+    ('Text (Tab delimited), .tsv', '*.tsv'),
+    ('Text (Tab delimited), .tab', '*.tab'),
+    ('Text (Plain text)', '*.txt'),
+    ('HTML (Web Page)', '*.htm;*.html'),
+    ('JSON (JavaScript Object Notation)', '*.json'),
+    ('JSON Lines', '*.jsonl;*.ndjson'),
+    ('XML (eXtensible Markup Language)', '*.xml'),
+    ('Apache Parquet', '*.parquet'),
+    ('Feather / Arrow IPC', '*.feather;*.arrow;*.ipc'),
+    ('Compressed (gzip, bzip2, xz, Zstandard)', '*.gz;*.bz2;*.xz;*.zst'),
+    ('ZIP archive', '*.zip')
+]
+
+OUTPUT_FORMATS = ['xlsx', 'xls', 'csv', 'tsv', 'tab',
+                  'txt', 'json', 'jsonl', 'xml',
+                  'parquet', 'feather', 'arrow']
+
+# -------------------------------
+# Delimiter helpers
+# -------------------------------
+
+
+def guess_csv_delimiter(path, encodings=('utf-8', 'latin1')):
+    sample = None
+    for enc in encodings:
+        try:
+            with open(path, 'r', encoding=enc) as f:
+                sample = f.read(4096)
+            break
+        except Exception:
+            continue
+    return _sniff_delimiter(sample)[0]
+
+
+def _sniff_delimiter(sample: str) -> tuple:
+    """(delimiter or None, True if csv.Sniffer was sure) for a text sample."""
+    if not sample:
+        return None, False
+    try:
+        dialect = csv.Sniffer().sniff(sample)
+        return dialect.delimiter, True
+    except Exception:
+        if ',' in sample and '\t' in sample:
+            return (',' if sample.count(',') > sample.count('\t') else '\t'), False
+        elif '\t' in sample:
+            return '\t', False
+        elif ',' in sample:
+            return ',', False
+        else:
+            return None, False
+
+
+def _looks_tab_delimited(path: str, sample_bytes: int = 4096) -> bool:
+    """
+    Peek into the file and decide if it's tab-delimited:
+    - True if we see tabs and tabs >= commas.
+    """
+    try:
+        with open(path, "rb") as f:
+            return _sample_looks_tabbed(f.read(sample_bytes))
+    except Exception:
+        return False
+
+
+def _sample_looks_tabbed(sample: bytes) -> bool:
+    text = sample.decode("utf-8", errors="ignore")
+    return text.count("\t") > 0 and text.count("\t") >= text.count(",")
+
+
+# -------------------------------
+# Encoding detection
+# -------------------------------
+ENCODING_SAMPLE_BYTES = 64 * 1024
+
+
+def _decodes_as_utf8(data: bytes, final: bool) -> bool:
+    try:
+        codecs.getincrementaldecoder("utf-8")().decode(data, final=final)
+        return True
+    except UnicodeDecodeError:
+        return False
+
+
+def _encoding_from_samples(head: bytes, tail: bytes, size: int) -> tuple:
+    """
+    (encoding, definitive) from a head sample and, for files larger than
+    the head, a tail sample. definitive is True when nothing was left
+    unchecked (BOM, a non-UTF-8 sample, or the head covering the file).
+    """
+    if head.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig", True
+    if head.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return "utf-16", True
+    if size <= len(head):
+        return ("utf-8" if _decodes_as_utf8(head, final=True) else "latin1"), True
+    if not _decodes_as_utf8(head, final=False):
+        return "latin1", True
+    # Skip a partial character cut off at the start of the tail sample
+    skip = 0
+    while skip < 3 and skip < len(tail) and tail[skip] & 0xC0 == 0x80:
+        skip += 1
+    if not _decodes_as_utf8(tail[skip:], final=True):
+        return "latin1", True
+    return "utf-8", False
+
+
+def _validate_utf8(f) -> bool:
+    """Stream an open binary file through an incremental UTF-8 decoder."""
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    try:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            decoder.decode(block)
+        decoder.decode(b"", final=True)
+    except UnicodeDecodeError:
+        return False
+    return True
+
+
+def _read_head_tail(f, sample_bytes: int) -> tuple:
+    head = f.read(sample_bytes)
+    size = os.fstat(f.fileno()).st_size
+    tail = b""
+    if size > len(head):
+        f.seek(max(len(head), size - sample_bytes))
+        tail = f.read()
+    return head, tail, size
+
+
+def _read_stream_head(f, sample_bytes: int) -> tuple:
+    """
+    (head, b"", size) for a stream that can't seek to its tail; size is
+    only known to be larger than the head when there is more to read.
+    """
+    data = f.read(sample_bytes + 1)
+    return data[:sample_bytes], b"", len(data)
+
+
+def detect_encoding(path: str, sample_bytes: int = ENCODING_SAMPLE_BYTES,
+                    validate: bool = False, compression=None,
+                    member=None) -> str:
+    """
+    Pick a text encoding from the raw bytes, without parsing:
+    - BOM: 'utf-8-sig' / 'utf-16'
+    - 'utf-8' if the head and tail samples decode as UTF-8, else 'latin1'
+    With validate=True the whole file is streamed through an incremental
+    UTF-8 decoder, so the answer is definitive. Without it a bad byte in the
+    unsampled middle only shows up as UnicodeDecodeError at parse time.
+    For a compressed file or a ZIP `member` the decompressed content is
+    sampled (its head only).
+    """
+    if compression is not None or member is not None:
+        with open_content(path, compression, member) as f:
+            enc, definitive = _encoding_from_samples(
+                *_read_stream_head(f, sample_bytes))
+        if validate and not definitive:
+            with open_content(path, compression, member) as f:
+                if not _validate_utf8(f):
+                    return "latin1"
+        return enc
+    with open(path, "rb") as f:
+        head, tail, size = _read_head_tail(f, sample_bytes)
+        enc, definitive = _encoding_from_samples(head, tail, size)
+        if validate and not definitive:
+            f.seek(0)
+            if not _validate_utf8(f):
+                return "latin1"
+        return enc
+
+
+# -------------------------------
+# File type detection
+# -------------------------------
+OLE_SIGNATURE = b'\xD0\xCF\x11\xE0\xA1\xB1\x1A\xE1'
+ZIP_SIGNATURE = b'\x50\x4B\x03\x04'
+PARQUET_SIGNATURE = b'PAR1'
+ARROW_SIGNATURE = b'ARROW1'   # Arrow IPC file, i.e. Feather v2
+FEATHER_V1_SIGNATURE = b'FEA1'
+
+
+def _is_ole_binary(path: str) -> bool:
+    try:
+        with open(path, 'rb') as f:
+            sig = f.read(8)
+            return sig.startswith(OLE_SIGNATURE)
+    except Exception:
+        return False
+
+
+def _is_zip_xlsx(path: str) -> bool:
+    try:
+        with open(path, 'rb') as f:
+            sig = f.read(4)
+            return sig.startswith(ZIP_SIGNATURE)
+    except Exception:
+        return False
+
+
+# -------------------------------
+# Single-open file probe (cached)
+# -------------------------------
+PROBE_CACHE_SIZE = 4096
+
+_EXCEL_EXTS = ('.xlsx', '.xlsm', '.xlsb')
+_TAB_EXTS = ('.tab', '.tsv')
+_ARROW_EXTS = ('.feather', '.arrow', '.ipc')
+
+_probe_cache = OrderedDict()
+_probe_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class FileProbe:
+    """
+    Everything read_file needs to pick a reader, from one read of the
+    file's head (and tail). format mirrors read_file's dispatch:
+    'xls', 'xlsx', 'parquet', 'arrow', 'html', 'json', 'jsonl', 'xml',
+    'tab', 'delimited', or 'zip' for an archive of such files.
+    For a gzip/bz2/xz/zstd file, `compression` names the codec and the
+    rest describes the decompressed content; `member` is set when the
+    probe describes one file inside a ZIP archive.
+    encoding/delimiter are None for binary formats; encoding_checked is
+    True when the encoding did not rest on head/tail sampling alone.
+    confidence (0-1) is how strongly the bytes back up `format`.
+    """
+    path: str
+    size: int
+    mtime_ns: int
+    format: str
+    encoding: str = None
+    encoding_checked: bool = False
+    delimiter: str = None
+    confidence: float = 0.0
+    compression: str = None
+    member: str = None
+
+    @property
+    def name(self) -> str:
+        """Name of the content: the member, or the path minus .gz etc."""
+        return self.member or strip_compression_ext(self.path)
+
+    @property
+    def is_excel(self) -> bool:
+        """A workbook that can be opened in place (sheets, metadata)."""
+        return (self.format in ('xls', 'xlsx')
+                and self.compression is None and self.member is None)
+
+
+def _is_zip_bundle(path: str) -> bool:
+    """True for a readable ZIP archive that is not an Excel workbook."""
+    try:
+        with zipfile.ZipFile(path) as zf:
+            return not is_workbook_zip(zf)
+    except (OSError, zipfile.BadZipFile):
+        return False
+
+
+def _probe(path: str, st, sample_bytes: int, member=None) -> FileProbe:
+    base = dict(path=path, size=st.st_size, mtime_ns=st.st_mtime_ns)
+    if member is not None:
+        with open_content(path, member=member) as f:
+            head, tail, size = _read_stream_head(f, sample_bytes)
+        return _probe_content(head, tail, size, member, base, member=member)
+    with open(path, 'rb') as f:
+        head, tail, size = _read_head_tail(f, sample_bytes)
+    compression = compression_from_bytes(head)
+    if compression is not None:
+        try:
+            with open_content(path, compression) as f:
+                head, tail, size = _read_stream_head(f, sample_bytes)
+        except ImportError:
+            head, tail, size = b"", b"", 0  # reader reports the missing codec
+        except Exception:
+            compression = None  # a signature by coincidence
+        else:
+            return _probe_content(head, tail, size, strip_compression_ext(path),
+                                  base, compression=compression)
+    if head.startswith(ZIP_SIGNATURE) and \
+            os.path.splitext(path)[1].lower() not in _EXCEL_EXTS and \
+            _is_zip_bundle(path):
+        return FileProbe(format='zip', confidence=1.0, **base)
+    return _probe_content(head, tail, size, path, base)
+
+
+def _probe_content(head: bytes, tail: bytes, size: int, name: str, base: dict,
+                   **extra) -> FileProbe:
+    """Classify content from its samples and its (inner) file name."""
+    ext = os.path.splitext(name)[1].lower()
+    base = dict(base, **extra)
+
+    if head.startswith(OLE_SIGNATURE):
+        return FileProbe(format='xls', confidence=1.0, **base)
+    if ext == '.xls':
+        return FileProbe(format='xls', confidence=0.5, **base)
+    if head.startswith(ZIP_SIGNATURE):
+        return FileProbe(format='xlsx', confidence=1.0, **base)
+    if ext in _EXCEL_EXTS:
+        return FileProbe(format='xlsx', confidence=0.5, **base)
+    if head.startswith(PARQUET_SIGNATURE):
+        return FileProbe(format='parquet', confidence=1.0, **base)
+    if head.startswith((ARROW_SIGNATURE, FEATHER_V1_SIGNATURE)):
+        return FileProbe(format='arrow', confidence=1.0, **base)
+    if ext == '.parquet':
+        return FileProbe(format='parquet', confidence=0.5, **base)
+    if ext in _ARROW_EXTS:
+        # Also the Arrow IPC *stream* format, which has no magic bytes
+        return FileProbe(format='arrow', confidence=0.5, **base)
+
+    enc, checked = _encoding_from_samples(head, tail, size)
+    text = head.decode(enc, errors='ignore')
+    lead = text.lstrip('\ufeff \t\r\n')
+    base.update(encoding=enc, encoding_checked=checked)
+
+    if ext in ('.htm', '.html'):
+        return FileProbe(format='html',
+                         confidence=0.9 if lead.startswith('<') else 0.5, **base)
+    if ext == '.json':
+        return FileProbe(format='json',
+                         confidence=0.9 if lead[:1] in ('{', '[') else 0.5, **base)
+    if ext in ('.jsonl', '.ndjson'):
+        return FileProbe(format='jsonl',
+                         confidence=0.9 if lead[:1] in ('{', '[') else 0.5, **base)
+    if ext == '.xml':
+        return FileProbe(format='xml',
+                         confidence=0.9 if lead.startswith('<') else 0.5, **base)
+
+    # Same 4096-character, newline-normalised sample guess_csv_delimiter reads
+    sample = text.replace('\r\n', '\n').replace('\r', '\n')[:4096]
+    delimiter, sniffed = _sniff_delimiter(sample)
+    if ext in _TAB_EXTS or (ext == '.txt' and _sample_looks_tabbed(head[:4096])):
+        return FileProbe(format='tab', delimiter='\t',
+                         confidence=0.9 if delimiter == '\t' else 0.7, **base)
+    confidence = 0.9 if sniffed else (0.6 if delimiter else 0.3)
+    return FileProbe(format='delimited', delimiter=delimiter,
+                     confidence=confidence, **base)
+
+
+def probe_file(path: str, sample_bytes: int = ENCODING_SAMPLE_BYTES,
+               member=None) -> FileProbe:
+    """
+    Probe `path` (or one `member` of a ZIP archive) with a single open.
+    Results are cached per process keyed by (path, size, mtime, member), so
+    listing and converting the same unchanged file only reads its header
+    once; a modified file is probed again.
+    """
+    st = os.stat(path)
+    key = (os.path.abspath(path), st.st_size, st.st_mtime_ns, member)
+    with _probe_lock:
+        probe = _probe_cache.get(key)
+        if probe is not None:
+            _probe_cache.move_to_end(key)
+            return probe
+    probe = _probe(path, st, sample_bytes, member)
+    with _probe_lock:
+        _probe_cache[key] = probe
+        while len(_probe_cache) > PROBE_CACHE_SIZE:
+            _probe_cache.popitem(last=False)
+    return probe
+
+
+def clear_probe_cache():
+    with _probe_lock:
+        _probe_cache.clear()
@@ -0,0 +1,22 @@
+# file_converter/errors.py
+
+
+class ConversionError(Exception):
+    """
+    Raised when a file cannot be read or written.
+    `title` is a short caption (the GUI uses it as the dialog title);
+    `warning` marks failures the GUI shows as warnings rather than errors.
+    """
+
+    def __init__(self, title: str, message: str, warning: bool = False):
+        super().__init__(message)
+        self.title = title
+        self.warning = warning
+
+    def __reduce__(self):
+        # Keep title/warning when raised in a worker process
+        return type(self), (self.title, str(self), self.warning)
+
+
+class ConversionCancelled(Exception):
+    """Raised between chunks when the caller's cancel event is set."""
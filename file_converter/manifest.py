@@ -0,0 +1,134 @@
+# file_converter/manifest.py
+
+
+import os
+import json
+import hashlib
+import tempfile
+
+from . import __version__
+
+# -------------------------------
+# Incremental conversion manifest
+# -------------------------------
+MANIFEST_NAME = ".file_converter_manifest.json"
+
+# Bump whenever a reader or writer change alters the files produced for the
+# same input and settings, so outputs recorded by an older build are redone
+OUTPUT_VERSION = 2
+
+
+def file_digest(path: str) -> str:
+    """SHA-256 of a file's content, read in 1 MB blocks."""
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+class OutputManifest:
+    """
+    Record of what an output folder was built from, kept in MANIFEST_NAME
+    there: for each input (absolute path) its size, mtime, content hash, the
+    output format, selected sheets, options, OUTPUT_VERSION, the base name
+    of its outputs (see batch.output_bases) and the outputs written.
+    is_current() is True when a rerun would produce the same files under
+    the same names; an input whose mtime changed but whose content did not
+    is still current (it is re-hashed, never re-converted). A missing or
+    unreadable manifest is treated as empty.
+    """
+
+    def __init__(self, out_dir: str):
+        self.path = os.path.join(out_dir, MANIFEST_NAME)
+        self.entries = {}
+        self._dirty = False
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+            if isinstance(data.get("files"), dict):
+                self.entries = data["files"]
+        except (OSError, ValueError, AttributeError):
+            pass
+
+    @staticmethod
+    def _settings(out_format, sheets, options) -> dict:
+        return {"format": out_format,
+                "sheets": list(sheets) if sheets is not None else None,
+                "options": options or {},
+                "output_version": OUTPUT_VERSION}
+
+    def bases(self) -> dict:
+        """{input: output base name} of the recorded inputs whose outputs
+        are all still there: names a new input must not take."""
+        out_dir = os.path.dirname(self.path)
+        return {path: entry["base"] for path, entry in self.entries.items()
+                if entry.get("base") and all(
+                    os.path.exists(os.path.join(out_dir, name))
+                    for name in entry.get("outputs", []))}
+
+    def is_current(self, in_path: str, out_format: str, sheets=None,
+                   options=None, base=None) -> bool:
+        """`base`, if given, is the output base name this run assigns the
+        input; outputs recorded under another name are not current."""
+        entry = self.entries.get(os.path.abspath(in_path))
+        if entry is None:
+            return False
+        if base is not None and entry.get("base") != base:
+            return False
+        settings = self._settings(out_format, sheets, options)
+        # Round-trip through JSON so tuples compare equal to stored lists
+        if any(entry.get(k) != v for k, v in
+               json.loads(json.dumps(settings)).items()):
+            return False
+        out_dir = os.path.dirname(self.path)
+        if not all(os.path.exists(os.path.join(out_dir, name))
+                   for name in entry.get("outputs", [])):
+            return False
+        try:
+            st = os.stat(in_path)
+        except OSError:
+            return False
+        if st.st_size != entry.get("size"):
+            return False
+        if st.st_mtime_ns == entry.get("mtime_ns"):
+            return True
+        if file_digest(in_path) != entry.get("sha256"):
+            return False
+        entry["mtime_ns"] = st.st_mtime_ns  # touched, not changed
+        self._dirty = True
+        return True
+
+    def record(self, in_path: str, outputs, out_format: str, sheets=None,
+               options=None, base=None):
+        """Remember that `outputs` (paths that exist), named after `base`,
+        came from `in_path`."""
+        st = os.stat(in_path)
+        out_dir = os.path.dirname(self.path)
+        entry = {"size": st.st_size, "mtime_ns": st.st_mtime_ns,
+                 "sha256": file_digest(in_path), "base": base,
+                 "outputs": [os.path.relpath(p, out_dir) for p in outputs
+                             if p and os.path.exists(p)]}
+        entry.update(self._settings(out_format, sheets, options))
+        self.entries[os.path.abspath(in_path)] = entry
+        self._dirty = True
+
+    def forget(self, in_path: str):
+        if self.entries.pop(os.path.abspath(in_path), None) is not None:
+            self._dirty = True
+
+    def save(self):
+        """Write the manifest (atomically) if anything changed."""
+        if not self._dirty:
+            return
+        out_dir = os.path.dirname(self.path)
+        os.makedirs(out_dir, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(prefix=MANIFEST_NAME, dir=out_dir)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({"version": __version__, "files": self.entries}, f)
+            os.replace(tmp, self.path)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        self._dirty = False
@@ -0,0 +1,55 @@
+# file_converter/options.py
+
+
+import os
+from dataclasses import dataclass
+
+# -------------------------------
+# Conversion settings
+# -------------------------------
+
+# Environment variable that gives each setting its default, and its type
+OPTION_ENV = {
+    "max_memory_mb": ("FILE_CONVERTER_MAX_MEMORY_MB", int),
+    "parquet_compression": ("FILE_CONVERTER_PARQUET_COMPRESSION", str),
+    "row_group_size": ("FILE_CONVERTER_ROW_GROUP_SIZE", int),
+    "compression_level": ("FILE_CONVERTER_COMPRESSION_LEVEL", int),
+    "xml_row_path": ("FILE_CONVERTER_XML_ROW_PATH", str),
+    "html_tables": ("FILE_CONVERTER_HTML_TABLES", str),
+}
+
+
+@dataclass(frozen=True)
+class ConvertOptions:
+    """
+    Settings of one conversion beyond its input and output format, passed
+    down the convert call chain (and pickled to worker processes) rather
+    than set process-wide. A field left None takes its default from the
+    environment variable in OPTION_ENV, if set, else the built-in default:
+    max_memory_mb caps the memory of parallel sheet parsing (no cap);
+    parquet_compression and row_group_size are Parquet / Arrow writer
+    settings (snappy, 250000 rows); compression_level is for .gz / .bz2 /
+    .xz / .zst output (the codec's default); xml_row_path picks the row
+    elements of XML input (see iter_xml_chunks; the root's children);
+    html_tables selects tables of HTML input (see iter_html_tables; the
+    first table with rows).
+    """
+    max_memory_mb: int = None
+    parquet_compression: str = None
+    row_group_size: int = None
+    compression_level: int = None
+    xml_row_path: str = None
+    html_tables: str = None
+
+
+def option(options, name: str):
+    """`options`.`name` (options may be None) if set, else the value of its
+    OPTION_ENV variable, else None."""
+    value = getattr(options, name, None)
+    if value is not None:
+        return value
+    env, kind = OPTION_ENV[name]
+    try:
+        return kind(os.environ[env]) if os.environ.get(env) else None
+    except ValueError:
+        return None
@@ -0,0 +1,141 @@
+# file_converter/parallel.py
+
+
+import os
+import zipfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+# -------------------------------
+# Parallel sheet parsing
+# -------------------------------
+
+# Below this much sheet data a process pool costs more than it saves
+PARALLEL_MIN_BYTES = 4 * 1024 * 1024
+
+# Rough per-process footprint: interpreter + pandas, and how much larger a
+# parsed sheet is than its uncompressed XML / BIFF bytes
+WORKER_BASE_MB = 150
+PARSE_MEMORY_FACTOR = 10
+
+
+def _env_int(name: str):
+    try:
+        return int(os.environ[name]) or None
+    except (KeyError, ValueError):
+        return None
+
+
+def _cpu_count() -> int:
+    """CPUs this process may run on (affinity-aware where supported)."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def _sheet_bytes(path: str) -> list[int]:
+    """Uncompressed size of each worksheet part (.xlsx) or [file size]."""
+    try:
+        with zipfile.ZipFile(path) as zf:
+            sizes = [i.file_size for i in zf.infolist()
+                     if i.filename.startswith('xl/worksheets/')
+                     and not i.filename.endswith('.rels')]
+            if sizes:
+                return sizes
+    except (OSError, zipfile.BadZipFile):
+        pass
+    return [os.path.getsize(path)]
+
+
+def sheet_workers(path: str, n_sheets: int, jobs=None, max_memory_mb=None,
+                  per_worker_mb=None) -> int:
+    """
+    How many processes to parse `n_sheets` sheets of `path` with.
+    jobs defaults to FILE_CONVERTER_SHEET_JOBS, else one per CPU;
+    max_memory_mb (default FILE_CONVERTER_MAX_MEMORY_MB) caps the total
+    estimated footprint (per_worker_mb, by default estimated from the
+    largest sheet), so big workbooks get fewer workers. Returns 1
+    (parse in-process) for small workbooks, single sheets, or when already
+    running inside a worker process (e.g. a convert_batch job).
+    """
+    if n_sheets < 2 or multiprocessing.parent_process() is not None:
+        return 1
+    jobs = jobs or _env_int("FILE_CONVERTER_SHEET_JOBS") or _cpu_count()
+    sizes = _sheet_bytes(path)
+    if sum(sizes) < PARALLEL_MIN_BYTES:
+        return 1
+    if per_worker_mb is None:
+        per_worker_mb = WORKER_BASE_MB + \
+            PARSE_MEMORY_FACTOR * max(sizes) / (1024 * 1024)
+    max_memory_mb = max_memory_mb or _env_int("FILE_CONVERTER_MAX_MEMORY_MB")
+    if max_memory_mb:
+        jobs = min(jobs, int(max_memory_mb // per_worker_mb))
+    return max(1, min(jobs, n_sheets))
+
+
+# Per worker process: the workbook it last opened, reused across sheets
+_worker_book = {}
+
+
+def _parse_sheet_job(path: str, engine, sheet: str) -> tuple:
+    """(sheet, DataFrame or None, error message or None), in a worker."""
+    key = (path, engine)
+    xls = _worker_book.get(key)
+    try:
+        if xls is None:
+            for old in _worker_book.values():
+                old.close()
+            _worker_book.clear()
+            xls = pd.ExcelFile(path, engine=engine)
+            _worker_book[key] = xls
+        return sheet, xls.parse(sheet), None
+    except Exception as e:
+        return sheet, None, f"{type(e).__name__}: {e}"
+
+
+def parse_sheets(path: str, sheet_names, engine=None, errors: str = 'raise',
+                 jobs=None, max_memory_mb=None, xls=None) -> list[tuple]:
+    """
+    Parse `sheet_names` of one workbook and return [(sheet, df), ...] in
+    the order given. Large workbooks are parsed across a process pool
+    (see sheet_workers), each worker opening the workbook once. With
+    errors='skip' sheets that fail to parse are left out; with 'raise' the
+    first failure (in sheet order) raises ValueError. `xls` is an already
+    open pd.ExcelFile to use when parsing in-process.
+    """
+    sheet_names = list(sheet_names)
+    workers = sheet_workers(path, len(sheet_names), jobs, max_memory_mb)
+    results = []
+    if workers == 1:
+        xls = xls if xls is not None else pd.ExcelFile(path, engine=engine)
+        for sheet in sheet_names:
+            try:
+                results.append((sheet, xls.parse(sheet)))
+            except Exception:
+                if errors == 'raise':
+                    raise
+        return results
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # map() keeps submission order, so sheets come back in order
+        outcomes = pool.map(_parse_sheet_job, [path] * len(sheet_names),
+                            [engine] * len(sheet_names), sheet_names)
+        for sheet, df, error in outcomes:
+            if error is None:
+                results.append((sheet, df))
+            elif errors == 'raise':
+                raise ValueError(f"Sheet {sheet!r}: {error}")
+    return results
+
+
+def concat_sheets(parsed) -> pd.DataFrame:
+    """Non-empty sheets tagged with SheetName and stacked (empty if none)."""
+    dfs = []
+    for sheet, df in parsed:
+        if not df.empty:
+            df['SheetName'] = sheet
+            dfs.append(df)
+    return pd.concat(dfs, ignore_index=True) if dfs else pd.DataFrame()
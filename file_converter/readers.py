@@ -0,0 +1,1560 @@
+# file_converter/readers.py
+
+
+import io
+import os
+import re
+import csv
+import json
+import pickle
+import shutil
+import struct
+import datetime
+import tempfile
+import warnings
+import xml.etree.ElementTree as ET
+from contextlib import contextmanager
+from itertools import chain, islice
+
+import numpy as np
+import pandas as pd
+from pandas.io.parsers import TextParser
+
+try:  # optional: Arrow string kernels for whole-column trim/normalise
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:
+    pa = pc = None
+
+try:  # optional: one lxml parse per HTML document, tables picked from it
+    import lxml.html
+except ImportError:
+    lxml = None
+
+from .biff import BIFF_ERROR, XlsBook
+from .compressed import open_content
+from .detect import FEATHER_V1_SIGNATURE, detect_encoding, probe_file
+from .errors import ConversionError
+from .options import option
+from .parallel import concat_sheets, parse_sheets
+from .scan import bundle_members
+from .xls import _read_xls_with_xlrd, _read_xls_via_excel_com
+
+# -------------------------------
+# .TAB / .TSV (and tabbed .TXT) strict reader
+# -------------------------------
+DEFAULT_CHUNKSIZE = 100_000
+
+STREAMABLE_EXTS = ('.csv', '.tsv', '.tab', '.txt')
+
+_TAB_READ_KW = dict(
+    sep="\t",
+    dtype=str,         # preserve leading zeros / signs
+    na_filter=False,   # keep empty strings
+    engine="python",
+    quoting=csv.QUOTE_NONE,
+)
+
+_NUMERIC_COL_HINTS = [
+    "units", "amount", "rate", "royalties", "payable",
+    "share", "ppd", "retail", "price", "payout", "%", "received"
+]
+
+
+def _normalize_plus_padded(s: str) -> str:
+    """Normalize padded-plus numbers (kept as strings)."""
+    if not isinstance(s, str):
+        return s
+    s2 = s[1:] if s.startswith("+") else s
+    left, dot, right = s2.partition(".")
+    if left.isdigit():
+        # int() round-trip only needed for non-ASCII digits
+        left_norm = (left.lstrip("0") or "0") if left.isascii() \
+            else str(int(left))
+        return f"{left_norm}{dot}{right}"
+    return s
+
+
+# What str.strip() removes from ASCII text
+_ASCII_WS = " \t\n\r\x0b\x0c\x1c\x1d\x1e\x1f"
+
+
+def _arrow_strip(arr):
+    return pc.utf8_trim(arr, characters=_ASCII_WS)
+
+
+def _arrow_normalize_plus_padded(arr):
+    s2 = pc.if_else(pc.starts_with(arr, "+"),
+                    pc.utf8_slice_codeunits(arr, 1), arr)
+    hit = pc.match_substring_regex(s2, r"^[0-9]+(\.|$)")
+    t = pc.utf8_ltrim(s2, characters="0")
+    needs_zero = pc.or_(pc.equal(pc.utf8_length(t), 0),
+                        pc.starts_with(t, "."))
+    t = pc.if_else(needs_zero, pc.binary_join_element_wise("0", t, ""), t)
+    return pc.if_else(hit, t, arr)
+
+
+def _map_str_col(s: pd.Series, arrow_fn, py_fn) -> pd.Series:
+    """
+    Apply a string transform to the whole column at once.
+    With pyarrow, ASCII cells go through `arrow_fn` (Arrow string kernels);
+    non-ASCII cells, or every cell without pyarrow, use the scalar `py_fn`,
+    which defines the exact result. None cells (ragged rows) are kept.
+    """
+    vals = s.to_numpy(dtype=object)
+    arr = None
+    if pa is not None:
+        try:
+            arr = pa.array(vals, type=pa.string(), from_pandas=True)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            arr = None  # non-string cells: use the scalar path
+    if arr is None:
+        out = np.empty(len(vals), dtype=object)
+        out[:] = [py_fn(x) if isinstance(x, str) else x for x in vals]
+        return pd.Series(out, index=s.index, name=s.name)
+
+    out = arrow_fn(arr).to_numpy(zero_copy_only=False)
+    is_ascii = pc.fill_null(pc.string_is_ascii(arr), True).to_numpy(
+        zero_copy_only=False)
+    if not is_ascii.all():
+        out[~is_ascii] = [py_fn(x) for x in vals[~is_ascii]]
+    return pd.Series(out, index=s.index, name=s.name)
+
+
+def _strip_col(s: pd.Series) -> pd.Series:
+    """Whole-column str.strip(); non-string cells are left untouched."""
+    return _map_str_col(s, _arrow_strip, str.strip)
+
+
+def _strip_normalize_col(s: pd.Series) -> pd.Series:
+    """Whole-column strip followed by _normalize_plus_padded."""
+    return _map_str_col(
+        s,
+        lambda arr: _arrow_normalize_plus_padded(_arrow_strip(arr)),
+        lambda x: _normalize_plus_padded(x.strip()))
+
+
+def _trim_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Strip whitespace from headers and string cells."""
+    df.columns = [c.strip() for c in df.columns]
+    for col in df.columns:
+        if df[col].dtype == object:
+            df[col] = _strip_col(df[col])
+    return df
+
+
+def _clean_tab_frame(df: pd.DataFrame, keep_cols=None) -> pd.DataFrame:
+    """
+    Post-process a raw tab-strict frame (or chunk of one), one whole-column
+    pass per column. `keep_cols` is the set of non-empty columns across the
+    whole file; when None, fully-empty columns are detected from `df` itself.
+    """
+    # Trim headers
+    df.columns = [c.strip() for c in df.columns]
+
+    # Trim cell values, normalizing padded-plus numbers (kept as strings) in
+    # likely numeric columns in the same pass. Normalizing never empties a
+    # cell, so the empty-column check below is unaffected.
+    for col in df.columns:
+        if df[col].dtype == object:
+            if any(k in col.lower() for k in _NUMERIC_COL_HINTS):
+                df[col] = _strip_normalize_col(df[col])
+            else:
+                df[col] = _strip_col(df[col])
+
+    # Drop fully-empty columns
+    if keep_cols is None:
+        is_empty = (df == "").all(axis=0)
+        empty_cols = list(is_empty.index[is_empty.to_numpy()])
+    else:
+        empty_cols = [c for c in df.columns if c not in keep_cols]
+    if empty_cols:
+        df = df.drop(columns=empty_cols)
+
+    return df
+
+
+@contextmanager
+def _open_source(path: str, probe):
+    """
+    What pandas should read for `probe`: the path itself, or a stream of
+    the decompressed content / ZIP member (decompressed as it is parsed).
+    """
+    if probe.compression is None and probe.member is None:
+        yield path
+        return
+    with open_content(path, probe.compression, probe.member) as f:
+        yield f
+
+
+def read_tab_strict(path: str, encoding: str = None,
+                    member: str = None) -> pd.DataFrame:
+    """
+    Robust reader for .TAB / .TSV royalty statements:
+      - Force tab separator
+      - Read all fields as string
+      - No NA conversion
+      - Strip whitespace from headers and values
+      - Drop fully-empty columns
+      - Normalize "+000000...0.xxx" to "0.xxx" (kept as strings)
+    The encoding (probed once from the bytes unless given) is reported in
+    df.attrs["encoding"]. `member` reads one file of a ZIP archive.
+    """
+    probe = probe_file(path, member=member)
+    enc = encoding or probe.encoding
+    try:
+        with _open_source(path, probe) as src:
+            df = pd.read_csv(src, encoding=enc, **_TAB_READ_KW)
+    except UnicodeDecodeError:
+        # Bad byte outside the sampled head/tail
+        if enc != "utf-8":
+            raise
+        enc = "latin1"
+        with _open_source(path, probe) as src:
+            df = pd.read_csv(src, encoding=enc, **_TAB_READ_KW)
+
+    df = _clean_tab_frame(df)
+    df.attrs["encoding"] = enc
+    return df
+
+
+def _scan_tab_columns(path: str, chunksize: int, encoding: str = None,
+                      member: str = None) -> tuple[str, set]:
+    """
+    Streaming pre-pass for iter_tab_strict: the set of (trimmed) columns
+    holding any value. Being a full pass, it also confirms the detected
+    encoding (falling back to latin1), which is returned with the set.
+    """
+    probe = probe_file(path, member=member)
+
+    def scan(enc):
+        non_empty = set()
+        with _open_source(path, probe) as src, \
+                pd.read_csv(src, encoding=enc, chunksize=chunksize,
+                            **_TAB_READ_KW) as reader:
+            for chunk in reader:
+                for col in chunk.columns:
+                    name = col.strip()
+                    if name in non_empty:
+                        continue
+                    if (_strip_col(chunk[col]) != "").any():
+                        non_empty.add(name)
+        return non_empty
+
+    enc = encoding or probe.encoding
+    try:
+        return enc, scan(enc)
+    except UnicodeDecodeError:
+        if enc != "utf-8":
+            raise
+        return "latin1", scan("latin1")
+
+
+def iter_tab_strict(path: str, chunksize: int = DEFAULT_CHUNKSIZE,
+                    encoding: str = None, member: str = None):
+    """
+    Chunked variant of read_tab_strict: yields frames of at most `chunksize`
+    rows with the same trimming/normalisation. A cheap first pass settles the
+    encoding and which columns are fully empty, so every chunk has the same
+    columns as the whole-file reader would produce.
+    """
+    enc, keep_cols = _scan_tab_columns(path, chunksize, encoding, member)
+    with _open_source(path, probe_file(path, member=member)) as src, \
+            pd.read_csv(src, encoding=enc, chunksize=chunksize,
+                        **_TAB_READ_KW) as reader:
+        for chunk in reader:
+            chunk = _clean_tab_frame(chunk, keep_cols=keep_cols)
+            chunk.attrs["encoding"] = enc
+            yield chunk
+
+
+def iter_delimited(path: str, chunksize: int = DEFAULT_CHUNKSIZE,
+                   member: str = None):
+    """Chunked reader for other delimited text: delimiter guess, strings, trim."""
+    probe = probe_file(path, member=member)
+    enc = probe.encoding
+    if not probe.encoding_checked:
+        # Chunks are consumed as they are read, so settle the encoding up front
+        enc = detect_encoding(path, validate=True,
+                              compression=probe.compression, member=member)
+    sep = probe.delimiter or ','
+    with _open_source(path, probe) as src, \
+            pd.read_csv(src, sep=sep, engine='python', dtype=str,
+                        na_filter=False, chunksize=chunksize,
+                        encoding=enc) as reader:
+        for chunk in reader:
+            chunk = _trim_frame(chunk)
+            chunk.attrs["encoding"] = enc
+            yield chunk
+
+# -------------------------------
+# Whole-input dtypes for chunked readers
+# -------------------------------
+# A chunked reader keeps, per column, the few values that decide the dtype
+# pandas infers (see _sample_values) and parses them along with every
+# chunk, then drops them again: each chunk then gets the dtypes a whole
+# read would give, whatever rows it happens to hold.
+
+_BOOL_STRINGS = ("True", "TRUE", "true", "False", "FALSE", "false")
+_INT64_MAX = 2 ** 63 - 1
+
+
+def _keep_extremes(samples: dict, kind, lo, hi, key=None):
+    key = key or (lambda v: v)
+    old = samples.get((kind, 'lo'))
+    if old is None or key(lo) < key(old):
+        samples[(kind, 'lo')] = lo
+    old = samples.get((kind, 'hi'))
+    if old is None or key(hi) > key(old):
+        samples[(kind, 'hi')] = hi
+
+
+def _sample_values(col: pd.Series, samples: dict):
+    """
+    Add to `samples` the few values of the object column `col` that decide
+    the dtype pandas infers for it: one per kind of value, plus the
+    smallest and largest number, numeric string and date (their range
+    decides between int64, uint64, float64 and object).
+    """
+    na = col.isna()
+    if na.any():
+        samples.setdefault('na', np.nan)
+    values = col[~na]
+    for kind, group in values.groupby(values.map(type), sort=False):
+        if kind is not str:
+            try:
+                lo, hi = group.min(), group.max()
+            except TypeError:
+                lo = hi = group.iloc[0]
+            _keep_extremes(samples, kind, lo, hi)
+            continue
+        strings = pd.unique(group.to_numpy())
+        flags = np.isin(strings, _BOOL_STRINGS)
+        if flags.any():
+            samples.setdefault('bool-str', strings[flags][0])
+        strings = strings[~flags]
+        numeric = pd.isna(pd.to_numeric(strings, errors='coerce'))
+        if numeric.any():
+            samples.setdefault('str', strings[numeric][0])
+        ints = []
+        for s in strings[~numeric]:
+            try:
+                ints.append((int(s), s))
+            except ValueError:
+                samples.setdefault('float-str', s)
+        if ints:
+            _keep_extremes(samples, 'int-str', min(ints)[1], max(ints)[1],
+                           key=int)
+
+
+def _sample_value(samples: dict, value):
+    """
+    _sample_values for one parsed value (JSON, say): kept by type, ints by
+    sign and whether they fit int64, floats by whether they are NaN.
+    """
+    kind = type(value)
+    if kind is int:
+        kind = (int, value < 0, value > _INT64_MAX)
+    elif kind is float:
+        kind = (float, value != value)
+    samples.setdefault(kind, value)
+
+
+def _sample_rows(samples: list) -> list:
+    """
+    Rows holding every column's samples (one dict per column), short
+    columns padded with their own first sample.
+    """
+    samples = [list(c.values()) for c in samples]
+    height = max(map(len, samples), default=0)
+    return [[c[i] if i < len(c) else c[0] for c in samples]
+            for i in range(height)]
+
+# -------------------------------
+# JSON / JSON Lines (incremental)
+# -------------------------------
+JSON_LINES_EXTS = ('.jsonl', '.ndjson')
+
+# Characters read from the text per refill of the parse buffer
+JSON_READ_CHARS = 1024 * 1024
+
+_JSON_ARRAY_GAP = re.compile(r'[\s,]*')
+_JSON_LINES_GAP = re.compile(r'\s*')
+
+
+@contextmanager
+def _json_text(path: str, probe):
+    """The (decompressed) content of `probe` as UTF-8 text, BOM skipped."""
+    with open_content(path, probe.compression, probe.member) as raw:
+        yield io.TextIOWrapper(raw, encoding='utf-8-sig')
+
+
+def _iter_json_values(f, array: bool):
+    """
+    Parse JSON values one at a time from the text stream `f`: the elements
+    of one top-level array, or (array=False) a sequence of values, as in
+    JSON Lines. Only the value being parsed is held in memory.
+    """
+    decoder = json.JSONDecoder()
+    gap = _JSON_ARRAY_GAP if array else _JSON_LINES_GAP
+    buf, pos, eof = "", 0, False
+    started = not array
+
+    def refill():
+        nonlocal buf, pos, eof
+        text = f.read(JSON_READ_CHARS)
+        eof = not text
+        buf, pos = buf[pos:] + text, 0
+
+    while True:
+        pos = gap.match(buf, pos).end()
+        while pos == len(buf) and not eof:
+            refill()
+            pos = gap.match(buf, pos).end()
+        if pos == len(buf):
+            if started and array:
+                raise ValueError("Unterminated JSON array")
+            return
+        if not started:
+            if buf[pos] != '[':
+                raise ValueError("Expected a JSON array")
+            started = True
+            pos += 1
+            continue
+        if array and buf[pos] == ']':
+            return
+        while True:
+            try:
+                value, end = decoder.raw_decode(buf, pos)
+            except ValueError:
+                if eof:
+                    raise
+                refill()
+                continue
+            if end < len(buf) or eof:
+                break
+            refill()  # a number at the end of the buffer may go on
+        pos = end
+        yield value
+
+
+def _json_layout(path: str, probe) -> str:
+    """
+    'array' (one top-level array), 'lines' (JSON Lines, or values one
+    after another) or 'object' (a single object: one of pandas' layouts).
+    """
+    if os.path.splitext(probe.name)[1].lower() in JSON_LINES_EXTS:
+        return 'lines'
+    with _json_text(path, probe) as f:
+        lead = ""
+        while not lead:
+            block = f.read(4096)
+            if not block:
+                break
+            lead = block.lstrip()
+    if lead.startswith('['):
+        return 'array'
+    with _json_text(path, probe) as f:
+        first_two = list(islice(_iter_json_values(f, False), 2))
+    return 'lines' if len(first_two) > 1 else 'object'
+
+
+def _json_columns(path: str, probe, layout: str):
+    """
+    Streaming pre-pass for iter_json_chunks: (the columns every chunk gets,
+    sample records for them), or None when the values aren't records
+    pandas should lay out instead. Columns are record keys in first-seen
+    order, or positions for arrays of arrays; the samples decide each
+    column's dtype as over the whole file (see _sample_values).
+    """
+    samples, partial, n, kinds = {}, set(), 0, set()
+    with _json_text(path, probe) as f:
+        for value in _iter_json_values(f, layout == 'array'):
+            if isinstance(value, dict):
+                kinds.add(dict)
+                items = value.items()
+            elif isinstance(value, list):
+                kinds.add(list)
+                items = enumerate(value)
+            else:
+                return None
+            if len(kinds) > 1:
+                return None
+            for key, v in items:
+                s = samples.get(key)
+                if s is None:
+                    s = samples[key] = {}
+                    if n:
+                        partial.add(key)
+                _sample_value(s, v)
+            if len(value) < len(samples):
+                keys = value if dict in kinds else range(len(value))
+                partial.update(samples.keys() - keys)
+            n += 1
+    columns = sorted(samples) if list in kinds else list(samples)
+    for key in partial:  # missing from some records: NaN (None) there
+        _sample_value(samples[key], None if list in kinds else np.nan)
+    rows = _sample_rows([samples[key] for key in columns])
+    if dict in kinds:
+        rows = [dict(zip(columns, row)) for row in rows]
+    return columns, rows
+
+
+def _json_frame(records: list, columns: list, samples: list) -> pd.DataFrame:
+    df = pd.DataFrame.from_records(records + samples, columns=columns)
+    return df.iloc[:len(records)].copy()
+
+
+def iter_json_chunks(path: str, chunksize: int = DEFAULT_CHUNKSIZE,
+                     member: str = None):
+    """
+    Chunked JSON reader for a top-level array of records or JSON Lines,
+    parsed incrementally so memory stays bounded. A cheap first pass
+    collects the keys and a few values of each, so every chunk has the
+    same columns and dtypes (those of pd.DataFrame.from_records over all
+    the records). Values keep their JSON types (no date or number
+    guessing). Other layouts (a single object, arrays of scalars) are read
+    whole by pandas.
+    """
+    probe = probe_file(path, member=member)
+    layout = _json_layout(path, probe)
+    pre = None if layout == 'object' else _json_columns(path, probe, layout)
+    if pre is None:
+        with _open_source(path, probe) as src:
+            yield pd.read_json(src, encoding='utf-8', lines=layout == 'lines')
+        return
+    columns, samples = pre
+    with _json_text(path, probe) as f:
+        batch = []
+        for value in _iter_json_values(f, layout == 'array'):
+            batch.append(value)
+            if len(batch) >= chunksize:
+                yield _json_frame(batch, columns, samples)
+                batch = []
+        if batch:
+            yield _json_frame(batch, columns, samples)
+
+# -------------------------------
+# XML (iterparse)
+# -------------------------------
+
+
+def xml_row_path(options=None):
+    """The ConvertOptions xml_row_path (default FILE_CONVERTER_XML_ROW_PATH),
+    or None."""
+    return option(options, "xml_row_path")
+
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit('}', 1)[-1]
+
+
+def _xml_row_matcher(row_path):
+    """
+    Test on the stack of element names from the root down telling whether
+    the innermost element is a row. `row_path` is the simple XPath subset
+    rows are usually addressed with: 'record' or 'batch/record' (below the
+    root), '/data/record' (from the root), '//record' (at any depth), with
+    '*' for any name. The default, None, is pandas' './*': every child of
+    the root. Names compare without namespace or prefix.
+    """
+    path = (row_path or './*').strip()
+    anywhere = path.startswith('//')
+    absolute = path.startswith('/') and not anywhere
+    if path.startswith('./'):
+        path = path[2:]
+    parts = [p.rsplit(':', 1)[-1] for p in path.strip('/').split('/')]
+    if not path.strip('/') or '' in parts or (anywhere and len(parts) > 1):
+        raise ValueError(f"Unsupported XML row path {row_path!r}")
+
+    def matches(names: list) -> bool:
+        if anywhere:
+            return parts[0] in ('*', names[-1])
+        tail = names if absolute else names[1:]
+        return len(tail) == len(parts) and all(
+            p in ('*', n) for p, n in zip(parts, tail))
+
+    return matches
+
+
+def _xml_record(elem) -> dict:
+    """One row the way pd.read_xml lays it out: attributes, own text and
+    the text of each child element."""
+    record = {_local_name(k): v for k, v in elem.attrib.items()}
+    if elem.text and not elem.text.isspace():
+        record[_local_name(elem.tag)] = elem.text
+    for child in elem:
+        record[_local_name(child.tag)] = child.text or None
+    return record
+
+
+def _iter_xml_records(path: str, probe, row_path):
+    """
+    Rows of an XML document as dicts, parsed with iterparse. Finished
+    elements are cleared and detached from their parent, so memory holds
+    one row (and the path down to it) however large the document.
+    """
+    matches = _xml_row_matcher(row_path)
+    names, parents = [], []
+    row_depth = None
+    found = False
+    with open_content(path, probe.compression, probe.member) as f:
+        for event, elem in ET.iterparse(f, events=('start', 'end')):
+            if event == 'start':
+                names.append(_local_name(elem.tag))
+                parents.append(elem)
+                if row_depth is None and matches(names):
+                    row_depth = len(names)
+                continue
+            depth = len(names)
+            names.pop()
+            parents.pop()
+            if row_depth == depth:
+                found = True
+                yield _xml_record(elem)
+                row_depth = None
+            elif row_depth is not None:
+                continue  # inside a row: kept until the row ends
+            elem.clear()
+            if parents:
+                del parents[-1][:]
+    if not found:
+        raise ValueError(
+            f"No rows at {row_path or './*'!r}; set the row element path")
+
+
+def _xml_frame(records: list, columns: list, samples=(),
+               dtype=None) -> pd.DataFrame:
+    """
+    Records -> DataFrame through TextParser, which infers dtypes just as
+    pd.read_xml does; `samples` (from _xml_columns) are parsed along and
+    dropped again.
+    """
+    rows = [[r.get(c) for c in columns] for r in records] + list(samples)
+    with TextParser(rows, names=columns, dtype=dtype) as parser:
+        df = parser.read()
+    return df.iloc[:len(records)].copy() if samples else df
+
+
+def _xml_columns(path: str, probe, row_path, chunksize: int):
+    """
+    Pre-pass for iter_xml_chunks: (column names in first-seen order, sample
+    rows deciding each column's dtype as over the whole document, see
+    _sample_values).
+    """
+    columns, samples, seen = {}, [], 0
+
+    def sample(batch):
+        for record in batch:
+            for key in record:
+                columns.setdefault(key, None)
+        # columns first seen in this batch are missing from earlier rows
+        samples.extend({'na': np.nan} if seen else {}
+                       for _ in range(len(columns) - len(samples)))
+        if columns:
+            df = _xml_frame(batch, list(columns), dtype=object)
+            for j, col_samples in enumerate(samples):
+                _sample_values(df.iloc[:, j], col_samples)
+        return seen + len(batch)
+
+    batch = []
+    for record in _iter_xml_records(path, probe, row_path):
+        batch.append(record)
+        if len(batch) >= chunksize:
+            seen, batch = sample(batch), []
+    if batch:
+        sample(batch)
+    return list(columns), _sample_rows(samples)
+
+
+def iter_xml_chunks(path: str, chunksize: int = DEFAULT_CHUNKSIZE,
+                    member: str = None, row_path=None):
+    """
+    Chunked XML reader. Rows are the elements at `row_path` (see
+    _xml_row_matcher; default xml_row_path(), else the root's children)
+    and columns are their attributes and child elements, as with
+    pd.read_xml. A first pass collects the column names and a few values
+    of each, so every chunk has the same columns and the dtypes pd.read_xml
+    infers over the whole document.
+    """
+    probe = probe_file(path, member=member)
+    row_path = row_path or xml_row_path()
+    columns, samples = _xml_columns(path, probe, row_path, chunksize)
+    batch = []
+    for record in _iter_xml_records(path, probe, row_path):
+        batch.append(record)
+        if len(batch) >= chunksize:
+            yield _xml_frame(batch, columns, samples)
+            batch = []
+    if batch:
+        yield _xml_frame(batch, columns, samples)
+
+# -------------------------------
+# HTML tables (one parse per document)
+# -------------------------------
+
+
+def html_table_selector(options=None):
+    """The ConvertOptions html_tables (default FILE_CONVERTER_HTML_TABLES),
+    or None."""
+    return option(options, "html_tables")
+
+
+def _html_tables(path: str, probe) -> list:
+    """The <table> elements of the document, in document order, from a
+    single lxml parse."""
+    parser = lxml.html.HTMLParser(encoding='utf-8')
+    with open_content(path, probe.compression, probe.member) as src:
+        return lxml.html.parse(src, parser).getroot().xpath('//table')
+
+
+def _html_table_frame(table) -> pd.DataFrame:
+    """Parse one <table> element with pandas' HTML table parser."""
+    text = lxml.html.tostring(table, encoding='unicode', with_tail=False)
+    try:
+        return pd.read_html(io.StringIO(text), flavor='lxml')[0]
+    except ValueError:  # no rows (or hidden): nothing to convert
+        return pd.DataFrame()
+
+
+def _select_html_tables(tables: list, selector) -> list[tuple]:
+    """
+    [(index, frame or None)] for the tables `selector` picks: 'N' (the N-th
+    table, from 0), '#name' (the table with that id), 'all', or else a
+    regular expression searched in each table's text (the first match).
+    None keeps the old behaviour: the first table that has rows, returned
+    with the frame built to find it (other selectors build none).
+    """
+    if selector is None:
+        for i, table in enumerate(tables):
+            df = _html_table_frame(table)
+            if not df.empty:
+                return [(i, df)]
+        return []
+    if selector == 'all':
+        return [(i, None) for i in range(len(tables))]
+    if selector.lstrip('-').isdigit():
+        index = int(selector)
+        if not -len(tables) <= index < len(tables):
+            raise ValueError(f"No table {index}: the document has "
+                             f"{len(tables)} table(s)")
+        return [(index % len(tables), None)]
+    if selector.startswith('#'):
+        found = [i for i, t in enumerate(tables) if t.get('id') == selector[1:]]
+    else:
+        pattern = re.compile(selector)
+        found = [i for i, t in enumerate(tables)
+                 if pattern.search(t.text_content())]
+    if not found:
+        raise ValueError(f"No table matches {selector!r}")
+    return [(found[0], None)]
+
+
+def _read_html_pandas(path: str, probe, selector) -> list:
+    # Without lxml: pandas parses (with BeautifulSoup) and keeps what matches
+    kw = {}
+    if selector and selector.startswith('#'):
+        kw['attrs'] = {'id': selector[1:]}
+    elif selector and selector != 'all' and not selector.lstrip('-').isdigit():
+        kw['match'] = selector
+    with _open_source(path, probe) as src:
+        tables = pd.read_html(src, encoding='utf-8', **kw)
+    if selector == 'all':
+        return list(enumerate(tables))
+    index = int(selector) if selector and selector.lstrip('-').isdigit() else 0
+    return [(index, tables[index])] if tables else []
+
+
+def html_table_indexes(path: str, member: str = None, selector=None) -> list[int]:
+    """Document-order indexes of the tables `selector` (default
+    html_table_selector()) picks from an HTML file."""
+    probe = probe_file(path, member=member)
+    selector = selector or html_table_selector()
+    if lxml is None:
+        return [i for i, _ in _read_html_pandas(path, probe, selector)]
+    return [i for i, _ in _select_html_tables(_html_tables(path, probe),
+                                              selector)]
+
+
+def iter_html_tables(path: str, member: str = None, selector=None):
+    """
+    Yield (index, DataFrame) for the tables `selector` (default
+    html_table_selector()) picks, see _select_html_tables. The document is
+    parsed once and each table is parsed into a frame only when reached;
+    the parse is dropped when the generator finishes.
+    """
+    probe = probe_file(path, member=member)
+    selector = selector or html_table_selector()
+    if lxml is None:
+        yield from _read_html_pandas(path, probe, selector)
+        return
+    tables = _html_tables(path, probe)
+    for i, df in _select_html_tables(tables, selector):
+        yield i, df if df is not None else _html_table_frame(tables[i])
+
+
+def read_html_tables(path: str, member: str = None, selector=None) -> list:
+    """[(index, DataFrame)] for the tables `selector` picks (see
+    iter_html_tables)."""
+    return list(iter_html_tables(path, member, selector))
+
+
+def read_html_table(path: str, index: int, member: str = None) -> pd.DataFrame:
+    """The `index`-th table of an HTML file (document order, from 0)."""
+    return read_html_tables(path, member, str(index))[0][1]
+
+# -------------------------------
+# Streaming workbook readers (.xlsx via openpyxl read-only, .xls built in)
+# -------------------------------
+STREAMABLE_EXCEL_EXTS = ('.xlsx', '.xlsm')
+
+# Rows scanned when looking for the header row (header='auto')
+HEADER_SCAN_ROWS = 20
+
+
+def _open_xlsx(path: str):
+    from openpyxl import load_workbook
+    return load_workbook(path, read_only=True, data_only=True,
+                         keep_links=False)
+
+
+def _trim_row(row: list) -> list:
+    while row and isinstance(row[-1], str) and row[-1] == "":
+        row.pop()
+    return row
+
+
+def _xlsx_row(values) -> list:
+    """One sheet row converted the way pandas' openpyxl reader does it."""
+    from openpyxl.cell.cell import ERROR_CODES
+    row = []
+    for v in values:
+        if v is None:
+            v = ""
+        elif isinstance(v, float):
+            if v.is_integer():
+                v = int(v)
+        elif isinstance(v, str) and v in ERROR_CODES:
+            v = np.nan
+        row.append(v)
+    return _trim_row(row)
+
+
+def _xls_date(serial: float, datemode: int):
+    """Excel serial -> datetime (or time for day 0), as pandas' xlrd reader."""
+    if datemode:
+        epoch = datetime.datetime(1904, 1, 1)
+    elif serial < 60:
+        epoch = datetime.datetime(1899, 12, 31)
+    else:
+        epoch = datetime.datetime(1899, 12, 30)
+    days = int(serial)
+    seconds, millis = divmod(int(round((serial - days) * 86400000)), 1000)
+    try:
+        value = epoch + datetime.timedelta(days, seconds, 0, millis)
+    except OverflowError:
+        return serial
+    if value.date() == epoch.date() + datetime.timedelta(0 if datemode else
+                                                         (serial >= 60)):
+        return value.time()
+    return value
+
+
+def _xls_rows(book, sheet):
+    """Dense rows for one sheet of an XlsBook (blank rows as [])."""
+    next_row = 0
+    for r, cells in book.iter_rows(sheet):
+        while next_row < r:
+            yield []
+            next_row += 1
+        row = [""] * (max(cells) + 1)
+        for c, v in cells.items():
+            if isinstance(v, float):
+                if v.is_integer():
+                    v = int(v)
+            elif isinstance(v, tuple):
+                v = _xls_date(v[1], book.datemode)
+            elif v is BIFF_ERROR:
+                v = np.nan
+            elif v is None:
+                v = ""
+            row[c] = v
+        yield _trim_row(row)
+        next_row = r + 1
+
+
+def _detect_header_row(rows: list) -> int:
+    """
+    Index of the likely header among `rows`: the first row whose filled
+    cells are all text and cover at least half of the widest row;
+    otherwise the first non-blank row.
+    """
+    widest = max((sum(v != "" for v in r) for r in rows), default=0)
+    for i, r in enumerate(rows):
+        filled = [v for v in r if not (isinstance(v, str) and v == "")]
+        if (filled and all(isinstance(v, str) for v in filled)
+                and 2 * len(filled) >= widest):
+            return i
+    return next((i for i, r in enumerate(rows) if r), 0)
+
+
+def _split_header(rows, header) -> tuple:
+    """
+    (header row, iterator over the remaining rows, width of the widest row
+    up to the header). header is a row index, None (no header) or 'auto'.
+    The header row is None when there is no header or the sheet ends
+    before it. Rows skipped above the header still widen the frame, as
+    they do in read_excel.
+    """
+    if header is None:
+        return None, rows, 0
+    rows = iter(rows)
+    if header == 'auto':
+        scan = list(islice(rows, HEADER_SCAN_ROWS))
+        skip = _detect_header_row(scan)
+        above, rows = scan[:skip], chain(scan[skip:], rows)
+    else:
+        above = list(islice(rows, int(header)))
+    head = next(rows, None)
+    width = max(map(len, above + [head or []]), default=0)
+    return head, rows, width
+
+
+def _sheet_frame(head, data: list, width: int, dtype=None) -> pd.DataFrame:
+    """
+    Rows -> DataFrame through the same TextParser step as read_excel
+    (header mangling, NA markers, dtype inference unless `dtype` is given).
+    """
+    data = [r + [""] * (width - len(r)) for r in data]
+    kw = dict(dtype=dtype, skip_blank_lines=False)
+    if head is None:
+        return TextParser(data, header=None, **kw).read()
+    data.insert(0, head + [""] * (width - len(head)))
+    return TextParser(data, header=0, **kw).read()
+
+
+def _sheet_batches(head, rows, chunksize: int, width: int = 0):
+    """
+    (rows, width) batches of `chunksize` rows. Blank rows are held back
+    until a later row has data, so trailing blank rows are dropped like
+    read_excel does. Batches start `width` columns wide (the widest row
+    up to the header, see _split_header) and grow with the widest row
+    read so far, never from a recorded sheet dimension, which can count
+    formatted empty cells.
+    """
+    width = max(width, len(head) if head else 0)
+    batch, blank = [], 0
+    for row in rows:
+        if not row:
+            blank += 1
+            continue
+        if blank:
+            batch.extend([] for _ in range(blank))
+            blank = 0
+        batch.append(row)
+        width = max(width, len(row))
+        while len(batch) >= chunksize:
+            yield batch[:chunksize], width
+            batch = batch[chunksize:]
+    if batch:
+        yield batch, width
+
+
+def _sheet_frames(head, batches, samples=()):
+    """
+    DataFrames from (rows, width) batches (see _sheet_batches), each
+    inferring its own dtypes. `samples` (rows from _sheet_profile) are
+    parsed along with every batch and dropped again, so each frame has the
+    sheet's full width and columns inferred as if the whole sheet were
+    read at once.
+    """
+    for data, width in batches:
+        if not samples:
+            yield _sheet_frame(head, data, width)
+            continue
+        df = _sheet_frame(head, data + samples, len(samples[0]))
+        yield df.iloc[:len(df) - len(samples)].copy()
+
+
+def _sheet_profile(head, rows, chunksize: int, width: int, spool):
+    """
+    First pass over a sheet to be streamed: (one-row DataFrame with the
+    sheet's column names and the dtypes read_excel infers over the whole
+    sheet, sample rows for _sheet_frames), or None if the sheet has no data
+    rows. The batches are pickled to `spool` for the second pass, and only
+    a handful of sample values per column are kept, so memory stays
+    bounded by the chunk.
+    """
+    samples, seen, df = [], 0, None
+    for data, width in _sheet_batches(head, rows, chunksize, width):
+        pickle.dump((data, width), spool, pickle.HIGHEST_PROTOCOL)
+        df = _sheet_frame(head, data, width, object)
+        # columns first reached by a wider row are blank in earlier rows
+        samples.extend({'na': np.nan} if seen else {}
+                       for _ in range(width - len(samples)))
+        for j, col_samples in enumerate(samples):
+            _sample_values(df.iloc[:, j], col_samples)
+        seen += len(data)
+    if df is None:
+        return None
+    columns = {}
+    for name, col_samples in zip(df.columns, samples):
+        s = TextParser([[v] for v in col_samples.values()], header=None,
+                       skip_blank_lines=False).read()[0]
+        filled = s[s.notna()]
+        columns[name] = (filled if len(filled) else s).iloc[:1].reset_index(
+            drop=True)
+    return pd.DataFrame(columns, columns=df.columns), _sample_rows(samples)
+
+
+def _unspool(spool):
+    """The batches _sheet_profile pickled to `spool`, in order."""
+    spool.seek(0)
+    while True:
+        try:
+            yield pickle.load(spool)
+        except EOFError:
+            return
+
+
+def _stream_sheet(rows, chunksize: int, header):
+    """
+    Chunks of one sheet with the dtypes read_excel would give the whole
+    sheet: the rows are profiled (and spooled to a temporary file) first.
+    """
+    head, rows, width = _split_header(rows, header)
+    if header is not None and head is None:
+        return
+    with tempfile.TemporaryFile() as spool:
+        profile = _sheet_profile(head, rows, chunksize, width, spool)
+        if profile is not None:
+            yield from _sheet_frames(head, _unspool(spool), profile[1])
+
+
+def _iter_book_chunks(sheets, chunksize: int, header):
+    """
+    Chunks of every sheet with a SheetName column. `sheets` yields
+    (title, rows) per sheet. Every sheet is profiled up front so all chunks
+    get the columns and dtypes concat_sheets gives the whole sheets.
+    """
+    plans, samples = [], []
+    try:
+        for title, rows in sheets:
+            head, rows, width = _split_header(rows, header)
+            if header is not None and head is None:
+                continue
+            spool = tempfile.TemporaryFile()
+            plans.append((title, head, spool))
+            profile = _sheet_profile(head, rows, chunksize, width, spool)
+            if profile is None:
+                plans.pop()
+                spool.close()
+                continue
+            plans[-1] += (profile[1],)
+            samples.append(profile[0].assign(SheetName=title))
+        for i, (title, head, spool, sheet_samples) in enumerate(plans):
+            for df in _sheet_frames(head, _unspool(spool), sheet_samples):
+                df['SheetName'] = title
+                # stacked between the other sheets' sample rows (and after
+                # its own, so no column is all-NA unless the sheet's is),
+                # the chunk gets the columns, dtypes and fill values
+                # concat_sheets gives the whole sheets
+                with warnings.catch_warnings():
+                    warnings.simplefilter('ignore', FutureWarning)
+                    own = pd.concat([samples[i], df], ignore_index=True)
+                    df = pd.concat(samples[:i] + [own] + samples[i + 1:],
+                                   ignore_index=True)
+                yield df.iloc[i + 1:i + len(own)].reset_index(drop=True)
+            spool.close()
+    finally:
+        for plan in plans:
+            plan[2].close()
+
+
+def _ws_rows(ws):
+    ws.reset_dimensions()  # recorded dimensions can be wrong; read to the end
+    return (_xlsx_row(r) for r in ws.iter_rows(values_only=True))
+
+
+def iter_xlsx_sheet(path: str, sheet=0, chunksize: int = DEFAULT_CHUNKSIZE,
+                    header=0):
+    """
+    Stream one .xlsx/.xlsm sheet (name or index) as DataFrames of at most
+    `chunksize` rows, with openpyxl in read-only mode, so memory is bounded
+    by the chunk rather than the sheet. A first pass over the rows (spooled
+    to a temporary file) infers each column's dtype the way xls.parse does
+    over the whole sheet, and every chunk is given those dtypes.
+    header: row index of the header (default 0), None for no header row,
+    or 'auto' to pick it from the first HEADER_SCAN_ROWS rows (rows above
+    it, e.g. a report title, are skipped).
+    """
+    wb = _open_xlsx(path)
+    try:
+        ws = wb.worksheets[sheet] if isinstance(sheet, int) else wb[sheet]
+        yield from _stream_sheet(_ws_rows(ws), chunksize, header)
+    finally:
+        wb.close()
+
+
+def iter_xlsx_chunks(path: str, chunksize: int = DEFAULT_CHUNKSIZE,
+                     header=0):
+    """
+    Stream every worksheet of an .xlsx/.xlsm with a SheetName column, the
+    chunked counterpart of read_file.
+    """
+    wb = _open_xlsx(path)
+    try:
+        sheets = ((ws.title, _ws_rows(ws)) for ws in wb.worksheets)
+        yield from _iter_book_chunks(sheets, chunksize, header)
+    finally:
+        wb.close()
+
+
+def _xls_book_sheet(book, sheet, chunksize: int, header):
+    yield from _stream_sheet(_xls_rows(book, sheet), chunksize, header)
+
+
+def _xls_book_chunks(book, chunksize: int, header):
+    sheets = ((name, _xls_rows(book, name)) for name in book.sheet_names)
+    yield from _iter_book_chunks(sheets, chunksize, header)
+
+
+def iter_xls_sheet(path: str, sheet=0, chunksize: int = DEFAULT_CHUNKSIZE,
+                   header=0):
+    """
+    Stream one legacy .xls sheet with the built-in BIFF reader (no xlrd or
+    Excel needed); same values and header handling as iter_xlsx_sheet.
+    Raises ValueError if the workbook can't be read this way (encrypted,
+    pre-BIFF5).
+    """
+    with XlsBook(path) as book:
+        yield from _xls_book_sheet(book, sheet, chunksize, header)
+
+
+def iter_xls_chunks(path: str, chunksize: int = DEFAULT_CHUNKSIZE, header=0):
+    """Every worksheet of a legacy .xls with a SheetName column (built-in reader)."""
+    with XlsBook(path) as book:
+        yield from _xls_book_chunks(book, chunksize, header)
+
+
+def read_xls_builtin(path: str, sheets=None) -> list[tuple]:
+    """
+    [(sheet, DataFrame), ...] for `sheets` (default: all worksheets) of a
+    legacy .xls, read whole with the built-in BIFF reader. Empty and unknown
+    sheets are left out; raises ValueError if the workbook can't be read
+    this way (encrypted, pre-BIFF5, or records that don't parse).
+    """
+    try:
+        with XlsBook(path) as book:
+            names = book.sheet_names
+            if sheets is not None:
+                names = [s for s in sheets if s in names]
+            results = []
+            for sheet in names:
+                head, rows, width = _split_header(_xls_rows(book, sheet), 0)
+                if head is None:
+                    continue
+                frames = list(_sheet_frames(
+                    head, _sheet_batches(head, rows, 1 << 30, width)))
+                if frames and not frames[0].empty:
+                    results.append((sheet, frames[0]))
+            return results
+    except (struct.error, IndexError) as e:
+        raise ValueError(f"Malformed .xls records: {e}") from e
+
+# -------------------------------
+# Columnar readers (Parquet, Feather / Arrow IPC)
+# -------------------------------
+_COLUMNAR_TITLES = {'parquet': "Parquet Read Error",
+                    'arrow': "Feather / Arrow Read Error"}
+
+
+def _require_pyarrow(fmt: str):
+    if pa is None:
+        raise ConversionError(
+            _COLUMNAR_TITLES[fmt],
+            "Reading Parquet, Feather and Arrow files requires the "
+            "'pyarrow' package.\n\nInstall with:\n pip install pyarrow")
+
+
+def _open_arrow_ipc(source):
+    """
+    Batch reader for an open Arrow file: an IPC file (Feather v2), an IPC
+    stream, or a whole Feather v1 table (no record batches of its own).
+    """
+    import pyarrow.ipc as ipc
+    v1 = source.read(4) == FEATHER_V1_SIGNATURE
+    source.seek(0)
+    if v1:
+        import pyarrow.feather as feather
+        return feather.read_table(source).to_reader()
+    try:
+        return ipc.open_file(source)
+    except pa.ArrowInvalid:
+        source.seek(0)
+        return ipc.open_stream(source)
+
+
+def _arrow_batches(reader):
+    if isinstance(reader, pa.RecordBatchReader):
+        return iter(reader)
+    return (reader.get_batch(i) for i in range(reader.num_record_batches))
+
+
+def read_columnar(path: str, fmt: str) -> pd.DataFrame:
+    """Read a whole Parquet (`fmt` 'parquet') or Feather / Arrow IPC file."""
+    _require_pyarrow(fmt)
+    try:
+        if fmt == 'parquet':
+            import pyarrow.parquet as pq
+            return pq.read_table(path).to_pandas()
+        with pa.memory_map(path) as source:
+            return _open_arrow_ipc(source).read_all().to_pandas()
+    except Exception as e:
+        raise ConversionError(_COLUMNAR_TITLES[fmt], str(e)) from e
+
+
+def iter_columnar_chunks(path: str, fmt: str,
+                         chunksize: int = DEFAULT_CHUNKSIZE):
+    """Yield a Parquet / Arrow IPC file as DataFrames of `chunksize` rows."""
+    _require_pyarrow(fmt)
+    try:
+        if fmt == 'parquet':
+            # One row group is decoded at a time
+            import pyarrow.parquet as pq
+            for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+                yield batch.to_pandas()
+            return
+        with pa.memory_map(path) as source:
+            for batch in _arrow_batches(_open_arrow_ipc(source)):
+                for start in range(0, batch.num_rows, chunksize):
+                    yield batch.slice(start, chunksize).to_pandas()
+    except Exception as e:
+        raise ConversionError(_COLUMNAR_TITLES[fmt], str(e)) from e
+
+
+# -------------------------------
+# Unified reader
+# -------------------------------
+
+# Formats whose readers need random access to a file on disk
+_SEEKABLE_FORMATS = ('xls', 'xlsx', 'parquet', 'arrow')
+
+
+@contextmanager
+def _extracted(path: str, probe):
+    """
+    The decompressed content / ZIP member of `probe` copied to a temporary
+    file (with the inner extension), for the formats in _SEEKABLE_FORMATS.
+    """
+    fd, tmp = tempfile.mkstemp(suffix=os.path.splitext(probe.name)[1])
+    try:
+        with os.fdopen(fd, 'wb') as out, \
+                open_content(path, probe.compression, probe.member) as src:
+            shutil.copyfileobj(src, out, 1024 * 1024)
+        yield tmp
+    finally:
+        os.remove(tmp)
+
+
+def _read_bundle(path: str, options=None) -> pd.DataFrame:
+    """Every member of a ZIP archive, tagged with SourceFile and stacked."""
+    members = bundle_members(path)
+    if len(members) == 1:
+        return read_file(path, member=members[0], options=options)
+    dfs = []
+    for member in members:
+        df = read_file(path, member=member, options=options)
+        if not df.empty:
+            df['SourceFile'] = member
+            dfs.append(df)
+    return pd.concat(dfs, ignore_index=True) if dfs else pd.DataFrame()
+
+
+def read_file(path: str, member: str = None,
+              options=None) -> pd.DataFrame:
+    """
+    Robust reader:
+    - OLE .xls: built-in BIFF reader, else xlrd==1.2.0, else Excel COM.
+    - ZIP .xlsx/.xlsm/.xlsb: read via pandas/openpyxl/pyxlsb.
+    - Parquet, Feather / Arrow IPC: pyarrow.
+    - JSON arrays of records and JSON Lines: parsed incrementally; other
+      JSON layouts: pandas. XML: iterparse (see iter_xml_chunks).
+    - HTML: parsed once; only the selected tables become frames (see
+      read_html_tables), several tagged with a Table column.
+    - .tab/.tsv (and tabbed .txt): strict handler.
+    - Other delimited text: delimiter guess, read as strings, trim.
+    - gzip/bz2/xz/zstd files (found by their magic bytes): the content is
+      decompressed as it is parsed, and read as above.
+    - ZIP archives of such files: each member (or just `member`).
+    The format, encoding and delimiter come from one cached probe_file().
+    `options` (ConvertOptions) carries settings such as the memory cap of
+    parallel sheet parsing. Raises ConversionError when the file cannot be
+    parsed.
+    """
+    probe = probe_file(path, member=member)
+    ext = os.path.splitext(probe.name)[1].lower()
+    fmt = probe.format
+    max_memory_mb = option(options, "max_memory_mb")
+
+    if fmt == 'zip':
+        return _read_bundle(path, options)
+    if fmt in _SEEKABLE_FORMATS and (probe.compression or probe.member):
+        with _extracted(path, probe) as tmp:
+            return read_file(tmp, options=options)
+
+    # Legacy Excel (.xls / OLE): built-in BIFF reader, then xlrd, then COM
+    if fmt == 'xls':
+        try:
+            return concat_sheets(read_xls_builtin(path))
+        except ValueError:
+            pass  # encrypted, pre-BIFF5 or malformed: xlrd / Excel may cope
+        try:
+            return _read_xls_with_xlrd(path, max_memory_mb)
+        except ImportError:
+            try:
+                return _read_xls_via_excel_com(path)
+            except Exception as com_err:
+                raise ConversionError(
+                    "Unable to read legacy .xls",
+                    "This file is a true Excel 97–2003 binary workbook (.xls).\n\n"
+                    "To read it, please install:\n pip install \"xlrd==1.2.0\"\n"
+                    "—or— run on Windows with Excel installed and install:\n pip install pywin32\n\n"
+                    f"Technical note: COM fallback error was:\n{com_err}"
+                ) from com_err
+
+    # Modern ZIP-based Excel
+    if fmt == 'xlsx':
+        tried_engines = ['openpyxl', 'pyxlsb', None]
+        for engine in tried_engines:
+            try:
+                xls = pd.ExcelFile(
+                    path, engine=engine) if engine else pd.ExcelFile(path)
+                # Sheets of a large workbook are parsed in parallel
+                df = concat_sheets(parse_sheets(
+                    path, xls.sheet_names, engine=engine, xls=xls,
+                    max_memory_mb=max_memory_mb))
+                if not df.empty:
+                    return df
+            except Exception:
+                continue
+        raise ConversionError("Excel Read Error",
+                              "Could not read the modern Excel file.")
+
+    # Columnar (Parquet, Feather / Arrow IPC)
+    if fmt in ('parquet', 'arrow'):
+        return read_columnar(path, fmt)
+
+    # HTML
+    if fmt == 'html':
+        try:
+            tables = read_html_tables(path, member,
+                                      html_table_selector(options))
+            if len(tables) == 1:
+                return tables[0][1]
+            dfs = []
+            for index, df in tables:
+                if not df.empty:
+                    df['Table'] = index
+                    dfs.append(df)
+            return pd.concat(dfs, ignore_index=True) if dfs \
+                else pd.DataFrame()
+        except Exception as e:
+            raise ConversionError(
+                'HTML Read Error', f'Could not read HTML tables: {e}') from e
+
+    # JSON / JSON Lines
+    if fmt in ('json', 'jsonl'):
+        try:
+            chunks = list(iter_json_chunks(path, DEFAULT_CHUNKSIZE, member))
+            if len(chunks) == 1:
+                return chunks[0]
+            return pd.concat(chunks, ignore_index=True) if chunks \
+                else pd.DataFrame()
+        except Exception as e:
+            raise ConversionError("JSON Parsing Failed", str(e),
+                                  warning=True) from e
+
+    # XML
+    if fmt == 'xml':
+        try:
+            chunks = list(iter_xml_chunks(path, DEFAULT_CHUNKSIZE, member,
+                                          xml_row_path(options)))
+            if len(chunks) == 1:
+                return chunks[0]
+            return pd.concat(chunks, ignore_index=True)
+        except Exception as e:
+            raise ConversionError("XML Parsing Failed", str(e),
+                                  warning=True) from e
+
+    # TAB / TSV (and TXT that looks tabbed)
+    if fmt == 'tab':
+        try:
+            return read_tab_strict(path, encoding=probe.encoding,
+                                   member=member)
+        except Exception as e:
+            hint = ("Could not parse tabbed .TXT" if ext == '.txt'
+                    else "Could not parse as .TAB/.TSV")
+            raise ConversionError("TAB Parsing Failed", f"{hint}:\n{e}",
+                                  warning=True) from e
+
+    # Other delimited text
+    try:
+        enc = probe.encoding
+        sep = probe.delimiter or ','
+        try:
+            with _open_source(path, probe) as src:
+                df = pd.read_csv(src, sep=sep, engine='python',
+                                 dtype=str, na_filter=False, encoding=enc)
+        except UnicodeDecodeError:
+            if enc != "utf-8":
+                raise
+            enc = "latin1"
+            with _open_source(path, probe) as src:
+                df = pd.read_csv(src, sep=sep, engine='python',
+                                 dtype=str, na_filter=False, encoding=enc)
+        df = _trim_frame(df)
+        df.attrs["encoding"] = enc
+        return df
+    except Exception as e:
+        raise ConversionError(
+            "Parsing Failed",
+            f"Could not parse as a delimited text file.\n{e}",
+            warning=True) from e
+
+
+def iter_file_chunks(path: str, chunksize=DEFAULT_CHUNKSIZE, sheet=None,
+                     header=0, member=None, options=None):
+    """
+    Yield `path` as a sequence of DataFrames.
+    Delimited text (.csv/.tsv/.tab/.txt), .xlsx/.xlsm and legacy .xls
+    workbooks, JSON / JSON Lines, XML, Parquet and Arrow IPC files are
+    streamed in bounded row chunks (Parquet one row group at a time); every
+    other format (or chunksize=None) is yielded whole via read_file. With
+    `sheet`, only that worksheet of a workbook is read (no SheetName
+    column), only that member of a ZIP archive, or only the table with
+    that index of an HTML document. `header` applies to
+    streamed workbooks (see iter_xlsx_sheet). Compressed text is
+    decompressed chunk by chunk. `options` is passed on to read_file.
+    """
+    probe = probe_file(path, member=member)
+    ext = os.path.splitext(probe.name)[1].lower()
+    if probe.format == 'zip':
+        if sheet is None:
+            yield read_file(path, options=options)
+        else:
+            yield from iter_file_chunks(path, chunksize, header=header,
+                                        member=sheet, options=options)
+        return
+    if probe.format in _SEEKABLE_FORMATS and (probe.compression
+                                              or probe.member):
+        with _extracted(path, probe) as tmp:
+            yield from iter_file_chunks(tmp, chunksize, sheet, header,
+                                        options=options)
+        return
+    if probe.format == 'xlsx' and ext in STREAMABLE_EXCEL_EXTS and chunksize:
+        yield from _iter_xlsx_file(path, chunksize, sheet, header)
+        return
+    if probe.format == 'xls' and chunksize:
+        yield from _iter_xls_file(path, chunksize, sheet, header, options)
+        return
+    if probe.format in ('parquet', 'arrow') and chunksize and sheet is None:
+        yield from iter_columnar_chunks(path, probe.format, chunksize)
+        return
+    if probe.format in ('json', 'jsonl') and chunksize and sheet is None:
+        try:
+            yield from iter_json_chunks(path, chunksize, member)
+        except Exception as e:
+            raise ConversionError("JSON Parsing Failed", str(e),
+                                  warning=True) from e
+        return
+    if probe.format == 'xml' and chunksize and sheet is None:
+        try:
+            yield from iter_xml_chunks(path, chunksize, member,
+                                       xml_row_path(options))
+        except Exception as e:
+            raise ConversionError("XML Parsing Failed", str(e),
+                                  warning=True) from e
+        return
+    if probe.format == 'html' and sheet is not None:
+        try:
+            yield read_html_table(path, sheet, member)
+        except Exception as e:
+            message = f'Could not read HTML table {sheet}: {e}'
+            raise ConversionError('HTML Read Error', message) from e
+        return
+    if sheet is not None:
+        raise ValueError(f"Cannot stream sheet {sheet!r} of {path}")
+    if (not chunksize or ext not in STREAMABLE_EXTS
+            or probe.format not in ('tab', 'delimited')):
+        yield read_file(path, member, options)
+        return
+
+    if probe.format == 'tab':
+        chunks = iter_tab_strict(path, chunksize, probe.encoding, member)
+        title = "TAB Parsing Failed"
+        hint = ("Could not parse tabbed .TXT:\n" if ext == '.txt'
+                else "Could not parse as .TAB/.TSV:\n")
+    else:
+        chunks = iter_delimited(path, chunksize, member)
+        title = "Parsing Failed"
+        hint = "Could not parse as a delimited text file.\n"
+    try:
+        yield from chunks
+    except ConversionError:
+        raise
+    except Exception as e:
+        raise ConversionError(title, f"{hint}{e}", warning=True) from e
+
+
+def _iter_xlsx_file(path, chunksize, sheet, header):
+    if sheet is None:
+        chunks = iter_xlsx_chunks(path, chunksize, header)
+    else:
+        chunks = iter_xlsx_sheet(path, sheet, chunksize, header)
+    any_rows = False
+    try:
+        for chunk in chunks:
+            any_rows = True
+            yield chunk
+    except Exception as e:
+        message = "Could not read the modern Excel file."
+        if sheet is not None:
+            message = f"Could not read sheet {sheet!r}:\n{e}"
+        raise ConversionError("Excel Read Error", message) from e
+    if not any_rows and sheet is None:
+        raise ConversionError("Excel Read Error",
+                              "Could not read the modern Excel file.")
+
+
+def _iter_xls_file(path, chunksize, sheet, header, options=None):
+    try:
+        book = XlsBook(path)
+    except (OSError, ValueError):
+        # Not readable by the built-in reader (encrypted, BIFF2-4...):
+        # whole sheets through xlrd / Excel instead
+        if sheet is None:
+            yield read_file(path, options=options)
+            return
+        from .xls import read_xls_selected_sheets
+        for _, df in read_xls_selected_sheets(path, [sheet]):
+            yield df
+        return
+    with book:
+        if sheet is None:
+            chunks = _xls_book_chunks(book, chunksize, header)
+        else:
+            chunks = _xls_book_sheet(book, sheet, chunksize, header)
+        any_rows = False
+        try:
+            for chunk in chunks:
+                any_rows = True
+                yield chunk
+        except Exception as e:
+            message = "Could not read the legacy .xls workbook."
+            if sheet is not None:
+                message = f"Could not read sheet {sheet!r}:\n{e}"
+            raise ConversionError("Excel Read Error", message) from e
+    if not any_rows and sheet is None:
+        raise ConversionError("Excel Read Error",
+                              "The legacy .xls workbook has no data.")
@@ -0,0 +1,162 @@
+# file_converter/scan.py
+
+
+import os
+import zipfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+from .biff import OleFile
+from .compressed import COMPRESSION_EXTS, strip_compression_ext, zip_members
+from .detect import SUPPORTED_FORMATS, OLE_SIGNATURE, ZIP_SIGNATURE
+
+# -------------------------------
+# Input folder scanning
+# -------------------------------
+
+# Extensions offered in the file dialogs, plus the other workbook types
+# the readers understand
+INPUT_EXTS = frozenset(
+    os.path.splitext(pat)[1].lower()
+    for _, patterns in SUPPORTED_FORMATS for pat in patterns.split(';')
+) | {'.xlsm', '.xlsb'}
+
+# Files with these (or no) extensions are checked for a workbook signature;
+# anything else without a supported extension is skipped unopened
+SNIFF_EXTS = frozenset(('', '.dat', '.bin', '.tmp'))
+
+# What a file inside a ZIP archive may be to be converted: any plain input
+# (not a further archive or compressed file)
+MEMBER_EXTS = INPUT_EXTS - set(COMPRESSION_EXTS) - {'.zip'}
+
+SCAN_BATCH_SIZE = 500
+
+
+def _is_workbook_container(path: str) -> bool:
+    """True for an OLE2 workbook or a ZIP with an Excel workbook part."""
+    try:
+        with open(path, 'rb') as fh:
+            sig = fh.read(8)
+            fh.seek(0)
+            if sig.startswith(OLE_SIGNATURE):
+                ole = OleFile(fh)
+                return ole.exists('Workbook') or ole.exists('Book')
+            if sig.startswith(ZIP_SIGNATURE):
+                with zipfile.ZipFile(fh) as zf:
+                    names = set(zf.namelist())
+                    return ('xl/workbook.xml' in names
+                            or 'xl/workbook.bin' in names)
+    except Exception:
+        pass  # unreadable or not a workbook
+    return False
+
+
+def is_supported_input(path: str) -> bool:
+    """
+    True when `path` has a supported extension, or has no / a generic
+    extension (SNIFF_EXTS) and is a workbook by signature, e.g. an .xls
+    saved without its extension. Only those sniffed files are opened.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext in COMPRESSION_EXTS:
+        # statement.tsv.gz: judged by what is inside ('.tar.gz' is not)
+        inner = os.path.splitext(strip_compression_ext(path))[1].lower()
+        return inner in MEMBER_EXTS or inner in SNIFF_EXTS
+    if ext in INPUT_EXTS:
+        return True
+    return ext in SNIFF_EXTS and _is_workbook_container(path)
+
+
+def bundle_members(path: str) -> list[str]:
+    """Members of the ZIP archive `path` that convert as inputs of their own."""
+    return [m for m in zip_members(path)
+            if os.path.splitext(m)[1].lower() in MEMBER_EXTS]
+
+
+def _scan_dir(path: str, supported_only: bool, skip_names) -> tuple:
+    """(files, subfolders) directly inside `path`, each sorted by name."""
+    files, dirs = [], []
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        dirs.append(entry.path)
+                    elif entry.is_file() and entry.name not in skip_names:
+                        if not supported_only or is_supported_input(entry.path):
+                            files.append(entry.path)
+                except OSError:
+                    continue
+    except OSError:
+        pass
+    files.sort()
+    dirs.sort()
+    return files, dirs
+
+
+class InputScanner:
+    """
+    Expand files and folders into input files, in batches of up to
+    `batch_size`. Folders are listed with os.scandir on a pool of `jobs`
+    threads (default: min(8, CPUs + 4)), so deep trees on slow or network
+    drives are walked concurrently; batches therefore come in completion
+    order, not sorted. Each path is yielded once across every scan() call
+    (see `seen`). With supported_only, files are filtered with
+    is_supported_input. Set `cancel` (a threading.Event) to stop early.
+    """
+
+    def __init__(self, supported_only: bool = True, jobs: int = None,
+                 batch_size: int = SCAN_BATCH_SIZE, skip_names=()):
+        self.supported_only = supported_only
+        self.jobs = jobs or min(8, (os.cpu_count() or 1) + 4)
+        self.batch_size = batch_size
+        self.skip_names = frozenset(skip_names)
+        self.seen = set()
+        self.cancel = threading.Event()
+
+    def _key(self, path: str) -> str:
+        return os.path.normcase(os.path.abspath(path))
+
+    def _take(self, paths) -> list:
+        new = []
+        for p in paths:
+            key = self._key(p)
+            if key not in self.seen:
+                self.seen.add(key)
+                new.append(p)
+        return new
+
+    def forget(self):
+        """Clear the index so previously yielded paths are yielded again."""
+        self.seen.clear()
+
+    def scan(self, paths):
+        """Yield lists of new input files found under `paths`."""
+        batch = []
+        folders = []
+        for path in paths:
+            if os.path.isfile(path):
+                if not self.supported_only or is_supported_input(path):
+                    batch.extend(self._take([path]))
+            elif os.path.isdir(path):
+                folders.append(path)
+        if folders:
+            with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+                pending = {pool.submit(_scan_dir, d, self.supported_only,
+                                       self.skip_names) for d in folders}
+                while pending and not self.cancel.is_set():
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for fut in done:
+                        files, dirs = fut.result()
+                        for d in dirs:
+                            pending.add(pool.submit(
+                                _scan_dir, d, self.supported_only,
+                                self.skip_names))
+                        batch.extend(self._take(files))
+                    while len(batch) >= self.batch_size:
+                        yield batch[:self.batch_size]
+                        batch = batch[self.batch_size:]
+                for fut in pending:
+                    fut.cancel()
+        if batch and not self.cancel.is_set():
+            yield batch
@@ -0,0 +1,80 @@
+# file_converter/sheet_rules.py
+
+
+import re
+import json
+from dataclasses import dataclass, asdict, fields
+
+# -------------------------------
+# Rule-based sheet selection
+# -------------------------------
+
+
+@dataclass
+class SheetRules:
+    """
+    Which sheets of a workbook to convert, decided from its metadata alone
+    (WorkbookInfo), so thousands of workbooks can be selected without
+    opening them. include/exclude are regular expressions searched in the
+    sheet name; skip_empty drops sheets recorded as having at most one row
+    (nothing below a header); first_only keeps the first sheet that passes
+    the other rules. Saved as JSON for headless runs (--sheet-rules).
+    """
+    include: str = None
+    exclude: str = None
+    first_only: bool = False
+    skip_hidden: bool = False
+    skip_empty: bool = False
+
+    def __post_init__(self):
+        for pattern in (self.include, self.exclude):
+            if pattern:
+                try:
+                    re.compile(pattern)
+                except re.error as e:
+                    raise ValueError(f"Invalid sheet pattern {pattern!r}: {e}")
+
+    def select(self, info) -> list[str]:
+        """The sheets of `info` (a WorkbookInfo) these rules keep, in order."""
+        include = re.compile(self.include) if self.include else None
+        exclude = re.compile(self.exclude) if self.exclude else None
+        selected = []
+        for sheet in info.sheets:
+            if include and not include.search(sheet):
+                continue
+            if exclude and exclude.search(sheet):
+                continue
+            if self.skip_hidden and info.states.get(sheet, 'visible') != 'visible':
+                continue
+            rows = info.rows.get(sheet)
+            if self.skip_empty and rows is not None and rows <= 1:
+                continue
+            selected.append(sheet)
+            if self.first_only:
+                break
+        return selected
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "SheetRules":
+        known = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in data.items() if k in known})
+
+
+def save_sheet_rules(rules: SheetRules, path: str):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(rules.to_dict(), f, indent=2)
+
+
+def load_sheet_rules(path: str) -> SheetRules:
+    """Read rules saved by save_sheet_rules; ValueError if malformed."""
+    with open(path, encoding='utf-8') as f:
+        try:
+            data = json.load(f)
+        except ValueError as e:
+            raise ValueError(f"Invalid sheet rules file {path}: {e}") from e
+    if not isinstance(data, dict):
+        raise ValueError(f"Invalid sheet rules file {path}")
+    return SheetRules.from_dict(data)
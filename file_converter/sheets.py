@@ -0,0 +1,234 @@
+# file_converter/sheets.py
+
+
+import re
+import struct
+import zipfile
+import posixpath
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass
+
+from .biff import OleFile, open_workbook_stream, read_boundsheets, read_dimensions
+from .detect import OLE_SIGNATURE, ZIP_SIGNATURE
+
+# -------------------------------
+# Fast sheet listing (workbook manifest only)
+# -------------------------------
+
+# How much of a sheet part to scan for its <dimension>/BrtWsDim record
+DIMENSION_SCAN_BYTES = 16 * 1024
+
+_NS_MAIN = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+_NS_REL = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+_NS_PKG_REL = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+_DIMENSION_RE = re.compile(rb'<(?:\w+:)?dimension\b[^>]*?\bref="([^"]+)"')
+_CELL_REF_RE = re.compile(r'([A-Z]+)(\d+)$')
+
+
+@dataclass(frozen=True)
+class SheetEntry:
+    """
+    One sheet as recorded in the workbook manifest. dimension ('A1:F900')
+    and rows are None when the file does not record them.
+    """
+    name: str
+    state: str = 'visible'  # 'visible', 'hidden' or 'veryHidden'
+    dimension: str = None
+    rows: int = None
+
+
+def _col_name(idx: int) -> str:
+    name = ''
+    idx += 1
+    while idx:
+        idx, rem = divmod(idx - 1, 26)
+        name = chr(65 + rem) + name
+    return name
+
+
+def _ref_rows(ref: str):
+    """Last row number of an 'A1:F900' style reference, or None."""
+    m = _CELL_REF_RE.search(ref.split(':')[-1].replace('$', '').upper())
+    return int(m.group(2)) if m else None
+
+
+def _dimension_entry(name, state, first_row, last_row, first_col, last_col):
+    """SheetEntry from 0-based, end-exclusive row/column bounds."""
+    if last_row <= first_row or last_col <= first_col:
+        return SheetEntry(name, state, None, 0)
+    ref = (f"{_col_name(first_col)}{first_row + 1}:"
+           f"{_col_name(last_col - 1)}{last_row}")
+    return SheetEntry(name, state, ref, last_row)
+
+
+def _workbook_targets(zf: zipfile.ZipFile, rels_name: str) -> dict:
+    """r:id -> part name from a workbook .rels part."""
+    try:
+        root = ET.fromstring(zf.read(rels_name))
+    except KeyError:
+        return {}
+    base = posixpath.dirname(posixpath.dirname(rels_name))
+    targets = {}
+    for rel in root.iter(_NS_PKG_REL + 'Relationship'):
+        target = rel.get('Target', '')
+        if target.startswith('/'):
+            targets[rel.get('Id')] = target.lstrip('/')
+        else:
+            targets[rel.get('Id')] = posixpath.normpath(
+                posixpath.join(base, target))
+    return targets
+
+
+def _read_part_head(zf: zipfile.ZipFile, name: str, n: int) -> bytes:
+    with zf.open(name) as f:
+        return f.read(n)
+
+
+def _list_xlsx(zf: zipfile.ZipFile, with_dimensions: bool) -> list:
+    targets = _workbook_targets(zf, 'xl/_rels/workbook.xml.rels') \
+        if with_dimensions else {}
+    entries = []
+    # iterparse stops at </sheets>; definedNames etc. are never parsed
+    with zf.open('xl/workbook.xml') as f:
+        for _, el in ET.iterparse(f):
+            if el.tag == _NS_MAIN + 'sheet':
+                name = el.get('name')
+                state = el.get('state', 'visible')
+                dim = rows = None
+                part = targets.get(el.get(_NS_REL + 'id'))
+                if part:
+                    try:
+                        head = _read_part_head(zf, part, DIMENSION_SCAN_BYTES)
+                        m = _DIMENSION_RE.search(head)
+                        if m:
+                            dim = m.group(1).decode('ascii', 'replace')
+                            rows = _ref_rows(dim)
+                    except KeyError:
+                        pass
+                entries.append(SheetEntry(name, state, dim, rows))
+            elif el.tag == _NS_MAIN + 'sheets':
+                break
+    return entries
+
+# -------------------------------
+# .xlsb (BIFF12) records
+# -------------------------------
+_BRT_BUNDLE_SH = 0x9C
+_BRT_BEGIN_SHEET_DATA = 0x91
+_BRT_WS_DIM = 0x94
+_BRT_END_BUNDLE_SHS = 0x90
+
+_SHEET_STATES12 = {0: 'visible', 1: 'hidden', 2: 'veryHidden'}
+
+
+def _iter_biff12(f):
+    """Yield (record type, payload) from a BIFF12 part (variable-length header)."""
+    def varint(max_bytes):
+        value = 0
+        for i in range(max_bytes):
+            b = f.read(1)
+            if not b:
+                return None
+            value |= (b[0] & 0x7F) << (7 * i)
+            if not b[0] & 0x80:
+                break
+        return value
+
+    while True:
+        rtype = varint(2)
+        if rtype is None:
+            return
+        size = varint(4)
+        if size is None:
+            return
+        yield rtype, f.read(size)
+
+
+def _wide_string(data: bytes, off: int) -> tuple:
+    n = struct.unpack_from('<I', data, off)[0]
+    end = off + 4 + 2 * n
+    return data[off + 4:end].decode('utf-16-le', 'replace'), end
+
+
+def _list_xlsb(zf: zipfile.ZipFile, with_dimensions: bool) -> list:
+    targets = _workbook_targets(zf, 'xl/_rels/workbook.bin.rels') \
+        if with_dimensions else {}
+    entries = []
+    with zf.open('xl/workbook.bin') as f:
+        for rtype, data in _iter_biff12(f):
+            if rtype == _BRT_BUNDLE_SH:
+                state = _SHEET_STATES12.get(
+                    struct.unpack_from('<I', data)[0], 'visible')
+                rel_id, off = _wide_string(data, 8)
+                name, _ = _wide_string(data, off)
+                entry = SheetEntry(name, state)
+                part = targets.get(rel_id)
+                if part:
+                    try:
+                        entry = _xlsb_dimension(zf, part, entry)
+                    except KeyError:
+                        pass
+                entries.append(entry)
+            elif rtype == _BRT_END_BUNDLE_SHS:
+                break
+    return entries
+
+
+def _xlsb_dimension(zf, part, entry):
+    with zf.open(part) as f:
+        for rtype, data in _iter_biff12(f):
+            if rtype == _BRT_WS_DIM:
+                r1, r2, c1, c2 = struct.unpack_from('<4I', data)
+                return _dimension_entry(entry.name, entry.state,
+                                        r1, r2 + 1, c1, c2 + 1)
+            if rtype == _BRT_BEGIN_SHEET_DATA:
+                break
+    return entry
+
+# -------------------------------
+# .xls (BIFF5/8 in OLE2)
+# -------------------------------
+
+
+def _list_xls(fh, with_dimensions: bool) -> list:
+    stream, biff = open_workbook_stream(OleFile(fh))
+    entries = []
+    for name, state, kind, offset in read_boundsheets(stream, biff):
+        if kind != 0:
+            continue  # charts / VB modules: not listed by xlrd either
+        entry = SheetEntry(name, state)
+        if with_dimensions:
+            dims = read_dimensions(stream, offset, biff)
+            if dims is not None:
+                entry = _dimension_entry(name, state, dims[0], dims[1],
+                                         dims[2], dims[3])
+        entries.append(entry)
+    return entries
+
+
+def list_sheets(path: str, with_dimensions: bool = True) -> list[SheetEntry]:
+    """
+    List a workbook's sheets from its manifest only: xl/workbook.xml (or
+    xl/workbook.bin) inside the ZIP for .xlsx/.xlsm/.xlsb, the BOUNDSHEET
+    records for legacy .xls. With with_dimensions, each sheet's recorded
+    <dimension> (BrtWsDim / DIMENSIONS) is read from the start of the sheet,
+    never its cell data. Raises ValueError when the file can't be listed
+    this way; callers fall back to opening the workbook.
+    """
+    with open(path, 'rb') as fh:
+        sig = fh.read(8)
+        fh.seek(0)
+        try:
+            if sig.startswith(OLE_SIGNATURE):
+                return _list_xls(fh, with_dimensions)
+            if sig.startswith(ZIP_SIGNATURE):
+                with zipfile.ZipFile(fh) as zf:
+                    names = set(zf.namelist())
+                    if 'xl/workbook.xml' in names:
+                        return _list_xlsx(zf, with_dimensions)
+                    if 'xl/workbook.bin' in names:
+                        return _list_xlsb(zf, with_dimensions)
+        except (ValueError, KeyError, IndexError, struct.error,
+                zipfile.BadZipFile, ET.ParseError) as e:
+            raise ValueError(f"Unable to read workbook manifest: {e}") from e
+    raise ValueError("Not a recognised workbook container")
@@ -0,0 +1,278 @@
+# file_converter/workbook.py
+
+
+import os
+import json
+import time
+import sqlite3
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass, field, asdict
+
+import pandas as pd
+
+from .detect import probe_file
+from .sheets import list_sheets
+from .xls import default_legacy_cache, get_xls_sheet_names
+
+# -------------------------------
+# Workbook metadata
+# -------------------------------
+
+
+@dataclass
+class WorkbookInfo:
+    """
+    Sheet-level metadata for one workbook version (path, size, mtime_ns).
+    rows/dimensions map sheet name -> value where the file records them
+    (e.g. the <dimension> of an .xlsx sheet); None when unknown. states maps
+    sheet name -> 'visible', 'hidden' or 'veryHidden'.
+    """
+    path: str
+    size: int
+    mtime_ns: int
+    sheets: list = field(default_factory=list)
+    rows: dict = field(default_factory=dict)
+    dimensions: dict = field(default_factory=dict)
+    states: dict = field(default_factory=dict)
+
+
+def _sheet_dimensions(book) -> tuple[dict, dict]:
+    """Row counts and dimension refs from an openpyxl (read-only) workbook."""
+    rows, dims = {}, {}
+    for ws in getattr(book, "worksheets", []):
+        try:
+            dims[ws.title] = ws.calculate_dimension()
+            rows[ws.title] = ws.max_row
+        except Exception:
+            dims[ws.title] = None
+            rows[ws.title] = None
+    return rows, dims
+
+
+def _read_workbook_info(path: str, st, legacy=None) -> tuple:
+    """
+    (WorkbookInfo, open pd.ExcelFile or None). The workbook manifest is read
+    first (list_sheets); the workbook is only opened when that fails, a
+    legacy .xls through its intermediate .xlsx from `legacy`.
+    """
+    info = WorkbookInfo(path=os.path.abspath(path), size=st.st_size,
+                        mtime_ns=st.st_mtime_ns)
+    try:
+        entries = list_sheets(path)
+    except (OSError, ValueError):
+        entries = None
+    if entries:
+        info.sheets = [e.name for e in entries]
+        info.rows = {e.name: e.rows for e in entries}
+        info.dimensions = {e.name: e.dimension for e in entries}
+        info.states = {e.name: e.state for e in entries}
+        return info, None
+    if probe_file(path).format == "xls":
+        info.sheets = list(get_xls_sheet_names(path, legacy))
+        return info, None
+    xls = pd.ExcelFile(path)
+    info.sheets = list(xls.sheet_names)
+    info.rows, info.dimensions = _sheet_dimensions(xls.book)
+    return info, xls
+
+# -------------------------------
+# Persistent metadata store
+# -------------------------------
+
+
+def default_cache_dir() -> str:
+    """FILE_CONVERTER_CACHE_DIR, else the per-user local cache folder."""
+    override = os.environ.get("FILE_CONVERTER_CACHE_DIR")
+    if override:
+        return override
+    base = os.environ.get("LOCALAPPDATA") or os.path.join(
+        os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "file_converter")
+
+
+class WorkbookMetaCache:
+    """
+    Small on-disk (SQLite) store of WorkbookInfo keyed by absolute path and
+    validated against size/mtime, with least-recently-used eviction beyond
+    `max_entries`. Safe to share between threads and processes. If the
+    store cannot be opened the cache silently stays empty.
+    Lookups are read-only: an entry's last_used is only rewritten once it
+    is older than TOUCH_INTERVAL, so LRU order is kept to that precision.
+    """
+    TOUCH_INTERVAL = 3600.0  # seconds
+
+    def __init__(self, db_path: str = None, max_entries: int = 2000):
+        self.db_path = db_path or os.path.join(
+            default_cache_dir(), "workbook_meta.sqlite")
+        self.max_entries = max_entries
+        self._ready = False
+
+    @contextmanager
+    def _db(self):
+        """Connection for one transaction (committed on success), then closed."""
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        try:
+            with conn:
+                if not self._ready:
+                    conn.execute(
+                        "CREATE TABLE IF NOT EXISTS workbooks ("
+                        " path TEXT PRIMARY KEY, size INTEGER,"
+                        " mtime_ns INTEGER, info TEXT, last_used REAL)")
+                    self._ready = True
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, path: str, st=None):
+        st = st or os.stat(path)
+        key = os.path.abspath(path)
+        try:
+            with self._db() as conn:
+                row = conn.execute(
+                    "SELECT info, last_used FROM workbooks WHERE path=?"
+                    " AND size=? AND mtime_ns=?",
+                    (key, st.st_size, st.st_mtime_ns)).fetchone()
+                if row is None:
+                    return None
+                now = time.time()
+                if now - (row[1] or 0) > self.TOUCH_INTERVAL:
+                    conn.execute(
+                        "UPDATE workbooks SET last_used=? WHERE path=?",
+                        (now, key))
+            return WorkbookInfo(**json.loads(row[0]))
+        except Exception:
+            return None
+
+    def put(self, info: WorkbookInfo):
+        try:
+            with self._db() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO workbooks VALUES (?, ?, ?, ?, ?)",
+                    (info.path, info.size, info.mtime_ns,
+                     json.dumps(asdict(info)), time.time()))
+                conn.execute(
+                    "DELETE FROM workbooks WHERE path IN (SELECT path FROM"
+                    " workbooks ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,))
+        except Exception:
+            pass
+
+    def clear(self):
+        try:
+            with self._db() as conn:
+                conn.execute("DELETE FROM workbooks")
+        except Exception:
+            pass
+
+
+_default_cache = None
+
+
+def default_meta_cache() -> WorkbookMetaCache:
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = WorkbookMetaCache()
+    return _default_cache
+
+
+def get_workbook_info(path: str, cache: WorkbookMetaCache = None) -> WorkbookInfo:
+    """Sheet names/rows/dimensions for `path`, from the cache when unchanged."""
+    cache = cache or default_meta_cache()
+    st = os.stat(path)
+    info = cache.get(path, st)
+    if info is None:
+        info, xls = _read_workbook_info(path, st)
+        if xls is not None:
+            xls.close()
+        cache.put(info)
+    return info
+
+# -------------------------------
+# Per-run workbook session
+# -------------------------------
+
+
+class WorkbookSession:
+    """
+    One conversion run's view of its workbooks: metadata comes from the
+    shared cache, and each workbook is opened at most once, with the open
+    pd.ExcelFile reused for every sheet parsed from it. A legacy .xls the
+    built-in reader can't handle is converted once to an intermediate .xlsx
+    by `legacy` (a LegacyWorkbookCache; its backend is pluggable) and both
+    listed and read from that. At most `max_open` handles are kept; call
+    release() when done with a file, close() at the end of the run.
+    """
+
+    def __init__(self, cache: WorkbookMetaCache = None, max_open: int = 8,
+                 legacy=None):
+        self.cache = cache or default_meta_cache()
+        self.legacy = legacy or default_legacy_cache()
+        self.max_open = max_open
+        self._handles = OrderedDict()
+        self._lock = threading.Lock()
+
+    def info(self, path: str) -> WorkbookInfo:
+        st = os.stat(path)
+        info = self.cache.get(path, st)
+        if info is None:
+            info, xls = _read_workbook_info(path, st, self.legacy)
+            self.cache.put(info)
+            if xls is not None:
+                self._keep(path, xls)
+        return info
+
+    def excel_file(self, path: str) -> pd.ExcelFile:
+        with self._lock:
+            xls = self._handles.get(path)
+            if xls is not None:
+                self._handles.move_to_end(path)
+                return xls
+        if probe_file(path).format == "xls":
+            xls = pd.ExcelFile(self.legacy.xlsx_path(path), engine="openpyxl")
+        else:
+            xls = pd.ExcelFile(path)
+        self._keep(path, xls)
+        return xls
+
+    def needs_intermediate(self, path: str) -> bool:
+        """True for a legacy .xls the built-in reader can't open (e.g. BIFF2-4)."""
+        if probe_file(path).format != "xls":
+            return False
+        try:
+            list_sheets(path, False)
+            return False
+        except (OSError, ValueError):
+            return True
+
+    def _keep(self, path, xls):
+        with self._lock:
+            self._handles[path] = xls
+            self._handles.move_to_end(path)
+            while len(self._handles) > self.max_open:
+                _, old = self._handles.popitem(last=False)
+                old.close()
+
+    def release(self, path: str):
+        with self._lock:
+            xls = self._handles.pop(path, None)
+        if xls is not None:
+            xls.close()
+
+    def close(self):
+        with self._lock:
+            handles, self._handles = list(self._handles.values()), OrderedDict()
+        for xls in handles:
+            try:
+                xls.close()
+            except Exception:
+                pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
@@ -0,0 +1,614 @@
+# file_converter/writers.py
+
+
+import os
+
+import pandas as pd
+
+try:  # optional: Parquet / Feather / Arrow IPC output
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = ipc = pq = None
+
+from .compressed import (
+    COMPRESSION_EXTS, open_compressed_output, pandas_compression, text_output
+)
+from .errors import ConversionError
+from .options import option
+
+# -------------------------------
+# Writer
+# -------------------------------
+
+
+def _unshare(path):
+    """
+    Remove `path` if it is a hard link shared with another file (e.g. a
+    de-duplicated batch output), so rewriting it can't change the other.
+    """
+    try:
+        if os.stat(path).st_nlink > 1:
+            os.remove(path)
+    except OSError:
+        pass
+
+
+# Text formats that can also be written compressed: 'csv.gz', 'jsonl.zst'...
+COMPRESSIBLE_FORMATS = ('csv', 'tsv', 'tab', 'txt', 'json', 'jsonl', 'xml')
+
+
+def split_format(out_format) -> tuple:
+    """
+    'csv.gz' -> ('csv', 'gzip'); 'csv' -> ('csv', None). The suffix is one
+    of .gz, .bz2, .xz or .zst; ValueError if the format can't be compressed.
+    """
+    fmt, dot, suffix = out_format.rpartition('.')
+    compression = COMPRESSION_EXTS.get('.' + suffix.lower()) if dot else None
+    if compression is None:
+        return out_format, None
+    if fmt not in COMPRESSIBLE_FORMATS:
+        raise ValueError(f'Unsupported output format: {out_format}')
+    return fmt, compression
+
+
+def compression_level(options=None):
+    """The ConvertOptions compression_level (default
+    FILE_CONVERTER_COMPRESSION_LEVEL), or None for the codec's default."""
+    return option(options, "compression_level")
+
+
+def writer_options(out_format, options=None) -> dict:
+    """
+    Settings beyond the format name that change what `out_format` output
+    looks like (recorded by incremental runs): compression level, and the
+    columnar_options of Parquet / Arrow.
+    """
+    if split_format(out_format)[1] is not None:
+        return {"compression_level": compression_level(options)}
+    return columnar_options(out_format, options)
+
+
+def _open_text(path, out_format, newline, options=None):
+    """UTF-8 text output, through the compressor for 'csv.gz' etc."""
+    compression = split_format(out_format)[1]
+    if compression is None:
+        return open(path, 'w', encoding='utf-8', newline=newline)
+    fh = open_compressed_output(path, compression, compression_level(options))
+    return text_output(fh, newline)
+
+
+def write_file(df, path, out_format, options=None):
+    """
+    Write `df` to `path` as `out_format`. Empty frames are skipped.
+    Text formats may carry a compression suffix ('csv.gz', see split_format).
+    `options` (ConvertOptions) sets compression levels and Parquet / Arrow
+    settings. Raises ConversionError (or ValueError) when the output cannot
+    be written.
+    """
+    if df is None or df.empty:
+        return
+    fmt, compression = split_format(out_format)
+    compression = pandas_compression(compression, compression_level(options))
+    _unshare(path)
+    if fmt == 'xlsx':
+        # Write-only streaming workbook; splits sheets at Excel's row limit
+        with _XlsxChunkWriter(path, out_format) as writer:
+            writer.write(df)
+    elif fmt in COLUMNAR_FORMATS:
+        with open_chunk_writer(path, out_format, options) as writer:
+            writer.write(df)
+    elif fmt == 'xls':
+        try:
+            df.to_excel(path, index=False, engine='xlwt')
+        except Exception as e:
+            raise ConversionError(
+                "Write Error (.xls)",
+                "Writing .xls requires the 'xlwt' package.\n\n"
+                f"Error: {e}\n\n"
+                "Install with:\n pip install xlwt\n"
+                "Or choose 'xlsx' as output."
+            ) from e
+    elif fmt == 'csv':
+        df.to_csv(path, index=False, compression=compression)
+    elif fmt in ('tsv', 'tab', 'txt'):
+        df.to_csv(path, sep='\t', index=False, compression=compression)
+    elif fmt in ('json', 'jsonl', 'xml'):
+        # Serialised a slice at a time rather than as one huge string
+        with open_chunk_writer(path, out_format, options) as writer:
+            writer.write(df)
+    else:
+        raise ValueError('Unsupported output format')
+
+# -------------------------------
+# Chunked (streaming) writers
+# -------------------------------
+
+
+# Output formats that can be appended to chunk by chunk
+STREAMING_FORMATS = ('csv', 'tsv', 'tab', 'txt', 'json', 'jsonl', 'xml',
+                     'xlsx', 'parquet', 'feather', 'arrow')
+
+# Rows serialised per to_json / to_xml call, bounding the size of the string
+WRITE_SLICE_ROWS = 10_000
+
+
+class ChunkWriter:
+    """
+    Append DataFrame chunks to one output file.
+    The file is only created once the first non-empty chunk arrives, so an
+    empty input produces no output (same as write_file). Use as a context
+    manager: a clean exit closes the file, an exception aborts it and removes
+    the partial output. `options` is the ConvertOptions written with.
+    """
+
+    def __init__(self, path, out_format, options=None):
+        self.path = path
+        self.out_format = out_format
+        self.options = options
+        self.rows = 0
+        self._opened = False
+
+    def write(self, df):
+        if df is None or df.empty:
+            return
+        if not self._opened:
+            _unshare(self.path)
+            self._open(df)
+            self._opened = True
+        self._write(df)
+        self.rows += len(df)
+
+    def close(self):
+        if self._opened:
+            self._close()
+
+    def abort(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+        try:
+            if self._opened and os.path.exists(self.path):
+                os.remove(self.path)
+        except Exception:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
+
+    # Subclass hooks
+    def _open(self, first_df):
+        pass
+
+    def _write(self, df):
+        raise NotImplementedError
+
+    def _close(self):
+        pass
+
+
+class _DelimitedChunkWriter(ChunkWriter):
+    def __init__(self, path, out_format, sep, options=None):
+        super().__init__(path, out_format, options)
+        self.sep = sep
+        self._fh = None
+
+    def _open(self, first_df):
+        self._fh = _open_text(self.path, self.out_format, '', self.options)
+
+    def _write(self, df):
+        df.to_csv(self._fh, sep=self.sep, index=False,
+                  header=self.rows == 0, lineterminator=os.linesep)
+
+    def _close(self):
+        if self._fh:
+            self._fh.close()
+            self._fh = None
+
+
+class _JsonLinesChunkWriter(ChunkWriter):
+    def __init__(self, path, out_format, options=None):
+        super().__init__(path, out_format, options)
+        self._fh = None
+
+    def _open(self, first_df):
+        self._fh = _open_text(self.path, self.out_format, '\n', self.options)
+
+    def _write(self, df):
+        for start in range(0, len(df), WRITE_SLICE_ROWS):
+            part = df.iloc[start:start + WRITE_SLICE_ROWS]
+            text = part.to_json(orient='records', lines=True, force_ascii=False)
+            if text and not text.endswith('\n'):
+                text += '\n'
+            self._fh.write(text)
+
+    def _close(self):
+        if self._fh:
+            self._fh.close()
+            self._fh = None
+
+
+class _JsonArrayChunkWriter(_JsonLinesChunkWriter):
+    """
+    The records array write_file has always produced for 'json'
+    ([{...},{...}], as to_json(orient='records') writes it), appended
+    chunk by chunk instead of serialised from one frame.
+    """
+
+    def _open(self, first_df):
+        super()._open(first_df)
+        self._fh.write('[')
+
+    def _write(self, df):
+        for start in range(0, len(df), WRITE_SLICE_ROWS):
+            part = df.iloc[start:start + WRITE_SLICE_ROWS]
+            body = part.to_json(orient='records', force_ascii=False)[1:-1]
+            if self.rows or start:
+                body = ',' + body
+            self._fh.write(body)
+
+    def _close(self):
+        if self._fh:
+            self._fh.write(']')
+        super()._close()
+
+
+class _XmlChunkWriter(_JsonLinesChunkWriter):
+    """
+    The document df.to_xml(index=False) writes (a <data> root holding one
+    <row> element per row), with the <row> elements of each slice
+    appended as chunks arrive instead of built as one tree.
+    """
+    _HEAD = "<?xml version='1.0' encoding='utf-8'?>\n<data>"
+    _TAIL = "\n</data>"
+
+    def _open(self, first_df):
+        super()._open(first_df)
+        self._fh.write(self._HEAD)
+
+    def _write(self, df):
+        for start in range(0, len(df), WRITE_SLICE_ROWS):
+            part = df.iloc[start:start + WRITE_SLICE_ROWS]
+            try:
+                text = part.to_xml(index=False)
+            except Exception as e:
+                raise ValueError(f'Error writing XML: {e}')
+            body = text[len(self._HEAD):-len(self._TAIL)]
+            self._fh.write(body)
+
+    def _close(self):
+        if self._fh:
+            self._fh.write(self._TAIL + "\n")  # as to_xml(path) ends a file
+        super()._close()
+
+
+# Excel's hard limit on rows per worksheet (header row included)
+XLSX_MAX_ROWS = 1_048_576
+
+
+class _XlsxChunkWriter(ChunkWriter):
+    """
+    openpyxl write-only workbook: rows are streamed to disk, not kept as cells.
+    When a sheet reaches `max_rows` the rest rolls over to Sheet1_2,
+    Sheet1_3, ... each starting with the header row again.
+    start_sheet(name) sends the following chunks to a new sheet, so several
+    source sheets can share one workbook and one save; sheet_rows maps each
+    sheet name used to its data-row count.
+    """
+
+    def __init__(self, path, out_format, sheet_name="Sheet1",
+                 max_rows=XLSX_MAX_ROWS):
+        super().__init__(path, out_format)
+        self.sheet_name = sheet_name
+        self.max_rows = max_rows
+        self.sheets = 0
+        self.sheet_rows = {}
+        self._wb = None
+        self._ws = None
+        self._header = None
+        self._sheet_rows = 0
+        self._part = 0
+        self._pending = True  # next chunk starts a sheet
+
+    def start_sheet(self, name):
+        """Write the next non-empty chunk to a new sheet called `name`."""
+        self.sheet_name = name
+        self._pending = True
+
+    def _open(self, first_df):
+        from openpyxl import Workbook
+        self._wb = Workbook(write_only=True)
+
+    def _sheet_title(self, name):
+        """`name` made valid and unique: 31 chars max, no []:*?/\\."""
+        name = ''.join('_' if ch in '[]:*?/\\' else ch for ch in str(name))
+        name = name[:31] or 'Sheet'
+        taken = {t.lower() for t in self._wb.sheetnames}
+        base, n = name, 1
+        while name.lower() in taken:
+            n += 1
+            suffix = f"_{n}"
+            name = base[:31 - len(suffix)] + suffix
+        return name
+
+    def _new_sheet(self, header=None):
+        self._record_rows()
+        self.sheets += 1
+        if header is not None:
+            self._header = header
+            self._part = 1
+            name = self._sheet_title(self.sheet_name)
+        else:
+            # Row-limit rollover: Data, Data_2, Data_3, ...
+            self._part += 1
+            suffix = f"_{self._part}"
+            name = self._sheet_title(self.sheet_name[:31 - len(suffix)] + suffix)
+        self._ws = self._wb.create_sheet(name)
+        self._ws.append(self._header)
+        self._sheet_rows = 1
+
+    def _write(self, df):
+        if self._pending:
+            self._new_sheet([str(c) for c in df.columns])
+            self._pending = False
+        values = df.astype(object).where(df.notna(), None)
+        for row in values.itertuples(index=False, name=None):
+            if self._sheet_rows >= self.max_rows:
+                self._new_sheet()
+            self._ws.append(row)
+            self._sheet_rows += 1
+
+    def _record_rows(self):
+        if self._ws is not None:
+            self.sheet_rows[self._ws.title] = self._sheet_rows - 1
+
+    def _close(self):
+        if self._wb is not None:
+            self._record_rows()
+            self._wb.save(self.path)
+            self._wb = None
+
+
+# -------------------------------
+# Columnar writers (Parquet, Feather / Arrow IPC)
+# -------------------------------
+COLUMNAR_FORMATS = ('parquet', 'feather', 'arrow')
+
+PARQUET_COMPRESSIONS = ('snappy', 'zstd', 'gzip', 'brotli', 'lz4', 'none')
+DEFAULT_PARQUET_COMPRESSION = 'snappy'
+
+# Rows per Parquet row group / Arrow record batch. Chunks are buffered up
+# to this size, so it also bounds the writer's memory
+DEFAULT_ROW_GROUP_SIZE = 250_000
+
+# Feather v2 is the Arrow IPC file format, LZ4-compressed by default
+# (as pyarrow.feather writes it); .arrow files are left uncompressed
+_IPC_COMPRESSION = {'feather': 'lz4', 'arrow': None}
+
+
+def columnar_options(out_format, options=None) -> dict:
+    """
+    The compression and row-group size `out_format` is written with: the
+    ConvertOptions parquet_compression / row_group_size (defaults from
+    FILE_CONVERTER_PARQUET_COMPRESSION / FILE_CONVERTER_ROW_GROUP_SIZE),
+    else the built-in defaults. Empty for non-columnar formats.
+    """
+    if out_format not in COLUMNAR_FORMATS:
+        return {}
+    row_group_size = option(options, "row_group_size")
+    if out_format == 'parquet':
+        compression = (option(options, "parquet_compression")
+                       or DEFAULT_PARQUET_COMPRESSION).lower()
+        if compression not in PARQUET_COMPRESSIONS:
+            compression = DEFAULT_PARQUET_COMPRESSION
+    else:
+        compression = _IPC_COMPRESSION[out_format]
+    return {"compression": compression,
+            "row_group_size": row_group_size or DEFAULT_ROW_GROUP_SIZE}
+
+
+def _arrow_column(s):
+    """
+    One DataFrame column as an Arrow array. Object columns keep the type
+    Arrow infers for their values (time, date, bool, number, string) unless
+    the values are mixed (workbook cells holding numbers, text and dates)
+    or nested (JSON lists and objects); those are stored as strings.
+    """
+    if s.dtype != object:
+        return pa.array(s, from_pandas=True)
+    try:
+        arr = pa.array(s, from_pandas=True)
+        if not pa.types.is_nested(arr.type):
+            return arr
+    except (pa.ArrowException, OverflowError):
+        pass
+    return pa.array(s.astype(str).to_numpy(), mask=s.isna().to_numpy(),
+                    type=pa.string())
+
+
+class _ColumnarChunkWriter(ChunkWriter):
+    """
+    Parquet / Arrow IPC writer. Chunks are buffered and written out
+    `row_group_size` rows at a time, so a large conversion is written row
+    group by row group instead of from one in-memory frame. The schema is
+    fixed when the first row group is written: the chunks buffered up to
+    then are stacked first, so a column is typed from all of them (one
+    that is int in one chunk and float in another is written as double,
+    one empty in the first chunk gets the type of a later one; columns
+    empty throughout are strings). Later chunks are cast to the schema,
+    with columns they lack filled with nulls.
+    """
+
+    def __init__(self, path, out_format, options=None, compression=None,
+                 row_group_size=None):
+        super().__init__(path, out_format, options)
+        settings = columnar_options(out_format, options)
+        self.compression = compression or settings["compression"]
+        self.row_group_size = row_group_size or settings["row_group_size"]
+        self.schema = None
+        self._writer = None
+        self._buffer = []  # DataFrames until the schema is fixed, then tables
+        self._buffered = 0
+
+    def _write_error(self, message):
+        return ConversionError(f"Write Error (.{self.out_format})", message)
+
+    def _open(self, first_df):
+        if pa is None:
+            raise self._write_error(
+                f"Writing .{self.out_format} requires the 'pyarrow' package.\n\n"
+                "Install with:\n pip install pyarrow\n"
+                "Or choose 'xlsx' as output.")
+
+    def _table(self, df):
+        names = [str(c) for c in df.columns]
+        arrays = [_arrow_column(df.iloc[:, i]) for i in range(df.shape[1])]
+        return pa.Table.from_arrays(arrays, names=names)
+
+    def _fix_schema(self):
+        """Stack the buffered DataFrames and fix the schema from them."""
+        frames = self._buffer
+        df = frames[0] if len(frames) == 1 else pd.concat(frames,
+                                                          ignore_index=True)
+        table = self._table(df)
+        self.schema = pa.schema(
+            pa.field(f.name, pa.string()) if pa.types.is_null(f.type) else f
+            for f in table.schema)
+        self._writer = self._new_writer(self.schema)
+        self._buffer = [self._conform(table)]
+
+    def _conform(self, table):
+        """`table` with exactly the columns and types of self.schema."""
+        index = {}
+        for i, name in enumerate(table.column_names):
+            index.setdefault(name, i)
+        extra = [n for n in index if n not in self.schema.names]
+        if extra:
+            raise self._write_error(
+                f"Column {extra[0]!r} first appears after row {self.rows}; "
+                f".{self.out_format} files need every column in the first "
+                "row group. Convert with a larger row group size (or "
+                "--chunksize 0).")
+        columns = []
+        for field in self.schema:
+            if field.name not in index:
+                columns.append(pa.nulls(len(table), field.type))
+                continue
+            column = table.column(index[field.name])
+            try:
+                columns.append(column.cast(field.type))
+            except (pa.ArrowInvalid, pa.ArrowNotImplementedError) as e:
+                raise self._write_error(
+                    f"Column {field.name!r} changed type after row "
+                    f"{self.rows}: {e}") from e
+        return pa.Table.from_arrays(columns, schema=self.schema)
+
+    def _write(self, df):
+        if self.schema is None:
+            self._buffer.append(df)
+        else:
+            self._buffer.append(self._conform(self._table(df)))
+        self._buffered += len(df)
+        if self._buffered >= self.row_group_size:
+            self._flush(final=False)
+
+    def _flush(self, final):
+        """Write the buffer in full row groups (and the remainder if final)."""
+        if not self._buffer:
+            return
+        if self.schema is None:
+            self._fix_schema()
+        table = pa.concat_tables(self._buffer)
+        size = self.row_group_size
+        full = len(table) if final else len(table) - len(table) % size
+        if full:
+            self._write_table(table.slice(0, full))
+        rest = table.slice(full)
+        self._buffer = [rest] if len(rest) else []
+        self._buffered = len(rest)
+
+    def _close(self):
+        try:
+            self._flush(final=True)
+        finally:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+
+    # Format hooks
+    def _new_writer(self, schema):
+        raise NotImplementedError
+
+    def _write_table(self, table):
+        raise NotImplementedError
+
+
+class _ParquetChunkWriter(_ColumnarChunkWriter):
+    def _new_writer(self, schema):
+        compression = None if self.compression == 'none' else self.compression
+        return pq.ParquetWriter(self.path, schema, compression=compression)
+
+    def _write_table(self, table):
+        self._writer.write_table(table, row_group_size=self.row_group_size)
+
+
+class _ArrowIpcChunkWriter(_ColumnarChunkWriter):
+    """Arrow IPC file (random-access) format; Feather v2 is the same format."""
+
+    def _new_writer(self, schema):
+        options = ipc.IpcWriteOptions(compression=self.compression)
+        return ipc.new_file(self.path, schema, options=options)
+
+    def _write_table(self, table):
+        self._writer.write_table(table, max_chunksize=self.row_group_size)
+
+
+class _BufferedChunkWriter(ChunkWriter):
+    """Fallback for formats without an append mode: concat, then write_file."""
+
+    def __init__(self, path, out_format, options=None):
+        super().__init__(path, out_format, options)
+        self._chunks = []
+
+    def _write(self, df):
+        self._chunks.append(df)
+
+    def _close(self):
+        if self._chunks:
+            df = pd.concat(self._chunks, ignore_index=True)
+            self._chunks = []
+            write_file(df, self.path, self.out_format, self.options)
+
+
+def open_chunk_writer(path, out_format, options=None) -> ChunkWriter:
+    """Return a ChunkWriter for `out_format` (buffered for non-streaming
+    formats), writing with `options` (ConvertOptions)."""
+    fmt = split_format(out_format)[0]
+    if fmt == 'csv':
+        return _DelimitedChunkWriter(path, out_format, ',', options)
+    if fmt in ('tsv', 'tab', 'txt'):
+        return _DelimitedChunkWriter(path, out_format, '\t', options)
+    if fmt == 'jsonl':
+        return _JsonLinesChunkWriter(path, out_format, options)
+    if fmt == 'json':
+        return _JsonArrayChunkWriter(path, out_format, options)
+    if fmt == 'xml':
+        return _XmlChunkWriter(path, out_format, options)
+    if out_format == 'xlsx':
+        return _XlsxChunkWriter(path, out_format)
+    if out_format == 'parquet':
+        return _ParquetChunkWriter(path, out_format, options)
+    if out_format in ('feather', 'arrow'):
+        return _ArrowIpcChunkWriter(path, out_format, options)
+    if fmt == 'xls':
+        return _BufferedChunkWriter(path, out_format, options)
+    raise ValueError('Unsupported output format')
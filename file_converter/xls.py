@@ -0,0 +1,277 @@
+# file_converter/xls.py
+
+
+import os
+import tempfile
+import threading
+
+import pandas as pd
+
+from .manifest import file_digest
+from .parallel import concat_sheets, parse_sheets
+from .sheets import list_sheets
+
+# -------------------------------
+# Legacy .xls readers
+# -------------------------------
+
+
+def _read_xls_with_xlrd(path: str, max_memory_mb=None) -> pd.DataFrame:
+    """Read legacy .xls using xlrd==1.2.0; returns empty df if not possible.
+    max_memory_mb caps parallel sheet parsing (see parallel.sheet_workers)."""
+    try:
+        import xlrd  # noqa
+        ver = getattr(xlrd, '__version__', '')
+        if not ver or ver.startswith('2'):
+            raise ImportError("xlrd>=2.0 installed; .xls support removed.")
+    except ImportError as e:
+        raise e  # bubble up for COM fallback
+
+    # Sheet names from the BOUNDSHEET records: xlrd would parse every sheet
+    # just to list them, and parallel workers parse their own copy anyway
+    try:
+        names, xls = [e.name for e in list_sheets(path, False)], None
+    except ValueError:
+        xls = pd.ExcelFile(path, engine='xlrd')
+        names = xls.sheet_names
+    return concat_sheets(parse_sheets(path, names, engine='xlrd',
+                                      errors='skip', xls=xls,
+                                      max_memory_mb=max_memory_mb))
+
+
+def _read_xls_via_excel_com(path: str, legacy=None) -> pd.DataFrame:
+    """
+    Use Excel (win32com.client) to save the .xls as .xlsx, then read via openpyxl.
+    Works only on Windows with Excel installed. The .xlsx is kept in the
+    legacy intermediate cache, so the workbook is converted only once.
+    """
+    xlsx = (legacy or default_legacy_cache()).xlsx_path(path)
+    xls = pd.ExcelFile(xlsx, engine='openpyxl')
+    try:
+        return concat_sheets((sheet, xls.parse(sheet))
+                             for sheet in xls.sheet_names)
+    finally:
+        xls.close()
+
+# -------------------------------
+# Intermediate .xlsx conversion
+# -------------------------------
+
+
+def excel_com_save_as(src: str, dst: str):
+    """
+    Backend: open `src` in Excel (Windows + pywin32) and save it as the
+    .xlsx `dst`. Raises ImportError when Excel COM is not available.
+    """
+    try:
+        import pythoncom
+        from win32com.client import Dispatch
+    except Exception as e:
+        raise ImportError(
+            "Excel COM not available (requires Windows + Excel + pywin32). "
+            f"Import error: {e}"
+        )
+
+    pythoncom.CoInitialize()
+    excel = Dispatch("Excel.Application")
+    excel.Visible = False
+    excel.DisplayAlerts = False
+    excel.AskToUpdateLinks = False
+
+    wb = None
+    try:
+        wb = excel.Workbooks.Open(
+            os.path.abspath(src),
+            UpdateLinks=0, ReadOnly=True, IgnoreReadOnlyRecommended=True
+        )
+        wb.SaveAs(os.path.abspath(dst), FileFormat=51)  # xlOpenXMLWorkbook
+    finally:
+        try:
+            if wb:
+                wb.Close(SaveChanges=False)
+        except Exception:
+            pass
+        try:
+            excel.DisplayAlerts = True
+        except Exception:
+            pass
+        try:
+            excel.Quit()
+        except Exception:
+            pass
+        try:
+            pythoncom.CoUninitialize()
+        except Exception:
+            pass
+
+
+def builtin_save_as(src: str, dst: str):
+    """
+    Backend without Excel: copy every worksheet's cell values into the
+    .xlsx `dst` with the built-in BIFF reader (no formatting). Useful where
+    COM is unavailable, and as a local stand-in for it.
+    """
+    from openpyxl import Workbook
+    from .biff import XlsBook
+    from .readers import _xls_rows  # readers imports this module
+
+    wb = Workbook(write_only=True)
+    with XlsBook(src) as book:
+        for name in book.sheet_names:
+            ws = wb.create_sheet(name)
+            for row in _xls_rows(book, name):
+                ws.append([None if isinstance(v, str) and v == "" else v
+                           for v in row])
+    wb.save(dst)
+
+
+class LegacyWorkbookCache:
+    """
+    Legacy workbooks converted to an intermediate .xlsx once and reused:
+    intermediates are stored in `cache_dir` under the SHA-256 of the .xls,
+    so renamed or copied files share one, and the newest `max_entries` are
+    kept. `backend(src, dst)` does the conversion (default: Excel COM).
+    Hashes are remembered per path/size/mtime for the life of the object.
+    """
+
+    def __init__(self, backend=None, cache_dir: str = None,
+                 max_entries: int = 50):
+        if cache_dir is None:
+            from .workbook import default_cache_dir  # workbook imports this module
+            cache_dir = os.path.join(default_cache_dir(), "legacy")
+        self.backend = backend or excel_com_save_as
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self._digests = {}
+        self._lock = threading.Lock()
+
+    def _digest(self, path: str) -> str:
+        st = os.stat(path)
+        key = (os.path.abspath(path), st.st_size, st.st_mtime_ns)
+        digest = self._digests.get(key)
+        if digest is None:
+            digest = self._digests[key] = file_digest(path)
+        return digest
+
+    def xlsx_path(self, path: str) -> str:
+        """The intermediate .xlsx for `path`, converting it on first use."""
+        target = os.path.join(self.cache_dir, self._digest(path) + ".xlsx")
+        with self._lock:
+            if os.path.exists(target):
+                os.utime(target)  # most recently used
+                return target
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(suffix=".xlsx", dir=self.cache_dir)
+            os.close(fd)
+            os.remove(tmp)  # Excel's SaveAs prompts if the file exists
+            try:
+                self.backend(path, tmp)
+                os.replace(tmp, target)
+            finally:
+                if os.path.exists(tmp):
+                    os.remove(tmp)
+            self._prune()
+        return target
+
+    def _prune(self):
+        try:
+            entries = [e for e in os.scandir(self.cache_dir)
+                       if e.name.endswith(".xlsx")]
+            entries.sort(key=lambda e: e.stat().st_mtime, reverse=True)
+            for e in entries[self.max_entries:]:
+                os.remove(e.path)
+        except OSError:
+            pass
+
+    def clear(self):
+        try:
+            for e in os.scandir(self.cache_dir):
+                if e.name.endswith(".xlsx"):
+                    os.remove(e.path)
+        except OSError:
+            pass
+
+
+_default_legacy = None
+
+
+def default_legacy_cache() -> LegacyWorkbookCache:
+    global _default_legacy
+    if _default_legacy is None:
+        _default_legacy = LegacyWorkbookCache()
+    return _default_legacy
+
+# -------------------------------
+# Multi-sheet helpers for .xls
+# -------------------------------
+
+
+def get_xls_sheet_names(path: str, legacy=None) -> list[str]:
+    """
+    Return sheet names for a legacy .xls workbook.
+    Reads the BOUNDSHEET records directly; falls back to xlrd, then the
+    intermediate .xlsx from `legacy` (default: Excel COM, cached).
+    """
+    try:
+        return [e.name for e in list_sheets(path, False)]
+    except ValueError:
+        pass
+
+    # xlrd path
+    try:
+        import xlrd
+        ver = getattr(xlrd, '__version__', '')
+        if ver and not ver.startswith('2'):
+            book = xlrd.open_workbook(path)
+            return [s.name for s in book.sheets()]
+    except Exception:
+        pass
+
+    # Intermediate .xlsx fallback
+    try:
+        xlsx = (legacy or default_legacy_cache()).xlsx_path(path)
+        return [e.name for e in list_sheets(xlsx, False)]
+    except Exception as e:
+        raise RuntimeError(f"Unable to list .xls sheets via COM: {e}")
+
+
+def read_xls_selected_sheets(path: str, sheet_names: list[str],
+                             legacy=None) -> list[tuple[str, pd.DataFrame]]:
+    """
+    Read selected sheets from a legacy .xls workbook and return [(sheet_name, df), ...].
+    Prefers the built-in BIFF reader, then xlrd; falls back to the
+    intermediate .xlsx from `legacy` (default: Excel COM, cached) -> openpyxl.
+    """
+    from .readers import read_xls_builtin  # readers imports this module
+    results: list[tuple[str, pd.DataFrame]] = []
+
+    try:
+        return read_xls_builtin(path, sheet_names)
+    except ValueError:
+        pass  # encrypted, pre-BIFF5 or malformed
+
+    # xlrd path
+    try:
+        import xlrd
+        ver = getattr(xlrd, '__version__', '')
+        if ver and not ver.startswith('2'):
+            parsed = parse_sheets(path, sheet_names, engine='xlrd',
+                                  errors='skip')
+            return [(sheet, df) for sheet, df in parsed if not df.empty]
+    except Exception:
+        pass
+
+    # Intermediate .xlsx fallback: converted once, then parsed via openpyxl
+    xlsx = (legacy or default_legacy_cache()).xlsx_path(path)
+    xls = pd.ExcelFile(xlsx, engine='openpyxl')
+    try:
+        for sheet in sheet_names:
+            try:
+                df = xls.parse(sheet)
+                if not df.empty:
+                    results.append((sheet, df))
+            except Exception:
+                continue
+        return results
+    finally:
+        xls.close()
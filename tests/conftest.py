@@ -0,0 +1,24 @@
+# tests/conftest.py
+import importlib.util
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+GUI_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "file_converter_gui_v3.0 (Final_for_beta).py")
+
+
+@pytest.fixture(scope="session")
+def gui():
+    """The GUI script as a module (its classes need no display to test)."""
+    pytest.importorskip("customtkinter")
+    pytest.importorskip("tkinterdnd2")
+    spec = importlib.util.spec_from_file_location("file_converter_gui",
+                                                  GUI_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
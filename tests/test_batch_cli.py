@@ -0,0 +1,84 @@
+# tests/test_batch_cli.py
+import json
+import os
+
+import pytest
+
+from file_converter.batch import (collect_inputs, convert_batch,
+                                  output_bases, output_path_for,
+                                  part_output_path)
+from file_converter.cli import main
+from file_converter.manifest import MANIFEST_NAME
+
+
+def _write(path, text="a,b\n1,2\n"):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+def test_colliding_names_are_numbered_in_input_order():
+    inputs = ["x/data.csv", "y/data.tsv", "z/DATA.txt.gz", "w/data_2.csv",
+              "v/other.json"]
+    assert output_bases(inputs) == {
+        "x/data.csv": "data", "y/data.tsv": "data_3",
+        "z/DATA.txt.gz": "DATA_4", "w/data_2.csv": "data_2",
+        "v/other.json": "other"}
+
+
+def test_reserved_names_are_kept_and_avoided():
+    inputs = ["new/data.csv", "old/data.csv"]
+    bases = output_bases(inputs, reserved={"old/data.csv": "data"})
+    assert bases == {"new/data.csv": "data_2", "old/data.csv": "data"}
+
+
+def test_output_paths(tmp_path):
+    out = str(tmp_path)
+    assert output_path_for("in/s.tsv.gz", out, "csv") == \
+        os.path.join(out, "s.csv")
+    assert output_path_for("in/s.tsv", out, "csv.gz", "s_2") == \
+        os.path.join(out, "s_2.csv.gz")
+    assert part_output_path("in/b.xlsx", out, "csv", "Jan", "b_2") == \
+        os.path.join(out, "b_2_Jan.csv")
+
+
+def test_collect_inputs_walks_folders_in_a_stable_order(tmp_path):
+    b = _write(tmp_path / "in" / "b" / "data.csv")
+    a = _write(tmp_path / "in" / "a" / "data.csv")
+    top = _write(tmp_path / "in" / "top.csv")
+    _write(tmp_path / "in" / MANIFEST_NAME, "{}")
+    assert collect_inputs([str(tmp_path / "in"), top, "missing"]) == \
+        [top, a, b]
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_same_names_from_two_folders_get_two_outputs(tmp_path, jobs):
+    first = _write(tmp_path / "x" / "data.csv", "a\n1\n")
+    second = _write(tmp_path / "y" / "data.csv", "a\n2\n")
+    out = tmp_path / "out"
+    out.mkdir()
+    results = convert_batch([first, second], str(out), "json", jobs=jobs)
+    assert [r["input"] for r in results] == [first, second]
+    assert [os.path.basename(r["output"]) for r in results] == \
+        ["data.json", "data_2.json"]
+    assert (out / "data_2.json").read_text().strip() == '[{"a":"2"}]'
+
+
+def test_cli_prints_a_summary_and_fails_on_errors(tmp_path, capsys):
+    good = _write(tmp_path / "in" / "good.csv")
+    bad = str(tmp_path / "in" / "bad.xlsx")
+    with open(bad, "wb") as f:
+        f.write(b"not a workbook")
+    out = str(tmp_path / "out")
+    code = main(["convert", str(tmp_path / "in"), "--to", "tsv",
+                 "--out", out, "-j", "1"])
+    captured = capsys.readouterr()
+    summary = json.loads(captured.out)
+    assert code == 1
+    assert (summary["total"], summary["converted"], summary["failed"]) == \
+        (2, 1, 1)
+    status = {f["input"]: f["status"] for f in summary["files"]}
+    assert status == {bad: "error", good: "ok"}
+    assert "[2/2]" in captured.err
+    with open(os.path.join(out, "good.tsv")) as f:
+        assert f.read() == "a\tb\n1\t2\n"
@@ -0,0 +1,69 @@
+# tests/test_batch_dedupe.py
+import os
+
+from file_converter.batch import convert_batch, find_duplicates
+from file_converter.manifest import OutputManifest
+
+CONTENT = "a\tb\n1\t2\n"
+
+
+def _inputs(folder, names):
+    folder.mkdir()
+    paths = []
+    for name in names:
+        path = folder / name
+        path.write_text(CONTENT, encoding="utf-8")
+        paths.append(str(path))
+    return paths
+
+
+def test_same_bytes_different_format_are_not_duplicates(tmp_path):
+    tsv, csv, tsv2 = _inputs(tmp_path / "in", ["a.tsv", "b.csv", "c.tsv"])
+    assert find_duplicates([tsv, csv, tsv2]) == {tsv2: tsv}
+
+
+def test_copy_of_skipped_input_is_converted_and_recorded(tmp_path):
+    out = str(tmp_path / "out")
+    os.makedirs(out)
+    first, = _inputs(tmp_path / "in", ["a.csv"])
+    convert_batch([first], out, "json", jobs=1, incremental=True,
+                  dedupe=True)
+    copies = _inputs(tmp_path / "more", ["b.csv", "c.csv"])
+
+    results = convert_batch([first, *copies], out, "json", jobs=1,
+                            incremental=True, dedupe=True)
+    assert [r["status"] for r in results] == ["skipped", "ok", "ok"]
+    assert {r.get("duplicate_of") for r in results[1:]} == {first}
+    for r in results[1:]:
+        assert os.path.exists(r["output"])
+    entries = OutputManifest(out).entries
+    assert all(os.path.abspath(p) in entries for p in copies)
+
+    again = convert_batch([first, *copies], out, "json", jobs=1,
+                          incremental=True, dedupe=True)
+    assert [r["status"] for r in again] == ["skipped"] * 3
+
+
+def test_copies_with_other_sheets_are_converted(tmp_path):
+    openpyxl = __import__("pytest").importorskip("openpyxl")
+    (tmp_path / "in").mkdir()
+    paths = []
+    for name in ("a.xlsx", "b.xlsx", "c.xlsx"):
+        wb = openpyxl.Workbook()
+        wb.active.title = "One"
+        wb.active.append(["x"])
+        wb.active.append([1])
+        two = wb.create_sheet("Two")
+        two.append(["y"])
+        two.append([2])
+        wb.save(tmp_path / "in" / name)
+        paths.append(str(tmp_path / "in" / name))
+    a, b, c = paths
+    out = str(tmp_path / "out")
+    os.makedirs(out)
+    sheets = {a: ["One"], b: ["Two"], c: ["One"]}
+    results = convert_batch(paths, out, "csv", jobs=1, dedupe=True,
+                            sheets=sheets)
+    assert [r.get("duplicate_of") for r in results] == [None, None, a]
+    assert sorted(os.listdir(out)) == ["a_One.csv", "b_Two.csv",
+                                       "c_One.csv"]
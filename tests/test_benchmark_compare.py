@@ -0,0 +1,34 @@
+# tests/test_benchmark_compare.py
+from benchmarks import suite
+
+
+def _case(input_, rows_per_sec, **kw):
+    return dict(kind="read", input=input_, shape="narrow",
+                encoding="utf-8", rows=1000, rows_per_sec=rows_per_sec,
+                peak_rss_mb=50.0, **kw)
+
+
+def test_compare_lists_cases_missing_on_either_side(tmp_path, capsys):
+    baseline = [_case("csv", 1000), _case("tab", 1000)]
+    current = [_case("csv", 500), _case("xml", 1000)]
+    missing, added = suite.unmatched_cases(baseline, current)
+    assert [r["input"] for r in missing] == ["tab"]
+    assert [r["input"] for r in added] == ["xml"]
+
+    paths = []
+    for name, results in (("old", baseline), ("new", current)):
+        path = tmp_path / f"{name}.json"
+        path.write_text(suite.json.dumps({"results": results}))
+        paths.append(str(path))
+    assert suite.main(["compare", *paths]) == 1
+    out = capsys.readouterr().out
+    assert "REGRESSION read csv" in out
+    assert "MISSING read tab narrow utf-8 1000" in out
+    assert "NEW read xml narrow utf-8 1000" in out
+
+
+def test_peak_rss_is_shared():
+    from benchmarks import rss, xlsx_writer
+    assert suite.peak_rss_mb is rss.peak_rss_mb
+    assert xlsx_writer.peak_rss_mb is rss.peak_rss_mb
+    assert rss.peak_rss_mb() > 0
@@ -0,0 +1,135 @@
+# tests/test_biff.py
+import struct
+
+import pytest
+
+from file_converter import biff
+from file_converter.detect import OLE_SIGNATURE
+from file_converter.readers import read_xls_builtin
+
+SECTOR = 512
+_FREE, _END, _FATSECT = 0xFFFFFFFF, 0xFFFFFFFE, 0xFFFFFFFD
+
+
+def _ole(stream: bytes) -> bytes:
+    """A compound file holding `stream` as 'Workbook' (one FAT sector)."""
+    stream = stream.ljust(max(len(stream), 4096), b'\0')  # no mini stream
+    n = -(-len(stream) // SECTOR)
+    fat = [_FATSECT, _END] + [3 + i for i in range(n - 1)] + [_END]
+    fat += [_FREE] * (SECTOR // 4 - len(fat))
+    header = bytearray(SECTOR)
+    header[:8] = OLE_SIGNATURE
+    struct.pack_into('<HH', header, 0x1E, 9, 6)
+    struct.pack_into('<8I', header, 0x2C, 1, 1, 0, 4096, _END, 0, _END, 0)
+    struct.pack_into('<109I', header, 0x4C, 0, *[_FREE] * 108)
+
+    def entry(name, kind, start, size):
+        e = bytearray(128)
+        raw = (name + '\0').encode('utf-16-le')
+        e[:len(raw)] = raw
+        struct.pack_into('<HB', e, 64, len(raw), kind)
+        struct.pack_into('<II', e, 116, start, size)
+        return bytes(e)
+
+    directory = (entry('Root Entry', 5, _END, 0)
+                 + entry('Workbook', 2, 2, len(stream))).ljust(SECTOR, b'\0')
+    return (bytes(header) + struct.pack('<128I', *fat) + directory
+            + stream.ljust(n * SECTOR, b'\0'))
+
+
+def _rec(rtype: int, payload: bytes) -> bytes:
+    return struct.pack('<HH', rtype, len(payload)) + payload
+
+
+def _bof(kind: int) -> bytes:
+    return _rec(biff.BOF, struct.pack('<HH', 0x0600, kind) + b'\0' * 12)
+
+
+def _workbook(sst_segments: list, cells: bytes) -> bytes:
+    """BIFF8 stream: globals (one sheet 'S', the SST), then the sheet."""
+    name = b'S'
+    sheet_rec = lambda pos: _rec(  # noqa: E731
+        biff.BOUNDSHEET,
+        struct.pack('<IBBBB', pos, 0, 0, len(name), 0) + name)
+    sst = _rec(biff.SST, sst_segments[0]) + b''.join(
+        _rec(biff.CONTINUE, s) for s in sst_segments[1:])
+    head = _bof(0x0005)
+    tail = sst + _rec(biff.EOF, b'')
+    pos = len(head) + len(sheet_rec(0)) + len(tail)
+    sheet = (_bof(0x0010)
+             + _rec(biff.DIMENSIONS, struct.pack('<IIHHH', 0, 3, 0, 2, 0))
+             + cells + _rec(biff.EOF, b''))
+    return head + sheet_rec(pos) + tail + sheet
+
+
+def _labelsst(r, c, i):
+    return _rec(biff.LABELSST, struct.pack('<HHHI', r, c, 0, i))
+
+
+def _formula_string(r, c, segments):
+    result = b'\0' * 6 + b'\xff\xff'
+    return (_rec(biff.FORMULA, struct.pack('<HHH', r, c, 0) + result
+                 + b'\0' * 6)
+            + _rec(biff.STRING, segments[0])
+            + b''.join(_rec(biff.CONTINUE, s) for s in segments[1:]))
+
+
+LONG = 'x' * 40 + 'é中' * 20  # latin-1 part, then UTF-16 part
+
+
+def _sst():
+    """Two strings; the first crosses a CONTINUE that switches to UTF-16."""
+    first = LONG[:40].encode('latin1')
+    rest = LONG[40:].encode('utf-16-le')
+    seg0 = (struct.pack('<II', 3, 2) + struct.pack('<HB', len(LONG), 0)
+            + first)
+    seg1 = (b'\x01' + rest + struct.pack('<HB', 4, 0) + b'plan')
+    return [seg0, seg1]
+
+
+def _write(tmp_path, cells):
+    path = tmp_path / 'book.xls'
+    path.write_bytes(_ole(_workbook(_sst(), cells)))
+    return str(path)
+
+
+def test_sst_string_across_continue(tmp_path):
+    cells = (_labelsst(0, 0, 1) + _labelsst(0, 1, 1)
+             + _labelsst(1, 0, 0) + _labelsst(1, 1, 1))
+    with biff.XlsBook(_write(tmp_path, cells)) as book:
+        rows = dict(book.iter_rows('S'))
+    assert rows == {0: {0: 'plan', 1: 'plan'}, 1: {0: LONG, 1: 'plan'}}
+
+
+@pytest.mark.parametrize('split', [0, 7, 40])
+def test_formula_string_across_continue(tmp_path, split):
+    text = LONG[:split]
+    head = struct.pack('<HB', len(LONG), 0) + text.encode('latin1')
+    cont = b'\x01' + LONG[split:].encode('utf-16-le')
+    cells = (_labelsst(0, 0, 1) + _labelsst(0, 1, 1)
+             + _formula_string(1, 0, [head, cont]) + _labelsst(1, 1, 1))
+    [(sheet, df)] = read_xls_builtin(_write(tmp_path, cells))
+    assert sheet == 'S'
+    assert df.columns.tolist() == ['plan', 'plan.1']
+    assert df.iloc[0].tolist() == [LONG, 'plan']
+
+
+def test_formula_string_before_sheet_eof(tmp_path):
+    head = struct.pack('<HB', 5, 0) + b'ab'
+    cells = (_labelsst(0, 0, 1)
+             + _formula_string(1, 0, [head, b'\x00cde']))
+    with biff.XlsBook(_write(tmp_path, cells)) as book:
+        assert dict(book.iter_rows('S'))[1] == {0: 'abcde'}
+
+
+def test_odd_utf16_segment_raises():
+    reader = biff._Segments([struct.pack('<HB', 3, 1) + b'a\0b'])
+    with pytest.raises(ValueError):
+        reader.unicode_string()
+
+
+def test_odd_utf16_continue_raises():
+    reader = biff._Segments([struct.pack('<HB', 4, 0) + b'ab',
+                             b'\x01c\0d'])
+    with pytest.raises(ValueError):
+        reader.unicode_string()
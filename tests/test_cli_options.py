@@ -0,0 +1,47 @@
+# tests/test_cli_options.py
+import os
+
+import pytest
+
+from file_converter.cli import main
+from file_converter.options import OPTION_ENV
+
+pq = pytest.importorskip("pyarrow.parquet")
+
+
+@pytest.fixture
+def data(tmp_path):
+    path = tmp_path / "data.csv"
+    path.write_text("a,b\n" + "".join(f"{i},x{i}\n" for i in range(5)),
+                    encoding="utf-8")
+    return str(path)
+
+
+def _convert(data, out, *flags):
+    assert main(["convert", data, "--to", "parquet", "--out", str(out),
+                 "-j", "1", "-q", *flags]) == 0
+    return pq.ParquetFile(os.path.join(out, "data.parquet")).metadata
+
+
+def test_options_apply_to_one_run_only(data, tmp_path, capsys, monkeypatch):
+    for env, _ in OPTION_ENV.values():
+        monkeypatch.delenv(env, raising=False)
+    meta = _convert(data, tmp_path / "tuned", "--parquet-compression",
+                    "zstd", "--row-group-size", "2", "--max-memory", "512",
+                    "--compression-level", "1")
+    assert meta.num_row_groups == 3
+    assert meta.row_group(0).column(0).compression == "ZSTD"
+    assert not [env for env, _ in OPTION_ENV.values() if env in os.environ]
+
+    meta = _convert(data, tmp_path / "plain")
+    assert meta.num_row_groups == 1
+    assert meta.row_group(0).column(0).compression == "SNAPPY"
+
+
+def test_environment_still_gives_defaults(data, tmp_path, monkeypatch,
+                                          capsys):
+    monkeypatch.setenv("FILE_CONVERTER_PARQUET_COMPRESSION", "gzip")
+    meta = _convert(data, tmp_path / "env")
+    assert meta.row_group(0).column(0).compression == "GZIP"
+    meta = _convert(data, tmp_path / "flag", "--parquet-compression", "none")
+    assert meta.row_group(0).column(0).compression == "UNCOMPRESSED"
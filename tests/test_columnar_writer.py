@@ -0,0 +1,59 @@
+# tests/test_columnar_writer.py
+import datetime
+
+import pandas as pd
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+openpyxl = pytest.importorskip("openpyxl")
+
+from file_converter.batch import stream_convert  # noqa: E402
+from file_converter.readers import read_file  # noqa: E402
+from file_converter.writers import open_chunk_writer, write_file  # noqa: E402
+
+
+def test_types_promoted_across_chunks(tmp_path):
+    path = str(tmp_path / "out.parquet")
+    with open_chunk_writer(path, "parquet") as writer:
+        writer.write(pd.DataFrame({"v": [1, 2], "s": [None, None]}))
+        writer.write(pd.DataFrame({"v": [3.5, None], "s": ["a", None]}))
+    table = pq.read_table(path)
+    assert table.schema.field("v").type == pa.float64()
+    assert table.schema.field("s").type == pa.string()
+    assert table.column("v").to_pylist() == [1.0, 2.0, 3.5, None]
+
+
+def test_mixed_object_columns_become_strings(tmp_path):
+    path = str(tmp_path / "out.parquet")
+    df = pd.DataFrame({"m": pd.Series([1, "a", None], dtype=object),
+                       "t": pd.Series([datetime.time(1, 2), None, None],
+                                      dtype=object)})
+    write_file(df, path, "parquet")
+    table = pq.read_table(path)
+    assert table.column("m").to_pylist() == ["1", "a", None]
+    assert table.schema.field("t").type == pa.time64("us")
+
+
+@pytest.mark.parametrize("out_format", ["parquet", "feather"])
+def test_streamed_excel_keeps_column_types(tmp_path, out_format):
+    book = str(tmp_path / "in.xlsx")
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.append(["when", "price", "qty", "ok", "name"])
+    for i in range(7):
+        ws.append([datetime.datetime(2024, 1, 1 + i), i / 2, i, i % 2 == 0,
+                   f"n{i}"])
+    wb.save(book)
+
+    whole, streamed = (str(tmp_path / f"{n}.{out_format}")
+                       for n in ("whole", "streamed"))
+    write_file(read_file(book), whole, out_format)
+    assert stream_convert(book, streamed, out_format, chunksize=3) == 7
+    read = pq.read_table if out_format == "parquet" else \
+        pytest.importorskip("pyarrow.feather").read_table
+    expected, got = read(whole), read(streamed)
+    assert got.schema == expected.schema
+    assert [f.type for f in got.schema][:4] == [
+        pa.timestamp("ns"), pa.float64(), pa.int64(), pa.bool_()]
+    assert got.equals(expected)
@@ -0,0 +1,103 @@
+# tests/test_combine_sheets.py
+import os
+import threading
+
+import pandas as pd
+import pytest
+
+from file_converter.batch import (convert_batch, convert_file,
+                                  stream_sheets_to_workbook)
+from file_converter.errors import ConversionCancelled
+
+openpyxl = pytest.importorskip("openpyxl")
+
+SHEETS = {"Jan": [["id", "v"], [1, "a"], [2, "b"]],
+          "Blank": [],
+          "Feb": [["id", "v"], [3, "c"]],
+          "Mar": [["k"], ["x"]]}
+
+
+@pytest.fixture
+def book(tmp_path):
+    path = str(tmp_path / "sales.xlsx")
+    wb = openpyxl.Workbook()
+    wb.remove(wb.active)
+    for title, rows in SHEETS.items():
+        ws = wb.create_sheet(title)
+        for row in rows:
+            ws.append(row)
+    wb.save(path)
+    return path
+
+
+@pytest.fixture
+def saves(monkeypatch):
+    """Paths passed to openpyxl's Workbook.save."""
+    saved = []
+    save = openpyxl.Workbook.save
+    monkeypatch.setattr(openpyxl.Workbook, "save",
+                        lambda wb, path: saved.append(path) or save(wb, path))
+    return saved
+
+
+def _read_all(path):
+    return pd.read_excel(path, sheet_name=None)
+
+
+def test_sheets_share_one_workbook_and_one_save(tmp_path, saves):
+    out = str(tmp_path / "out.xlsx")
+    chunks = {"Jan": [pd.DataFrame({"id": [1]}), pd.DataFrame({"id": [2]})],
+              "None": [pd.DataFrame()],
+              "Feb": [pd.DataFrame({"v": ["c"]})]}
+    assert stream_sheets_to_workbook(chunks.items(), out) == \
+        {"Jan": 2, "Feb": 1}
+    assert saves == [out]
+    got = _read_all(out)
+    assert list(got) == ["Jan", "Feb"]
+    assert got["Jan"]["id"].tolist() == [1, 2]
+
+
+def test_nothing_to_write_creates_no_file(tmp_path):
+    out = str(tmp_path / "out.xlsx")
+    assert stream_sheets_to_workbook([("A", [pd.DataFrame()])], out) == {}
+    assert not os.path.exists(out)
+
+
+def test_cancel_between_chunks(tmp_path):
+    cancel = threading.Event()
+    cancel.set()
+    with pytest.raises(ConversionCancelled):
+        stream_sheets_to_workbook([("A", [pd.DataFrame({"a": [1]})])],
+                                  str(tmp_path / "out.xlsx"), cancel=cancel)
+
+
+def test_convert_file_combines_the_selected_sheets(book, tmp_path, saves):
+    out_dir = str(tmp_path / "out")
+    os.mkdir(out_dir)
+    result = convert_file(book, out_dir, "xlsx",
+                          sheets=["Feb", "Blank", "Jan"], combine_sheets=True)
+    combined = os.path.join(out_dir, "sales.xlsx")
+    assert result["status"] == "ok"
+    assert result["outputs"] == [combined] and result["rows"] == 3
+    assert os.listdir(out_dir) == ["sales.xlsx"]
+    assert saves == [combined]
+    got = _read_all(combined)
+    assert list(got) == ["Feb", "Jan"]
+    assert got["Jan"].to_dict("list") == {"id": [1, 2], "v": ["a", "b"]}
+
+
+def test_other_formats_keep_one_file_per_sheet(book, tmp_path):
+    result = convert_file(book, str(tmp_path), "csv",
+                          sheets=["Jan", "Feb"], combine_sheets=True)
+    assert [os.path.basename(p) for p in result["outputs"]] == \
+        ["sales_Jan.csv", "sales_Feb.csv"]
+
+
+def test_batch_combines_per_input(book, tmp_path):
+    out_dir = str(tmp_path / "out")
+    os.mkdir(out_dir)
+    [result] = convert_batch([book], out_dir, "xlsx", jobs=1,
+                             sheets={book: ["Jan", "Mar"]},
+                             combine_sheets=True)
+    assert result["status"] == "ok"
+    assert list(_read_all(result["output"])) == ["Jan", "Mar"]
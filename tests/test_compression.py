@@ -0,0 +1,119 @@
+# tests/test_compression.py
+import os
+import random
+import zipfile
+
+import pandas as pd
+import pytest
+
+from file_converter.batch import convert_file, stream_convert
+from file_converter.compressed import COMPRESSION_SIGNATURES
+from file_converter.detect import probe_file
+from file_converter.options import ConvertOptions
+from file_converter.readers import read_file
+from file_converter.writers import write_file
+
+SIGNATURES = {codec: sig for sig, codec in COMPRESSION_SIGNATURES}
+SUFFIXES = {"gz": "gzip", "bz2": "bz2", "xz": "xz", "zst": "zstd"}
+
+# gzip records fast / best compression in its XFL byte, bz2 the level itself
+GZIP_XFL = {1: 4, 9: 2}
+
+
+def _codec(suffix):
+    if suffix == "zst":
+        pytest.importorskip("zstandard")
+    return SUFFIXES[suffix]
+
+
+@pytest.fixture(scope="module")
+def df():
+    rnd = random.Random(7)
+    words = ["alpha", "beta", "gamma", "delta", "epsilon", "zeta"]
+    return pd.DataFrame({
+        "id": [str(i) for i in range(5000)],
+        "text": [" ".join(rnd.choices(words, k=6)) for _ in range(5000)]})
+
+
+def _written(df, tmp_path, fmt, level, streamed):
+    path = str(tmp_path / f"{level}.{fmt}")
+    options = ConvertOptions(compression_level=level)
+    if streamed:
+        src = str(tmp_path / "in.csv")
+        if not os.path.exists(src):
+            df.to_csv(src, index=False)
+        stream_convert(src, path, fmt, chunksize=2000, options=options)
+    else:
+        write_file(df, path, fmt, options)
+    return path
+
+
+@pytest.mark.parametrize("streamed", [False, True])
+@pytest.mark.parametrize("suffix", ["gz", "bz2", "xz", "zst"])
+def test_levels_round_trip(df, tmp_path, suffix, streamed):
+    codec = _codec(suffix)
+    low, high = {"xz": (0, 9), "zst": (1, 19)}.get(suffix, (1, 9))
+    paths = {level: _written(df, tmp_path, f"csv.{suffix}", level, streamed)
+             for level in (low, high)}
+    for level, path in paths.items():
+        with open(path, "rb") as f:
+            head = f.read(10)
+        assert head.startswith(SIGNATURES[codec])
+        if codec == "gzip":
+            assert head[8] == GZIP_XFL[level]
+        elif codec == "bz2":
+            assert head[3:4] == str(level).encode()
+        probe = probe_file(path)
+        assert (probe.format, probe.compression) == ("delimited", codec)
+        pd.testing.assert_frame_equal(read_file(path), df)
+    if codec in ("xz", "zstd"):
+        assert os.path.getsize(paths[high]) < os.path.getsize(paths[low])
+
+
+def test_level_from_the_environment(df, tmp_path, monkeypatch):
+    monkeypatch.setenv("FILE_CONVERTER_COMPRESSION_LEVEL", "1")
+    path = str(tmp_path / "out.csv.gz")
+    write_file(df, path, "csv.gz")
+    with open(path, "rb") as f:
+        assert f.read(10)[8] == GZIP_XFL[1]
+    explicit = _written(df, tmp_path, "csv.gz", 9, streamed=False)
+    with open(explicit, "rb") as f:
+        assert f.read(10)[8] == GZIP_XFL[9]
+
+
+@pytest.mark.parametrize("fmt", ["jsonl.xz", "json.gz", "tsv.bz2"])
+def test_other_text_formats(df, tmp_path, fmt):
+    _codec(fmt.rsplit(".", 1)[1])
+    path = _written(df.head(50), tmp_path, fmt, 1, streamed=True)
+    assert read_file(path)["text"].tolist() == df["text"].head(50).tolist()
+
+
+def test_detected_by_magic_bytes_not_name(df, tmp_path):
+    gz = _written(df.head(5), tmp_path, "csv.gz", 6, streamed=False)
+    plain = str(tmp_path / "renamed.csv")
+    os.rename(gz, plain)
+    assert probe_file(plain).compression == "gzip"
+    pd.testing.assert_frame_equal(read_file(plain), df.head(5))
+
+
+def test_zip_members_convert_separately(tmp_path):
+    path = str(tmp_path / "bundle.zip")
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.writestr("jan.csv", "a,b\n1,2\n3,4\n")
+        zf.writestr("2024/feb.tsv", "a\tb\n5\t6\n")
+        zf.writestr("__MACOSX/._jan.csv", "junk")
+        zf.writestr("nested.csv.gz", b"\x1f\x8b not a plain input")
+    assert probe_file(path).format == "zip"
+    assert read_file(path, member="2024/feb.tsv").to_dict("list") == \
+        {"a": ["5"], "b": ["6"]}
+    out_dir = str(tmp_path / "out")
+    os.mkdir(out_dir)
+    result = convert_file(path, out_dir, "csv.gz",
+                          options=ConvertOptions(compression_level=9))
+    assert result["status"] == "ok" and result["rows"] == 3
+    assert [os.path.basename(p) for p in result["outputs"]] == \
+        ["bundle_jan.csv.gz", "bundle_2024_feb.csv.gz"]
+    for out in result["outputs"]:
+        with open(out, "rb") as f:
+            assert f.read(10)[8] == GZIP_XFL[9]
+    assert read_file(result["outputs"][0])["a"].tolist() == ["1", "3"]
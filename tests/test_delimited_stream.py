@@ -0,0 +1,84 @@
+# tests/test_delimited_stream.py
+import os
+
+import pandas as pd
+import pytest
+
+from file_converter import read_file, write_file
+from file_converter.batch import stream_convert
+from file_converter.detect import probe_file
+from file_converter.readers import iter_file_chunks, read_tab_strict
+
+
+@pytest.fixture
+def tab(tmp_path):
+    # "late" is only filled in the last rows, "empty" nowhere; amounts are
+    # padded-plus numbers with stray spaces
+    lines = ["title \t royalty amount\tlate\tempty"]
+    lines += [f" T{i} \t+000{i}.50 \t\t" for i in range(25)]
+    lines += ["last\t+0012\tx\t"]
+    path = tmp_path / "statement.tsv"
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return str(path)
+
+
+def test_tab_chunks_match_the_whole_file_read(tab):
+    chunks = list(iter_file_chunks(tab, 10))
+    assert [len(c) for c in chunks] == [10, 10, 6]
+    whole = read_tab_strict(tab)
+    # Every chunk has the whole file's columns, even before "late" is set
+    assert all(list(c.columns) == list(whole.columns) for c in chunks)
+    assert list(whole.columns) == ["title", "royalty amount", "late"]
+    got = pd.concat(chunks, ignore_index=True)
+    pd.testing.assert_frame_equal(got, whole)
+    assert got["royalty amount"].iloc[[0, -1]].tolist() == ["0.50", "12"]
+
+
+def test_csv_chunks_match_the_whole_file_read(tmp_path):
+    path = tmp_path / "data.csv"
+    path.write_text("a , b\n" + "".join(f" {i} ,x{i} \n" for i in range(23)),
+                    encoding="utf-8")
+    chunks = list(iter_file_chunks(str(path), 5))
+    assert max(len(c) for c in chunks) == 5
+    got = pd.concat(chunks, ignore_index=True)
+    pd.testing.assert_frame_equal(got, read_file(str(path)))
+    assert got.iloc[0].tolist() == ["0", "x0"]
+
+
+@pytest.mark.parametrize("out_format", ["csv", "tsv", "json", "xlsx"])
+def test_streamed_output_matches_whole_write(tab, tmp_path, out_format):
+    streamed = str(tmp_path / f"streamed.{out_format}")
+    whole = str(tmp_path / f"whole.{out_format}")
+    assert stream_convert(tab, streamed, out_format, chunksize=7) == 26
+    write_file(read_file(tab), whole, out_format)
+    if out_format == "xlsx":
+        pd.testing.assert_frame_equal(pd.read_excel(streamed),
+                                      pd.read_excel(whole))
+    else:
+        with open(streamed, "rb") as f1, open(whole, "rb") as f2:
+            assert f1.read() == f2.read()
+
+
+def test_changed_file_is_probed_again(tmp_path):
+    path = tmp_path / "data.csv"
+    path.write_text("a,b\n1,2\n", encoding="utf-8")
+    first = probe_file(str(path))
+    assert probe_file(str(path)) is first
+    assert first.delimiter == ","
+
+    # Same size, new mtime
+    path.write_text("a;b\n1;2\n", encoding="utf-8")
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, first.mtime_ns + 10**9))
+    assert probe_file(str(path)).delimiter == ";"
+    [chunk] = iter_file_chunks(str(path))
+    assert list(chunk.columns) == ["a", "b"]
+
+    # New size, mtime unchanged (coarse file system clock)
+    path.write_text("a|b\n10|20\n", encoding="utf-8")
+    os.utime(path, ns=(st.st_atime_ns, first.mtime_ns + 10**9))
+    assert probe_file(str(path)).delimiter == "|"
+    out = str(tmp_path / "out.csv")
+    stream_convert(str(path), out, "csv")
+    with open(out) as f:
+        assert f.read() == "a,b\n10,20\n"
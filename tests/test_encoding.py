@@ -0,0 +1,79 @@
+# tests/test_encoding.py
+import codecs
+
+import pandas as pd
+import pytest
+
+from file_converter.batch import convert_batch
+from file_converter.detect import ENCODING_SAMPLE_BYTES, detect_encoding
+from file_converter.readers import read_tab_strict
+
+ROW = "title\tamount\n"
+FILLER = "Plain title\t+0001\n" * (3 * ENCODING_SAMPLE_BYTES // 18)
+
+
+def _file(tmp_path, data: bytes, name="s.tsv"):
+    path = tmp_path / name
+    path.write_bytes(data)
+    return str(path)
+
+
+@pytest.fixture
+def read_csv_calls(monkeypatch):
+    calls = []
+    read_csv = pd.read_csv
+
+    def counting(*args, **kw):
+        calls.append(kw.get("encoding"))
+        return read_csv(*args, **kw)
+
+    monkeypatch.setattr(pd, "read_csv", counting)
+    return calls
+
+
+@pytest.mark.parametrize("data, expected", [
+    (codecs.BOM_UTF8 + b"a\tb\n", "utf-8-sig"),
+    ("a\tb\n".encode("utf-16"), "utf-16"),
+    ("café\tb\n".encode("utf-8"), "utf-8"),
+    ("café\tb\n".encode("latin1"), "latin1"),
+])
+def test_small_files(tmp_path, data, expected):
+    assert detect_encoding(_file(tmp_path, data)) == expected
+
+
+def test_bad_byte_in_the_tail_is_sampled(tmp_path):
+    data = (ROW + FILLER + "Café\t+0002\n").encode("latin1")
+    assert detect_encoding(_file(tmp_path, data)) == "latin1"
+
+
+def test_bad_byte_in_the_middle_needs_validation(tmp_path):
+    half = FILLER[:len(FILLER) // 2]
+    data = (ROW + half + "Café\t1\n" + half).encode("latin1")
+    path = _file(tmp_path, data)
+    assert detect_encoding(path) == "utf-8"
+    assert detect_encoding(path, validate=True) == "latin1"
+
+
+def test_latin1_tail_is_parsed_once(tmp_path, read_csv_calls):
+    data = (ROW + FILLER + "Café\t+0002\n").encode("latin1")
+    df = read_tab_strict(_file(tmp_path, data))
+    assert read_csv_calls == ["latin1"]
+    assert df.attrs["encoding"] == "latin1"
+    assert df.iloc[-1].tolist() == ["Café", "2"]
+
+
+def test_utf8_is_parsed_once(tmp_path, read_csv_calls):
+    df = read_tab_strict(_file(tmp_path, (ROW + "Ærø\t+01\n").encode()))
+    assert read_csv_calls == ["utf-8"]
+    assert df.iloc[0].tolist() == ["Ærø", "1"]
+
+
+def test_batch_reports_latin1_inputs(tmp_path):
+    utf8 = _file(tmp_path, (ROW + "Déjà\t1\n").encode(), "u.tsv")
+    latin = _file(tmp_path, (ROW + "Déjà\t1\n").encode("latin1"), "l.tsv")
+    out = tmp_path / "out"
+    out.mkdir()
+    results = convert_batch([utf8, latin], str(out), "csv", jobs=1)
+    assert [r["encoding"] for r in results] == ["utf-8", "latin1"]
+    assert (out / "l.csv").read_text(encoding="utf-8") == \
+        "title,amount\nDéjà,1\n"
@@ -0,0 +1,223 @@
+# tests/test_gui_convert.py
+import os
+import queue
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from file_converter.batch import convert_batch
+from file_converter.options import ConvertOptions
+from file_converter.workbook import WorkbookSession
+
+openpyxl = pytest.importorskip("openpyxl")
+
+
+@pytest.fixture
+def inputs(tmp_path):
+    folder = tmp_path / "in"
+    folder.mkdir()
+    wb = openpyxl.Workbook()
+    wb.active.title = "One"
+    wb.active.append(["x"])
+    wb.active.append([1])
+    two = wb.create_sheet("Two")
+    two.append(["y"])
+    two.append([2])
+    wb.save(folder / "book.xlsx")
+    (folder / "a.csv").write_text("a,b\n1,2\n", encoding="utf-8")
+    (folder / "copy.csv").write_text("a,b\n1,2\n", encoding="utf-8")
+    return [str(folder / n) for n in ("book.xlsx", "a.csv", "copy.csv")]
+
+
+def run_worker(gui, selected, out, sheets=None, cancel=None, **kw):
+    q = queue.Queue()
+    gui.FileConverterApp._convert_worker(
+        selected, sheets, kw.pop("ext", "csv"), out, q,
+        cancel or threading.Event(), WorkbookSession(), **kw)
+    messages = []
+    while not q.empty():
+        messages.append(q.get())
+    return messages
+
+
+def test_worker_writes_what_the_batch_engine_writes(gui, inputs, tmp_path):
+    book = inputs[0]
+    sheets = {book: ["Two"]}
+    gui_out, cli_out = str(tmp_path / "gui"), str(tmp_path / "cli")
+    os.makedirs(gui_out)
+    os.makedirs(cli_out)
+    messages = run_worker(gui, inputs, gui_out, sheets, incremental=True)
+    convert_batch(inputs, cli_out, "csv", jobs=1, incremental=True,
+                  dedupe=True, sheets=sheets)
+    names = sorted(os.listdir(gui_out))
+    assert names == sorted(os.listdir(cli_out))
+    assert "book_Two.csv" in names and "book_One.csv" not in names
+    for name in names:
+        if name.endswith(".csv"):
+            with open(os.path.join(gui_out, name)) as f1, \
+                    open(os.path.join(cli_out, name)) as f2:
+                assert f1.read() == f2.read()
+    assert messages[-1] == ("done", 3, False, [], 0, ["copy.csv"])
+    assert [m[1] for m in messages if m[0] == "progress"] == [1, 2, 3]
+
+
+def test_worker_without_dedupe_converts_copies(gui, inputs, tmp_path):
+    out = str(tmp_path / "out")
+    os.makedirs(out)
+    messages = run_worker(gui, inputs[1:], out, dedupe=False)
+    assert messages[-1] == ("done", 2, False, [], 0, [])
+
+
+def test_worker_combines_selected_sheets(gui, inputs, tmp_path):
+    out = str(tmp_path / "out")
+    os.makedirs(out)
+    book = inputs[0]
+    run_worker(gui, [book], out, {book: ["One", "Two"]}, ext="xlsx",
+               combine_sheets=True)
+    assert os.listdir(out) == ["book.xlsx"]
+    assert openpyxl.load_workbook(os.path.join(out, "book.xlsx")).sheetnames \
+        == ["One", "Two"]
+
+
+@pytest.mark.parametrize("ext", ["csv.gz", "parquet"])
+def test_gui_and_cli_share_an_output_folder(gui, inputs, tmp_path, ext):
+    pytest.importorskip("pyarrow")
+    out = str(tmp_path / "out")
+    os.makedirs(out)
+    # What do_convert passes for the default compression choice
+    options = ConvertOptions(
+        parquet_compression="snappy" if ext == "parquet" else None)
+    messages = run_worker(gui, inputs[1:], out, ext=ext, incremental=True,
+                          convert_options=options)
+    assert messages[-1][1] == 2
+    results = convert_batch(inputs[1:], out, ext, jobs=1, incremental=True,
+                            dedupe=True)
+    assert [r["status"] for r in results] == ["skipped", "skipped"]
+
+    (tmp_path / "in" / "b.csv").write_text("b\n3\n", encoding="utf-8")
+    more = inputs[1:] + [str(tmp_path / "in" / "b.csv")]
+    convert_batch(more, out, ext, jobs=1, incremental=True, dedupe=True)
+    messages = run_worker(gui, more, out, ext=ext, incremental=True,
+                          convert_options=options)
+    assert messages[-1][4] == 3  # all skipped
+
+
+class _Widget:
+    def __init__(self):
+        self.options = {}
+
+    def configure(self, **kw):
+        self.options.update(kw)
+
+    config = configure
+
+
+class _CancelOnProgress(queue.Queue):
+    """Sets `cancel` once the first file has been reported."""
+
+    def __init__(self, cancel):
+        super().__init__()
+        self.cancel = cancel
+
+    def put(self, item, *args, **kw):
+        super().put(item, *args, **kw)
+        if item[0] == "progress":
+            self.cancel.set()
+
+
+def _messages(q):
+    messages = []
+    while not q.empty():
+        messages.append(q.get())
+    return messages
+
+
+def test_sheets_worker_reads_workbooks_only(gui, inputs):
+    q = queue.Queue()
+    session = WorkbookSession()
+    gui.FileConverterApp._sheets_worker(inputs, session, q,
+                                        threading.Event())
+    session.close()
+    assert _messages(q) == [("sheets", {inputs[0]: ["One", "Two"]})]
+
+
+def test_cancel_before_start_writes_nothing(gui, inputs, tmp_path):
+    out = str(tmp_path / "out")
+    os.makedirs(out)
+    cancel = threading.Event()
+    cancel.set()
+    messages = run_worker(gui, inputs[1:], out, cancel=cancel)
+    assert messages[-1] == ("done", 0, True, [], 0, [])
+    assert os.listdir(out) == []
+
+
+def test_cancel_stops_between_files(gui, tmp_path):
+    folder = tmp_path / "in"
+    folder.mkdir()
+    paths = []
+    for i in range(4):
+        path = folder / f"f{i}.csv"
+        path.write_text(f"a\n{i}\n", encoding="utf-8")
+        paths.append(str(path))
+    out = str(tmp_path / "out")
+    os.makedirs(out)
+    cancel = threading.Event()
+    q = _CancelOnProgress(cancel)
+    thread = threading.Thread(
+        target=gui.FileConverterApp._convert_worker,
+        args=(paths, None, "csv", out, q, cancel, WorkbookSession()),
+        daemon=True)
+    thread.start()
+    thread.join(60)
+    messages = _messages(q)
+    assert messages[-1] == ("done", 1, True, [], 0, [])
+    assert os.listdir(out) == ["f0.csv"]
+    assert [m[1] for m in messages if m[0] == "progress"] == [1, 2, 3, 4]
+
+
+def test_errors_are_posted_not_raised(gui, tmp_path):
+    out = str(tmp_path / "out")
+    os.makedirs(out)
+    missing = str(tmp_path / "gone.csv")
+    messages = run_worker(gui, [missing], out)
+    kind, title, text, warning = messages[0]
+    assert (kind, title, warning) == ("error", "Conversion failed", False)
+    assert text.startswith("gone.csv: File or folder not found")
+    assert messages[-1] == ("done", 0, False, [], 0, [])
+
+
+def test_closing_the_sheet_dialog_ends_the_run(gui, inputs, monkeypatch):
+    monkeypatch.setattr(gui, "select_excel_sheets_dialog", lambda m: None)
+    closed = []
+    session = SimpleNamespace(close=lambda: closed.append(True))
+    app = SimpleNamespace(
+        _convert_args=(inputs, "csv", "out", session, False, False, None,
+                       True),
+        _cancel_event=threading.Event(), convert_btn=_Widget(),
+        cancel_btn=_Widget(), status_label=_Widget())
+    started = gui.FileConverterApp._start_convert(
+        app, {inputs[0]: ["One", "Two"]})
+    assert started is False and closed == [True]
+    assert app._cancel_event.is_set()
+    assert app.convert_btn.options["state"] == "normal"
+    assert app.status_label.options["text"] == "Ready"
+
+
+def test_sheet_choice_starts_the_conversion_thread(gui, inputs, tmp_path,
+                                                   monkeypatch):
+    book = inputs[0]
+    monkeypatch.setattr(gui, "select_excel_sheets_dialog",
+                        lambda m: {book: ["One"]})
+    out = str(tmp_path / "out")
+    os.makedirs(out)
+    app = SimpleNamespace(
+        _convert_args=([book], "csv", out, WorkbookSession(), False, False,
+                       None, True),
+        _convert_queue=queue.Queue(), _cancel_event=threading.Event(),
+        _convert_worker=gui.FileConverterApp._convert_worker,
+        convert_btn=_Widget(), cancel_btn=_Widget(), status_label=_Widget())
+    assert gui.FileConverterApp._start_convert(app, {book: ["One", "Two"]})
+    app._convert_thread.join(60)
+    assert _messages(app._convert_queue)[-1] == ("done", 1, False, [], 0, [])
+    assert os.listdir(out) == ["book_One.csv"]
@@ -0,0 +1,128 @@
+# tests/test_gui_lists.py
+from types import SimpleNamespace
+
+import pytest
+
+
+class _Canvas:
+    """Records what VirtualCheckList draws; `height` pixels tall."""
+
+    def __init__(self, height):
+        self.height = height
+        self.items = []
+        self.bindings = {}
+
+    def winfo_height(self):
+        return self.height
+
+    def bind(self, event, fn):
+        self.bindings[event] = fn
+
+    def delete(self, tag):
+        self.items = [i for i in self.items if i[-1].get("tags") != tag]
+
+    def create_rectangle(self, *coords, **kw):
+        self.items.append(("rectangle", coords, kw))
+
+    def create_line(self, *coords, **kw):
+        self.items.append(("line", coords, kw))
+
+    def create_text(self, *coords, **kw):
+        self.items.append(("text", coords, kw))
+
+    def texts(self):
+        return [kw["text"] for kind, _, kw in self.items if kind == "text"]
+
+
+class _Scrollbar:
+    def configure(self, **kw):
+        self.command = kw["command"]
+
+    def set(self, first, last):
+        self.view = (first, last)
+
+
+def _list(gui, model, height=240, **kw):
+    canvas = _Canvas(height)
+    view = gui.VirtualCheckList(canvas, _Scrollbar(), model, **kw)
+    view.redraw()
+    return view, canvas
+
+
+def test_file_list_checks_all_in_constant_state(gui):
+    model = gui.FileListModel()
+    model.add(["/in/a.csv", "/in/b.csv", "/in/c.csv"])
+    model.toggle(1)
+    assert model.checked_paths() == ["/in/a.csv", "/in/c.csv"]
+    model.set_all(False)
+    assert model._flipped == set() and model.checked_paths() == []
+    model.toggle(2)
+    model.add(["/in/d.csv"])  # new rows come in checked
+    assert model.checked_paths() == ["/in/c.csv", "/in/d.csv"]
+    model.add(["/in/e.csv"], checked=False)
+    assert not model.is_checked(4)
+
+
+def test_file_list_labels_and_clear(gui):
+    model = gui.FileListModel()
+    model.add(["/in/a.csv", "/data/folder/", "/"])
+    assert [model.label(i) for i in range(3)] == ["a.csv", "folder", "/"]
+    assert not any(model.is_header(i) for i in range(3))
+    model.toggle(0)
+    model.clear()
+    assert len(model) == 0
+    model.add(["/in/x.csv"])
+    assert model.checked_paths() == ["/in/x.csv"]
+
+
+def test_only_rows_in_view_are_drawn(gui):
+    model = gui.FileListModel()
+    model.add([f"/in/f{i}.csv" for i in range(100_000)])
+    view, canvas = _list(gui, model)
+    # 240 px / 24 px rows: ten rows, plus one partly shown
+    assert canvas.texts() == [f"f{i}.csv" for i in range(11)]
+    assert view.scrollbar.view == (0.0, 10 / 100_000)
+
+    view.yview("moveto", "0.5")
+    assert canvas.texts()[0] == "f50000.csv" and len(canvas.texts()) == 11
+    view.yview("scroll", 1, "pages")
+    assert view.top == 50_010
+    view.yview("scroll", -3, "units")
+    assert view.top == 50_007
+    view.yview("moveto", "1.0")
+    assert view.top == 100_000 - 10  # never past the last full page
+    view.yview("scroll", -1_000_000, "pages")
+    assert view.top == 0
+
+
+def test_click_toggles_the_row_under_the_pointer(gui):
+    model = gui.FileListModel()
+    model.add(["/in/a.csv", "/in/b.csv"])
+    view, canvas = _list(gui, model)
+    ticks = lambda: sum(kind == "line" for kind, _, _ in canvas.items)  # noqa: E731
+    assert ticks() == 2
+    canvas.bindings["<Button-1>"](SimpleNamespace(y=30))  # second row
+    assert model.checked_paths() == ["/in/a.csv"] and ticks() == 1
+    canvas.bindings["<Button-1>"](SimpleNamespace(y=200))  # below the rows
+    assert model.checked_paths() == ["/in/a.csv"]
+    canvas.bindings["<MouseWheel>"](SimpleNamespace(delta=-120))
+    assert view.top == 0  # everything fits; nothing to scroll
+
+
+def test_headers_are_bold_and_rows_indented(gui):
+    model = gui.SheetSelectionModel({"/in/book.xlsx": ["One", "Two"]})
+    _, canvas = _list(gui, model, font=("Segoe UI", 11), indent=16)
+    texts = [(coords[0], kw["font"]) for kind, coords, kw in canvas.items
+             if kind == "text"]
+    assert texts == [(28, ("Segoe UI", 11, "bold")),
+                     (44, ("Segoe UI", 11)), (44, ("Segoe UI", 11))]
+
+
+@pytest.mark.parametrize("rows", [0, 3])
+def test_short_lists_fill_the_scrollbar(gui, rows):
+    model = gui.FileListModel()
+    model.add([f"/in/f{i}.csv" for i in range(rows)])
+    view, canvas = _list(gui, model)
+    assert len(canvas.texts()) == rows
+    assert view.scrollbar.view[0] == 0.0
+    assert view.scrollbar.view[1] == 1.0
@@ -0,0 +1,108 @@
+# tests/test_gui_scan.py
+import queue
+from types import SimpleNamespace
+
+import pytest
+
+from file_converter.manifest import MANIFEST_NAME
+from file_converter.scan import InputScanner
+
+openpyxl = pytest.importorskip("openpyxl")
+
+
+class _Widget:
+    def __init__(self):
+        self.options = {}
+
+    def config(self, **kw):
+        self.options.update(kw)
+
+    def set(self, value):
+        self.options["value"] = value
+
+
+@pytest.fixture
+def folder(tmp_path):
+    root = tmp_path / "in"
+    (root / "sub").mkdir(parents=True)
+    (root / "a.csv").write_text("a\n1\n", encoding="utf-8")
+    (root / "sub" / "b.tsv").write_text("b\n2\n", encoding="utf-8")
+    (root / "notes.bin").write_bytes(b"\0\1\2")
+    (root / MANIFEST_NAME).write_text("{}", encoding="utf-8")
+    wb = openpyxl.Workbook()
+    wb.active.title = "Data"
+    wb.active.append(["x"])
+    wb.save(root / "sub" / "book.xlsx")
+    return root
+
+
+def _scan(gui, paths, scanner):
+    q = queue.Queue()
+    gui.FileConverterApp._scan_worker(paths, scanner, q)
+    messages = []
+    while not q.empty():
+        messages.append(q.get())
+    return messages
+
+
+def test_scan_posts_supported_files_then_workbooks(gui, folder):
+    scanner = InputScanner(skip_names=(MANIFEST_NAME,), batch_size=2)
+    messages = _scan(gui, [str(folder)], scanner)
+    *files, done = messages
+    assert all(kind == "files" and len(batch) <= 2 for kind, batch in files)
+    found = sorted(p for _, batch in files for p in batch)
+    book = str(folder / "sub" / "book.xlsx")
+    assert found == sorted([str(folder / "a.csv"), book,
+                            str(folder / "sub" / "b.tsv")])
+    assert done == ("done", {book: ["Data"]})
+
+
+def test_rescan_adds_only_new_paths(gui, folder):
+    scanner = InputScanner(skip_names=(MANIFEST_NAME,))
+    _scan(gui, [str(folder)], scanner)
+    (folder / "c.csv").write_text("c\n3\n", encoding="utf-8")
+    messages = _scan(gui, [str(folder), str(folder / "a.csv")], scanner)
+    assert messages == [("files", [str(folder / "c.csv")]), ("done", {})]
+
+
+def test_cancelled_scan_posts_only_done(gui, folder):
+    scanner = InputScanner()
+    scanner.cancel.set()
+    assert _scan(gui, [str(folder)], scanner) == [("done", {})]
+
+
+def _app(gui, q, pending=()):
+    app = SimpleNamespace(
+        _scan_queue=q, _scan_pending=list(pending), _scan_found=0,
+        status_label=_Widget(), progress_var=_Widget(), rows=[],
+        started=[], polls=[])
+    app._add_file_rows = app.rows.extend
+    app._start_scan = lambda: app.started.append(app._scan_pending)
+    app.after = lambda ms, fn, *args: app.polls.append(args)
+    app._poll_scan_queue = None  # rescheduled, not called, in these tests
+    app._finish_scan = lambda: gui.FileConverterApp._finish_scan(app)
+    return app
+
+
+def test_poll_adds_rows_and_starts_the_queued_scan(gui):
+    q = queue.Queue()
+    app = _app(gui, q, pending=["dropped later"])
+    q.put(("files", ["a.csv", "b.csv"]))
+    gui.FileConverterApp._poll_scan_queue(app, q)
+    assert app.rows == ["a.csv", "b.csv"]
+    assert app.status_label.options["text"] == "Loading files: 2"
+    assert app.polls == [(q,)]  # polls again until "done"
+
+    q.put(("done", {}))
+    gui.FileConverterApp._poll_scan_queue(app, q)
+    assert app._scan_queue is None
+    assert app.status_label.options["text"] == "Ready"
+    assert app.started == [["dropped later"]]
+
+
+def test_poll_ignores_a_cleared_scan(gui):
+    stale = queue.Queue()
+    stale.put(("files", ["a.csv"]))
+    app = _app(gui, queue.Queue())
+    gui.FileConverterApp._poll_scan_queue(app, stale)
+    assert app.rows == [] and app.polls == []
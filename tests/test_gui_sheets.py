@@ -0,0 +1,86 @@
+# tests/test_gui_sheets.py
+import pytest
+
+from file_converter.sheet_rules import SheetRules
+
+openpyxl = pytest.importorskip("openpyxl")
+
+SHEETS = {"/in/sales.xlsx": ["Jan", "Feb", "Notes"],
+          "/in/costs.xlsx": ["Jan", "Summary"]}
+
+
+def _rows(model):
+    return [(model.is_header(i), model.label(i), model.is_checked(i))
+            for i in range(len(model))]
+
+
+def test_every_sheet_starts_checked(gui):
+    model = gui.SheetSelectionModel(SHEETS)
+    assert _rows(model) == [
+        (True, "sales.xlsx  (3/3)", True), (False, "Jan", True),
+        (False, "Feb", True), (False, "Notes", True),
+        (True, "costs.xlsx  (2/2)", True), (False, "Jan", True),
+        (False, "Summary", True)]
+    assert model.selected_count() == 5
+    assert model.result() == SHEETS
+
+
+def test_search_narrows_rows_but_keeps_the_selection(gui):
+    model = gui.SheetSelectionModel(SHEETS)
+    model.search(" JAN ")
+    assert [model.label(i) for i in range(len(model))] == [
+        "sales.xlsx  (3/3)", "Jan", "costs.xlsx  (2/2)", "Jan"]
+    model.search("costs")  # a workbook name shows all of its sheets
+    assert [model.label(i) for i in range(len(model))] == [
+        "costs.xlsx  (2/2)", "Jan", "Summary"]
+    model.search("nothing like it")
+    assert len(model) == 0
+    assert model.selected_count() == 5
+
+
+def test_header_toggles_only_the_sheets_shown(gui):
+    model = gui.SheetSelectionModel(SHEETS)
+    model.search("jan")
+    model.toggle(0)  # sales.xlsx header: uncheck its shown "Jan"
+    assert model.result()["/in/sales.xlsx"] == ["Feb", "Notes"]
+    assert not model.is_checked(0)
+    model.search("")
+    assert model.label(0) == "sales.xlsx  (2/3)"
+    assert not model.is_checked(0)  # not every sheet is checked
+    model.toggle(0)
+    assert model.result()["/in/sales.xlsx"] == ["Jan", "Feb", "Notes"]
+
+
+def test_sheet_toggle_and_set_shown(gui):
+    model = gui.SheetSelectionModel(SHEETS)
+    model.toggle(3)  # Notes
+    assert model.result()["/in/sales.xlsx"] == ["Jan", "Feb"]
+    model.search("jan")
+    model.set_shown(False)
+    assert model.result() == {"/in/sales.xlsx": ["Feb"],
+                              "/in/costs.xlsx": ["Summary"]}
+    model.search("")
+    model.set_shown(True)
+    assert model.result() == SHEETS
+
+
+def test_rules_replace_the_selection(gui, tmp_path):
+    path = str(tmp_path / "book.xlsx")
+    wb = openpyxl.Workbook()
+    wb.active.title = "Data"
+    wb.active.append(["a"])
+    wb.active.append([1])
+    hidden = wb.create_sheet("Old")
+    hidden.append(["a"])
+    hidden.append([2])
+    hidden.sheet_state = "hidden"
+    wb.create_sheet("Empty")
+    wb.save(path)
+    model = gui.SheetSelectionModel({path: ["Data", "Old", "Empty"],
+                                     "/in/missing.xlsx": ["Jan", "Feb"]})
+    model.apply_rules(SheetRules(skip_hidden=True, skip_empty=True,
+                                 exclude="^Feb$"))
+    # The missing workbook falls back to its listed sheet names
+    assert model.result() == {path: ["Data"], "/in/missing.xlsx": ["Jan"]}
+    model.apply_rules(SheetRules(first_only=True))
+    assert model.result() == {path: ["Data"], "/in/missing.xlsx": ["Jan"]}
@@ -0,0 +1,68 @@
+# tests/test_html_tables.py
+import json
+
+import pytest
+
+pytest.importorskip("lxml")
+
+from file_converter import readers  # noqa: E402
+from file_converter.batch import convert_file  # noqa: E402
+from file_converter.cli import main  # noqa: E402
+from file_converter.options import ConvertOptions  # noqa: E402
+
+DOC = """<html><body>
+<table id="a"><tr><th>x</th></tr><tr><td>1</td></tr></table>
+<table><tr><td></td></tr></table>
+<table id="b"><tr><th>y</th></tr><tr><td>2</td></tr><tr><td>3</td></tr></table>
+</body></html>
+"""
+
+
+@pytest.fixture
+def page(tmp_path):
+    path = tmp_path / "page.html"
+    path.write_text(DOC, encoding="utf-8")
+    return str(path)
+
+
+def test_all_tables_from_one_parse(page, tmp_path, monkeypatch):
+    parses = []
+    parse = readers._html_tables
+    monkeypatch.setattr(readers, "_html_tables",
+                        lambda *a: parses.append(a) or parse(*a))
+    out = tmp_path / "out"
+    out.mkdir()
+    result = convert_file(page, str(out), "json",
+                          options=ConvertOptions(html_tables="all"))
+    assert result["status"] == "ok" and result["rows"] == 3
+    assert len(parses) == 1
+    assert [p.rsplit("_", 1)[1] for p in result["outputs"]] == [
+        "table0.json", "table2.json"]
+    with open(result["outputs"][1], encoding="utf-8") as f:
+        assert json.load(f) == [{"y": 2}, {"y": 3}]
+
+
+@pytest.mark.parametrize("selector, expected", [
+    (None, [0]), ("#b", [2]), ("y", [2]), ("-1", [2]), ("all", [0, 1, 2])])
+def test_selectors(page, selector, expected):
+    assert [i for i, _ in readers.iter_html_tables(page, selector=selector)
+            ] == expected
+
+
+def test_default_table_is_framed_once(page, monkeypatch):
+    framed = []
+    frame = readers._html_table_frame
+    monkeypatch.setattr(readers, "_html_table_frame",
+                        lambda t: framed.append(t) or frame(t))
+    [(index, df)] = readers.read_html_tables(page)
+    assert index == 0 and df["x"].tolist() == [1]
+    assert len(framed) == 1
+
+
+def test_selector_applies_to_one_run_only(page, tmp_path, capsys):
+    for out, flags in (("all", ["--html-tables", "all"]), ("default", [])):
+        assert main(["convert", page, "--to", "csv", "-j", "1", "-q",
+                     "--out", str(tmp_path / out), *flags]) == 0
+    assert sorted(p.name for p in (tmp_path / "all").iterdir()) == [
+        "page_table0.csv", "page_table2.csv"]
+    assert [p.name for p in (tmp_path / "default").iterdir()] == ["page.csv"]
@@ -0,0 +1,43 @@
+# tests/test_json_stream.py
+import json
+
+import pandas as pd
+import pytest
+
+from file_converter import readers
+
+# "v" is int for the first two records and widens to float / null later;
+# "flag" only turns up in the last record
+RECORDS = [{"id": 1, "v": 1}, {"id": 2, "v": 2}, {"id": 3, "v": 3.5},
+           {"id": 4, "v": None}, {"id": 5, "v": 5, "flag": True}]
+
+
+def _write(path, records, lines):
+    with open(path, "w", encoding="utf-8") as f:
+        if lines:
+            f.write("\n".join(json.dumps(r) for r in records) + "\n")
+        else:
+            json.dump(records, f)
+    return str(path)
+
+
+@pytest.mark.parametrize("lines", [True, False])
+@pytest.mark.parametrize("chunksize", [1, 2, 3])
+def test_type_change_across_chunk_boundary(tmp_path, lines, chunksize):
+    path = _write(tmp_path / ("t.jsonl" if lines else "t.json"), RECORDS,
+                  lines)
+    expected = pd.DataFrame.from_records(RECORDS,
+                                         columns=["id", "v", "flag"])
+    chunks = list(readers.iter_json_chunks(path, chunksize))
+    assert {str(c["v"].dtype) for c in chunks} == {"float64"}
+    assert chunks[0]["v"].tolist()[:1] == [1.0]
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True),
+                                  expected, check_exact=True)
+
+
+def test_arrays_of_arrays_keep_whole_file_dtypes(tmp_path):
+    rows = [[1, "a"], [2], [3.5, "c"]]
+    path = _write(tmp_path / "t.json", rows, lines=False)
+    expected = pd.DataFrame.from_records(rows, columns=[0, 1])
+    got = pd.concat(readers.iter_json_chunks(path, 1), ignore_index=True)
+    pd.testing.assert_frame_equal(got, expected, check_exact=True)
@@ -0,0 +1,127 @@
+# tests/test_legacy_cache.py
+import os
+import shutil
+
+import pandas as pd
+import pytest
+
+from file_converter.batch import convert_file
+from file_converter.detect import OLE_SIGNATURE
+from file_converter.workbook import WorkbookMetaCache, WorkbookSession
+from file_converter.xls import (LegacyWorkbookCache, builtin_save_as,
+                                get_xls_sheet_names, read_xls_selected_sheets)
+
+openpyxl = pytest.importorskip("openpyxl")
+
+
+class FakeBackend:
+    """Stands in for Excel COM: writes a fixed two-sheet .xlsx."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, src, dst):
+        assert not os.path.exists(dst)
+        self.calls.append(src)
+        wb = openpyxl.Workbook()
+        wb.active.title = "Summary"
+        wb.active.append(["total"])
+        wb.active.append([3])
+        ws = wb.create_sheet("Detail")
+        ws.append(["id", "name"])
+        ws.append([1, "a"])
+        ws.append([2, "b"])
+        wb.save(dst)
+
+
+@pytest.fixture
+def backend():
+    return FakeBackend()
+
+
+@pytest.fixture
+def legacy(tmp_path, backend):
+    return LegacyWorkbookCache(backend, cache_dir=str(tmp_path / "legacy"))
+
+
+def _old_xls(path, filler=b"\0"):
+    """An OLE file the built-in reader can't open (no Workbook stream)."""
+    path.write_bytes(OLE_SIGNATURE + filler * 600)
+    return str(path)
+
+
+def test_converted_once_per_content(tmp_path, legacy, backend):
+    src = _old_xls(tmp_path / "a.xls")
+    first = legacy.xlsx_path(src)
+    assert legacy.xlsx_path(src) == first
+    copy = str(tmp_path / "copy of a.xls")
+    shutil.copy(src, copy)
+    assert legacy.xlsx_path(copy) == first
+    assert backend.calls == [src]
+    other = _old_xls(tmp_path / "b.xls", b"\1")
+    assert legacy.xlsx_path(other) != first
+    assert backend.calls == [src, other]
+    assert sorted(os.listdir(legacy.cache_dir)) == sorted(
+        os.path.basename(p) for p in (first, legacy.xlsx_path(other)))
+
+
+def test_failed_conversion_leaves_nothing(tmp_path):
+    def broken(src, dst):
+        open(dst, "wb").close()
+        raise OSError("Excel crashed")
+    legacy = LegacyWorkbookCache(broken, cache_dir=str(tmp_path / "legacy"))
+    with pytest.raises(OSError):
+        legacy.xlsx_path(_old_xls(tmp_path / "a.xls"))
+    assert os.listdir(legacy.cache_dir) == []
+
+
+def test_oldest_intermediates_pruned(tmp_path, backend):
+    legacy = LegacyWorkbookCache(backend, cache_dir=str(tmp_path / "legacy"),
+                                 max_entries=2)
+    paths = []
+    for i in range(3):
+        paths.append(legacy.xlsx_path(
+            _old_xls(tmp_path / f"{i}.xls", bytes([i]))))
+        os.utime(paths[-1], (i, i))
+    assert sorted(os.listdir(legacy.cache_dir)) == sorted(
+        os.path.basename(p) for p in paths[1:])
+
+
+def test_listing_and_reading_share_the_intermediate(tmp_path, legacy,
+                                                    backend):
+    src = _old_xls(tmp_path / "a.xls")
+    assert get_xls_sheet_names(src, legacy) == ["Summary", "Detail"]
+    [(sheet, df)] = read_xls_selected_sheets(src, ["Detail"], legacy)
+    assert sheet == "Detail" and df["name"].tolist() == ["a", "b"]
+    assert backend.calls == [src]
+
+
+def test_session_lists_and_converts_with_one_conversion(tmp_path, legacy,
+                                                        backend):
+    src = _old_xls(tmp_path / "a.xls")
+    cache = WorkbookMetaCache(str(tmp_path / "meta.sqlite"))
+    with WorkbookSession(cache, legacy=legacy) as session:
+        assert session.needs_intermediate(src)
+        assert session.info(src).sheets == ["Summary", "Detail"]
+        result = convert_file(src, str(tmp_path), "csv",
+                              sheets=["Summary", "Detail"], session=session)
+    assert result["status"] == "ok" and result["rows"] == 3
+    assert [os.path.basename(p) for p in result["outputs"]] == \
+        ["a_Summary.csv", "a_Detail.csv"]
+    assert backend.calls == [src]
+
+
+def test_builtin_backend_round_trip(tmp_path):
+    xlwt = pytest.importorskip("xlwt")
+    src = str(tmp_path / "book.xls")
+    wb = xlwt.Workbook()
+    ws = wb.add_sheet("Data")
+    for r, row in enumerate([["id", "name"], [1, "a"], [2, ""]]):
+        for c, v in enumerate(row):
+            ws.write(r, c, v)
+    wb.save(src)
+    dst = str(tmp_path / "book.xlsx")
+    builtin_save_as(src, dst)
+    df = pd.read_excel(dst, sheet_name="Data")
+    assert df["id"].tolist() == [1, 2]
+    assert df["name"].iloc[0] == "a" and pd.isna(df["name"].iloc[1])
@@ -0,0 +1,82 @@
+# tests/test_manifest.py
+import os
+import json
+
+from file_converter import manifest
+
+
+def _recorded(tmp_path):
+    src, out = tmp_path / "in.csv", tmp_path / "out"
+    src.write_text("a\n1\n", encoding="utf-8")
+    out.mkdir()
+    (out / "in.json").write_text("[]", encoding="utf-8")
+    m = manifest.OutputManifest(str(out))
+    m.record(str(src), [str(out / "in.json")], "json")
+    m.save()
+    return str(src), str(out)
+
+
+def test_current_after_record(tmp_path):
+    src, out = _recorded(tmp_path)
+    assert manifest.OutputManifest(out).is_current(src, "json")
+
+
+def test_output_version_change_reconverts(tmp_path, monkeypatch):
+    src, out = _recorded(tmp_path)
+    monkeypatch.setattr(manifest, "OUTPUT_VERSION",
+                        manifest.OUTPUT_VERSION + 1)
+    assert not manifest.OutputManifest(out).is_current(src, "json")
+
+
+def test_entries_without_output_version_are_stale(tmp_path):
+    src, out = _recorded(tmp_path)
+    path = manifest.OutputManifest(out).path
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    for entry in data["files"].values():
+        entry.pop("output_version")
+        entry["version"] = "3.0"  # as written before OUTPUT_VERSION existed
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    assert not manifest.OutputManifest(out).is_current(src, "json")
+
+
+def test_new_input_does_not_take_recorded_output_name(tmp_path):
+    # b/data.csv is converted alone, then a/data.csv (numbered first when
+    # both are walked) joins the folder: b keeps data.json and stays
+    # skipped, a gets data_2.json
+    from file_converter.batch import collect_inputs, convert_batch
+
+    src, out = tmp_path / "in", tmp_path / "out"
+    (src / "a").mkdir(parents=True)
+    (src / "b").mkdir()
+    out.mkdir()
+    (src / "b" / "data.csv").write_text("v\nb\n", encoding="utf-8")
+    first = convert_batch(collect_inputs([str(src)]), str(out), "json",
+                          jobs=1, incremental=True)
+    assert [r["output"] for r in first] == [str(out / "data.json")]
+
+    (src / "a" / "data.csv").write_text("v\na\n", encoding="utf-8")
+    inputs = collect_inputs([str(src)])
+    assert inputs[0].endswith(os.path.join("a", "data.csv"))
+    second = convert_batch(inputs, str(out), "json", jobs=1,
+                           incremental=True)
+    assert [r["status"] for r in second] == ["ok", "skipped"]
+    assert second[0]["output"] == str(out / "data_2.json")
+    assert json.loads((out / "data.json").read_text()) == [{"v": "b"}]
+    assert json.loads((out / "data_2.json").read_text()) == [{"v": "a"}]
+    entries = manifest.OutputManifest(str(out)).entries
+    assert sorted(e["outputs"][0] for e in entries.values()) == [
+        "data.json", "data_2.json"]
+
+    third = convert_batch(collect_inputs([str(src)]), str(out), "json",
+                          jobs=1, incremental=True)
+    assert [r["status"] for r in third] == ["skipped", "skipped"]
+
+
+def test_recorded_under_another_name_is_not_current(tmp_path):
+    src, out = _recorded(tmp_path)
+    m = manifest.OutputManifest(out)
+    m.entries[os.path.abspath(src)]["base"] = "in"
+    assert m.is_current(src, "json", base="in")
+    assert not m.is_current(src, "json", base="in_2")
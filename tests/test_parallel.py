@@ -0,0 +1,98 @@
+# tests/test_parallel.py
+import pandas as pd
+import pytest
+
+from file_converter import batch, parallel
+from file_converter.options import ConvertOptions
+from file_converter.parallel import concat_sheets, parse_sheets, sheet_workers
+
+MB = 1024 * 1024
+
+
+@pytest.fixture
+def sizes(monkeypatch):
+    """Sheet part sizes seen by sheet_workers, on a machine with 8 CPUs."""
+    sizes = [8 * MB, 8 * MB, 8 * MB, 8 * MB]
+    monkeypatch.setattr(parallel, "_sheet_bytes", lambda path: sizes)
+    monkeypatch.setattr(parallel, "_cpu_count", lambda: 8)
+    monkeypatch.delenv("FILE_CONVERTER_SHEET_JOBS", raising=False)
+    monkeypatch.delenv("FILE_CONVERTER_MAX_MEMORY_MB", raising=False)
+    return sizes
+
+
+def test_one_worker_per_cpu_up_to_the_sheet_count(sizes):
+    assert sheet_workers("b.xlsx", 4) == 4
+    assert sheet_workers("b.xlsx", 20) == 8
+    assert sheet_workers("b.xlsx", 20, jobs=3) == 3
+
+
+def test_jobs_from_the_environment(sizes, monkeypatch):
+    monkeypatch.setenv("FILE_CONVERTER_SHEET_JOBS", "2")
+    assert sheet_workers("b.xlsx", 20) == 2
+    assert sheet_workers("b.xlsx", 20, jobs=5) == 5
+
+
+def test_in_process_when_not_worth_a_pool(sizes, monkeypatch):
+    assert sheet_workers("b.xlsx", 1) == 1
+    sizes[:] = [MB, MB]  # under PARALLEL_MIN_BYTES in total
+    assert sheet_workers("b.xlsx", 2) == 1
+    sizes[:] = [8 * MB, 8 * MB]
+    monkeypatch.setattr(parallel.multiprocessing, "parent_process",
+                        lambda: object())
+    assert sheet_workers("b.xlsx", 2) == 1
+
+
+def test_memory_cap_with_a_given_footprint(sizes):
+    assert sheet_workers("b.xlsx", 20, max_memory_mb=1000,
+                         per_worker_mb=300) == 3
+    assert sheet_workers("b.xlsx", 20, max_memory_mb=100,
+                         per_worker_mb=300) == 1
+
+
+def test_memory_cap_estimated_from_the_largest_sheet(sizes, monkeypatch):
+    sizes[:] = [100 * MB, MB, MB, MB]
+    per_worker = parallel.WORKER_BASE_MB + parallel.PARSE_MEMORY_FACTOR * 100
+    assert sheet_workers("b.xlsx", 4, max_memory_mb=2 * per_worker) == 2
+    monkeypatch.setenv("FILE_CONVERTER_MAX_MEMORY_MB", str(3 * per_worker))
+    assert sheet_workers("b.xlsx", 4) == 3
+
+
+def test_stream_convert_sheets_caps_memory_from_options(monkeypatch):
+    seen = []
+
+    def workers(path, n, jobs=None, max_memory_mb=None, per_worker_mb=None):
+        seen.append((n, max_memory_mb, per_worker_mb))
+        return 1
+    monkeypatch.setattr(batch, "sheet_workers", workers)
+    monkeypatch.setattr(batch, "stream_convert", lambda *a, **kw: 0)
+    batch.stream_convert_sheets("b.xlsx", [("A", "a.csv"), ("B", "b.csv")],
+                                "csv",
+                                options=ConvertOptions(max_memory_mb=600))
+    assert seen == [(2, 600, parallel.WORKER_BASE_MB)]
+
+
+def test_pool_keeps_sheet_order(tmp_path, monkeypatch):
+    openpyxl = pytest.importorskip("openpyxl")
+    path = str(tmp_path / "book.xlsx")
+    wb = openpyxl.Workbook()
+    wb.remove(wb.active)
+    for name in "CAB":
+        ws = wb.create_sheet(name)
+        ws.append(["v"])
+        ws.append([name])
+    wb.save(path)
+    monkeypatch.setattr(parallel, "PARALLEL_MIN_BYTES", 0)
+    assert sheet_workers(path, 3, jobs=3) == 3
+    parsed = parse_sheets(path, ["C", "A", "B"], jobs=3)
+    assert [sheet for sheet, _ in parsed] == ["C", "A", "B"]
+    df = concat_sheets(parsed)
+    assert df["v"].tolist() == df["SheetName"].tolist() == ["C", "A", "B"]
+
+    assert [s for s, _ in parse_sheets(path, ["A", "nope", "B"], jobs=3,
+                                       errors="skip")] == ["A", "B"]
+    with pytest.raises(ValueError, match="nope"):
+        parse_sheets(path, ["A", "nope"], jobs=2)
+
+
+def test_concat_sheets_of_nothing():
+    assert concat_sheets([("A", pd.DataFrame())]).empty
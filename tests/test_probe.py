@@ -0,0 +1,104 @@
+# tests/test_probe.py
+import builtins
+import gzip
+import zipfile
+
+import pytest
+
+from file_converter import detect
+from file_converter.detect import (ARROW_SIGNATURE, OLE_SIGNATURE,
+                                   PARQUET_SIGNATURE, clear_probe_cache,
+                                   probe_file)
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    clear_probe_cache()
+    yield
+    clear_probe_cache()
+
+
+@pytest.fixture
+def opens(monkeypatch):
+    """Paths opened through the built-in open() by the detect module."""
+    opened = []
+
+    def counting(path, *args, **kw):
+        opened.append(str(path))
+        return builtins.open(path, *args, **kw)
+
+    monkeypatch.setattr(detect, "open", counting, raising=False)
+    return opened
+
+
+def _file(tmp_path, name, data):
+    path = tmp_path / name
+    path.write_bytes(data if isinstance(data, bytes) else data.encode())
+    return str(path)
+
+
+@pytest.mark.parametrize("name, data, fmt, delimiter, confidence", [
+    ("a.csv", "a;b;c\n1;2;3\n4;5;6\n", "delimited", ";", 0.9),
+    ("a.dat", "a|b\n1|2\n3|4\n", "delimited", "|", 0.9),
+    ("a.tsv", "a,b\n1,2\n", "tab", "\t", 0.7),
+    ("a.txt", "a\tb\n1\t2\n3\t4\n", "tab", "\t", 0.9),
+    ("a.json", ' [{"a": 1}]', "json", None, 0.9),
+    ("a.jsonl", '{"a": 1}\n', "jsonl", None, 0.9),
+    ("a.xml", "﻿<rows/>", "xml", None, 0.9),
+    ("a.html", "plain text", "html", None, 0.5),
+    ("a.bin", OLE_SIGNATURE + b"\0" * 100, "xls", None, 1.0),
+    ("a.xls", b"not ole", "xls", None, 0.5),
+    ("a.dat", PARQUET_SIGNATURE + b"\0" * 10, "parquet", None, 1.0),
+    ("a.dat", ARROW_SIGNATURE + b"\0" * 10, "arrow", None, 1.0),
+    ("a.arrow", b"\xff\xff\xff\xff", "arrow", None, 0.5),
+])
+def test_format_from_one_read(tmp_path, opens, name, data, fmt, delimiter,
+                              confidence):
+    path = _file(tmp_path, name, data)
+    probe = probe_file(path)
+    assert (probe.format, probe.delimiter, probe.confidence) == \
+        (fmt, delimiter, confidence)
+    assert opens == [path]
+
+
+def test_text_probe_carries_encoding(tmp_path):
+    probe = probe_file(_file(tmp_path, "a.csv", "é,b\n1,2\n".encode("latin1")))
+    assert (probe.encoding, probe.encoding_checked) == ("latin1", True)
+    assert probe_file(_file(tmp_path, "b.parquet", PARQUET_SIGNATURE)) \
+        .encoding is None
+
+
+def test_unchanged_file_is_read_once(tmp_path, opens):
+    path = _file(tmp_path, "a.csv", "a,b\n1,2\n")
+    first = probe_file(path)
+    assert probe_file(path) is first
+    assert opens == [path]
+    clear_probe_cache()
+    assert probe_file(path) == first and opens == [path, path]
+
+
+def test_cache_is_bounded(tmp_path, monkeypatch):
+    monkeypatch.setattr(detect, "PROBE_CACHE_SIZE", 2)
+    paths = [_file(tmp_path, f"{i}.csv", "a\n1\n") for i in range(3)]
+    for p in paths:
+        probe_file(p)
+    assert len(detect._probe_cache) == 2
+    assert [k[0] for k in detect._probe_cache] == [
+        str(tmp_path / "1.csv"), str(tmp_path / "2.csv")]
+
+
+def test_compressed_and_bundled_content(tmp_path):
+    gz = tmp_path / "s.tsv.gz"
+    gz.write_bytes(gzip.compress(b"a\tb\n1\t2\n"))
+    probe = probe_file(str(gz))
+    assert (probe.format, probe.compression, probe.name) == \
+        ("tab", "gzip", str(tmp_path / "s.tsv"))
+    assert not probe.is_excel
+
+    bundle = tmp_path / "drop.zip"
+    with zipfile.ZipFile(bundle, "w") as zf:
+        zf.writestr("q1/data.csv", "a;b\n1;2\n")
+    assert probe_file(str(bundle)).format == "zip"
+    member = probe_file(str(bundle), member="q1/data.csv")
+    assert (member.format, member.delimiter, member.member) == \
+        ("delimited", ";", "q1/data.csv")
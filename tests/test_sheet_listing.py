@@ -0,0 +1,118 @@
+# tests/test_sheet_listing.py
+import struct
+import zipfile
+
+import pytest
+
+from file_converter import sheets
+from file_converter.sheets import SheetEntry, list_sheets
+from file_converter.workbook import get_workbook_info
+
+openpyxl = pytest.importorskip("openpyxl")
+
+
+@pytest.fixture
+def no_openpyxl(monkeypatch):
+    """Listing must not load the workbook."""
+    def refuse(*args, **kw):
+        raise AssertionError("workbook opened")
+    monkeypatch.setattr(openpyxl, "load_workbook", refuse)
+
+
+def test_xlsx_from_the_manifest(tmp_path, no_openpyxl):
+    path = str(tmp_path / "book.xlsx")
+    wb = openpyxl.Workbook()
+    wb.active.title = "Data"
+    for i in range(50):
+        wb.active.append([i, i, i])
+    hidden = wb.create_sheet("Old")
+    hidden.sheet_state = "hidden"
+    hidden["B2"] = 1
+    wb.create_sheet("Blank")
+    wb.save(path)
+    assert list_sheets(path) == [SheetEntry("Data", "visible", "A1:C50", 50),
+                                 SheetEntry("Old", "hidden", "B2:B2", 2),
+                                 # an empty sheet records A1, as Excel does
+                                 SheetEntry("Blank", "visible", "A1:A1", 1)]
+    assert list_sheets(path, with_dimensions=False) == [
+        SheetEntry("Data"), SheetEntry("Old", "hidden"), SheetEntry("Blank")]
+
+
+def test_only_the_head_of_a_sheet_is_read(tmp_path, monkeypatch):
+    path = str(tmp_path / "big.xlsx")
+    wb = openpyxl.Workbook()
+    for i in range(5000):
+        wb.active.append([f"row {i}"] * 5)
+    wb.save(path)
+    reads = []
+    head = sheets._read_part_head
+    monkeypatch.setattr(sheets, "_read_part_head",
+                        lambda zf, name, n: reads.append(n) or head(zf, name, n))
+    [entry] = list_sheets(path)
+    assert entry.rows == 5000
+    assert reads == [sheets.DIMENSION_SCAN_BYTES]
+
+
+def test_xls_from_the_boundsheet_records(tmp_path):
+    xlwt = pytest.importorskip("xlwt")
+    path = str(tmp_path / "book.xls")
+    wb = xlwt.Workbook()
+    data = wb.add_sheet("Data")
+    for r in range(3):
+        for c in range(2):
+            data.write(r, c, r * c)
+    wb.add_sheet("Empty")
+    wb.save(path)
+    assert list_sheets(path) == [SheetEntry("Data", "visible", "A1:B3", 3),
+                                 SheetEntry("Empty", "visible", None, 0)]
+    info = get_workbook_info(path)
+    assert info.sheets == ["Data", "Empty"]
+    assert info.rows == {"Data": 3, "Empty": 0}
+
+
+def _biff12(rtype: int, payload: bytes) -> bytes:
+    def varint(value):
+        out = bytearray()
+        while True:
+            byte, value = value & 0x7F, value >> 7
+            out.append(byte | (0x80 if value else 0))
+            if not value:
+                return bytes(out)
+    return varint(rtype) + varint(len(payload)) + payload
+
+
+def _wide(text: str) -> bytes:
+    return struct.pack("<I", len(text)) + text.encode("utf-16-le")
+
+
+def test_xlsb_from_the_bundle_records(tmp_path):
+    path = str(tmp_path / "book.xlsb")
+    workbook = b"".join(
+        _biff12(0x9C, struct.pack("<II", state, i) + _wide(f"rId{i}")
+                + _wide(name))
+        for i, (state, name) in enumerate([(0, "Jan"), (1, "Ünter")], 1))
+    workbook += _biff12(0x90, b"") + _biff12(0x9C, b"ignored after the end")
+    rels = ('<Relationships xmlns="http://schemas.openxmlformats.org/'
+            'package/2006/relationships">'
+            '<Relationship Id="rId1" Target="worksheets/sheet1.bin"/>'
+            '</Relationships>')
+    sheet = _biff12(0x94, struct.pack("<4I", 0, 9, 0, 3)) + \
+        _biff12(0x91, b"")
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.writestr("xl/workbook.bin", workbook)
+        zf.writestr("xl/_rels/workbook.bin.rels", rels)
+        zf.writestr("xl/worksheets/sheet1.bin", sheet)
+    assert list_sheets(path) == [SheetEntry("Jan", "visible", "A1:D10", 10),
+                                 SheetEntry("Ünter", "hidden")]
+
+
+@pytest.mark.parametrize("content", [b"a,b\n1,2\n", b"PK\x03\x04junk"])
+def test_other_files_raise_value_error(tmp_path, content):
+    path = tmp_path / "x.xlsx"
+    path.write_bytes(content)
+    with pytest.raises(ValueError):
+        list_sheets(str(path))
+    with zipfile.ZipFile(tmp_path / "plain.zip", "w") as zf:
+        zf.writestr("a.csv", "a\n")
+    with pytest.raises(ValueError):
+        list_sheets(str(tmp_path / "plain.zip"))
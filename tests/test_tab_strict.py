@@ -0,0 +1,117 @@
+# tests/test_tab_strict.py
+"""
+read_tab_strict / iter_tab_strict post-processing against the original
+per-cell implementation, kept here as the oracle, on a generated corpus
+of royalty statements.
+"""
+
+import random
+
+import pandas as pd
+import pytest
+
+from file_converter import readers
+from file_converter.readers import _TAB_READ_KW, iter_tab_strict, read_tab_strict
+
+# -------------------------------
+# Oracle: the trim / normalise code before vectorisation
+# -------------------------------
+
+
+def _old_normalize_plus_padded(s):
+    if not isinstance(s, str):
+        return s
+    s2 = s[1:] if s.startswith("+") else s
+    if "." in s2:
+        left, right = s2.split(".", 1)
+        if left.isdigit():
+            left_norm = "0" if int(left) == 0 else str(int(left))
+            return f"{left_norm}.{right}"
+    if s2.isdigit():
+        return "0" if int(s2) == 0 else str(int(s2))
+    return s
+
+
+def _old_trim_frame(df):
+    df.columns = [c.strip() for c in df.columns]
+    for col in df.columns:
+        if df[col].dtype == object:
+            df[col] = df[col].map(lambda x: x.strip()
+                                  if isinstance(x, str) else x)
+    return df
+
+
+def _old_clean_tab_frame(df):
+    df = _old_trim_frame(df)
+    empty_cols = [c for c in df.columns if (df[c] == "").all()]
+    if empty_cols:
+        df = df.drop(columns=empty_cols)
+    for col in [c for c in df.columns
+                if any(k in c.lower() for k in readers._NUMERIC_COL_HINTS)]:
+        df[col] = df[col].map(_old_normalize_plus_padded)
+    return df
+
+# -------------------------------
+# Corpus
+# -------------------------------
+HEADERS = ["Title", " Units ", "Amount", "Royalties Payable", "ISRC",
+           "Share %", "Territory", "Retail Price", "Notes", "Blank"]
+
+CELLS = ["+000000000012", "+0000", "0000", "+000012.3400", "+0.5", "12",
+         "-000012", "+", "+.5", "007.", "  +00042  ", " +0001.10\x0c",
+         "+٠١٢", "٠٠٣.5", "１２", "+00０1", "abc", "Café", "  naïve  ",
+         "　wide space　", "\x1fx\x1f", "", " ", "1.2.3", "+-1"]
+
+
+def _statement(seed: int) -> str:
+    rng = random.Random(seed)
+    headers = rng.sample(HEADERS, rng.randint(3, len(HEADERS)))
+    lines = ["\t".join(headers)]
+    for _ in range(rng.randint(1, 60)):
+        width = len(headers)
+        if rng.random() < 0.1:
+            width = rng.randint(1, width)  # ragged row
+        lines.append("\t".join(
+            "" if h == "Blank" else rng.choice(CELLS)
+            for h in headers[:width]))
+    return "\n".join(lines) + "\n"
+
+
+def _expected(path, encoding):
+    return _old_clean_tab_frame(
+        pd.read_csv(path, encoding=encoding, **_TAB_READ_KW))
+
+
+@pytest.fixture(params=["pyarrow", "scalar"])
+def kernels(request, monkeypatch):
+    if request.param == "pyarrow":
+        pytest.importorskip("pyarrow")
+    else:
+        monkeypatch.setattr(readers, "pa", None)
+    return request.param
+
+
+@pytest.mark.parametrize("seed", range(60))
+def test_whole_file_matches_original(tmp_path, kernels, seed):
+    path = tmp_path / "statement.tab"
+    path.write_text(_statement(seed), encoding="utf-8")
+    df = read_tab_strict(str(path))
+    pd.testing.assert_frame_equal(df, _expected(path, df.attrs["encoding"]))
+
+
+@pytest.mark.parametrize("seed", range(60))
+def test_chunks_match_original(tmp_path, kernels, seed):
+    path = tmp_path / "statement.tab"
+    path.write_text(_statement(seed), encoding="utf-8")
+    chunks = list(iter_tab_strict(str(path), chunksize=7))
+    df = pd.concat(chunks, ignore_index=True)
+    pd.testing.assert_frame_equal(df, _expected(path,
+                                                chunks[0].attrs["encoding"]))
+
+
+def test_latin1_statement(tmp_path, kernels):
+    path = tmp_path / "statement.tab"
+    path.write_bytes("Title\tUnits\nCaf\xe9\t+0007\n".encode("latin1"))
+    df = read_tab_strict(str(path))
+    assert df.attrs["encoding"] == "latin1"
+    pd.testing.assert_frame_equal(df, _expected(path, "latin1"))
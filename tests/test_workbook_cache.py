@@ -0,0 +1,27 @@
+# tests/test_workbook_cache.py
+import os
+import sqlite3
+
+from file_converter.workbook import WorkbookInfo, WorkbookMetaCache
+
+
+def _last_used(cache):
+    with sqlite3.connect(cache.db_path) as db:
+        return db.execute("SELECT last_used FROM workbooks").fetchone()[0]
+
+
+def test_get_touches_last_used_only_when_stale(tmp_path):
+    book = tmp_path / "book.xlsx"
+    book.write_bytes(b"x")
+    st = os.stat(book)
+    cache = WorkbookMetaCache(str(tmp_path / "meta.sqlite"))
+    cache.put(WorkbookInfo(path=str(book), size=st.st_size,
+                           mtime_ns=st.st_mtime_ns, sheets=["A"]))
+    stamp = _last_used(cache)
+    assert cache.get(str(book)).sheets == ["A"]
+    assert _last_used(cache) == stamp  # fresh: the lookup wrote nothing
+
+    with sqlite3.connect(cache.db_path) as db:
+        db.execute("UPDATE workbooks SET last_used=0")
+    assert cache.get(str(book)).sheets == ["A"]
+    assert _last_used(cache) > 0
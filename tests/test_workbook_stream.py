@@ -0,0 +1,112 @@
+# tests/test_workbook_stream.py
+import datetime
+
+import pandas as pd
+import pytest
+
+from file_converter import readers
+from file_converter.parallel import concat_sheets, parse_sheets
+
+openpyxl = pytest.importorskip("openpyxl")
+
+D = datetime.datetime
+
+
+def _write_xlsx(path, sheets):
+    wb = openpyxl.Workbook()
+    wb.remove(wb.active)
+    for title, rows in sheets.items():
+        ws = wb.create_sheet(title)
+        for row in rows:
+            ws.append(row)
+    wb.save(path)
+
+
+# dates (one with a time), floats (2.0 among them), ints with a gap late in
+# the sheet, an int/float mix and a column that is only filled further down
+SHEETS = {
+    "Data": [["when", "price", "qty", "mixed", "late"]]
+    + [[D(2024, 1, 1 + i), 2.0 + (i % 3) / 2, i, i, None] for i in range(9)]
+    + [[D(2024, 2, 1, 12, 30), 2.0, None, 2.5, "x"],
+       [None, 3.0, 7, 3, 4]],
+    "Other": [["qty", "note"], [1, "a"], [2, None], [None, "c"]],
+}
+
+
+@pytest.fixture
+def book(tmp_path):
+    path = str(tmp_path / "book.xlsx")
+    _write_xlsx(path, SHEETS)
+    return path
+
+
+@pytest.mark.parametrize("chunksize", [1, 2, 4, 100])
+def test_streamed_sheet_matches_read_excel(book, chunksize):
+    expected = pd.read_excel(book, sheet_name="Data")
+    got = pd.concat(readers.iter_xlsx_sheet(book, "Data", chunksize),
+                    ignore_index=True)
+    pd.testing.assert_frame_equal(got, expected, check_exact=True)
+    assert got["when"].dtype.kind == "M"
+    assert got["price"].dtype == "float64"
+
+
+@pytest.mark.parametrize("chunksize", [1, 3, 100])
+def test_streamed_book_matches_whole_read(book, chunksize):
+    expected = concat_sheets(parse_sheets(book, list(SHEETS)))
+    got = pd.concat(readers.iter_xlsx_chunks(book, chunksize),
+                    ignore_index=True)
+    pd.testing.assert_frame_equal(got, expected, check_exact=True)
+
+
+def test_streamed_chunks_keep_their_dtypes(book):
+    chunks = list(readers.iter_xlsx_sheet(book, "Data", 3))
+    assert {str(c["qty"].dtype) for c in chunks} == {"float64"}
+    assert {str(c["when"].dtype) for c in chunks} == {"datetime64[ns]"}
+    assert chunks[0]["price"].tolist() == [2.0, 2.5, 3.0]
+
+
+def test_streamed_xls_matches_whole_read(tmp_path):
+    xlwt = pytest.importorskip("xlwt")
+    path = str(tmp_path / "book.xls")
+    wb = xlwt.Workbook()
+    ws = wb.add_sheet("Data")
+    dates = xlwt.easyxf(num_format_str="yyyy-mm-dd")
+    for r, row in enumerate(SHEETS["Data"]):
+        for c, v in enumerate(row):
+            if isinstance(v, D):
+                ws.write(r, c, v, dates)
+            elif v is not None:
+                ws.write(r, c, v)
+    wb.save(path)
+    [(_, expected)] = readers.read_xls_builtin(path)
+    assert expected["when"].dtype.kind == "M"
+    for chunksize in (1, 4):
+        got = pd.concat(readers.iter_xls_sheet(path, "Data", chunksize),
+                        ignore_index=True)
+        pd.testing.assert_frame_equal(got, expected, check_exact=True)
+
+
+@pytest.mark.parametrize("header", [0, 1])
+def test_streamed_width_follows_the_rows_seen(tmp_path, header):
+    # a formatted empty cell widens the recorded <dimension> to column C
+    path = str(tmp_path / "wide.xlsx")
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = "S"
+    rows = [["a", "b"], [1, 2, None], [3, 4]]
+    if header:
+        rows.insert(0, ["t", None, None, "u"])  # wider row above the header
+    for row in rows:
+        ws.append(row)
+    ws.cell(len(rows), 3).number_format = "0.00"
+    wb.save(path)
+    expected = pd.read_excel(path, sheet_name="S", header=header)
+    for chunksize in (1, 100):
+        got = pd.concat(readers.iter_xlsx_sheet(path, "S", chunksize,
+                                                header=header),
+                        ignore_index=True)
+        pd.testing.assert_frame_equal(got, expected, check_exact=True)
+        whole = pd.concat(readers.iter_xlsx_chunks(path, chunksize,
+                                                   header=header),
+                          ignore_index=True)
+        assert whole.columns.tolist()[:-1] == expected.columns.tolist()
@@ -0,0 +1,69 @@
+# tests/test_xml_stream.py
+import pandas as pd
+import pytest
+
+from file_converter import readers
+from file_converter.writers import open_chunk_writer
+
+# "v" reads as int in the first rows and only turns float further down;
+# "note" first appears in the last row
+DOC = """<?xml version='1.0' encoding='utf-8'?>
+<data>
+  <row><id>1</id><v>2</v></row>
+  <row><id>2</id><v>3</v></row>
+  <row><id>3</id><v/></row>
+  <row><id>4</id><v>4.5</v><note>x</note></row>
+</data>
+"""
+
+
+@pytest.fixture
+def doc(tmp_path):
+    path = tmp_path / "t.xml"
+    path.write_text(DOC, encoding="utf-8")
+    return str(path)
+
+
+@pytest.mark.parametrize("chunksize", [1, 2, 3, 100])
+def test_chunks_match_read_xml(doc, chunksize):
+    chunks = list(readers.iter_xml_chunks(doc, chunksize))
+    assert {str(c["v"].dtype) for c in chunks} == {"float64"}
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True),
+                                  pd.read_xml(doc), check_exact=True)
+
+
+def test_streamed_output_matches_to_xml(doc, tmp_path):
+    expected, got = tmp_path / "whole.xml", tmp_path / "streamed.xml"
+    pd.read_xml(doc).to_xml(expected, index=False)
+    with open_chunk_writer(str(got), "xml") as writer:
+        for chunk in readers.iter_xml_chunks(doc, 2):
+            writer.write(chunk)
+    assert got.read_bytes() == expected.read_bytes()
+
+
+NESTED = """<?xml version='1.0' encoding='utf-8'?>
+<data>
+  <batch n="1"><record><v>1</v></record><record><v>2</v></record></batch>
+</data>
+"""
+
+
+def test_row_path_applies_to_one_run_only(tmp_path, capsys):
+    from file_converter.cli import main
+    from file_converter.options import ConvertOptions
+
+    src = tmp_path / "nested.xml"
+    src.write_text(NESTED, encoding="utf-8")
+    rows = readers.read_file(str(src),
+                             options=ConvertOptions(xml_row_path="//record"))
+    assert rows["v"].tolist() == [1, 2]
+    assert "v" not in readers.read_file(str(src)).columns
+
+    for out, flags in (("rows", ["--xml-row-path", "//record"]),
+                       ("default", [])):
+        assert main(["convert", str(src), "--to", "csv", "-j", "1", "-q",
+                     "--out", str(tmp_path / out), *flags]) == 0
+    assert (tmp_path / "rows" / "nested.csv").read_text().split() == [
+        "v", "1", "2"]
+    assert (tmp_path / "default" / "nested.csv").read_text().split() == [
+        "n,record", "1,"]